@@ -2,7 +2,7 @@ import logging
 import discord
 from discord import app_commands
 from discord.ext import commands
-from typing import Literal
+from typing import Literal, Optional
 from services.features import developer_service
 from config import settings
 from services.core import lang_service
@@ -490,12 +490,21 @@ class Developer(commands.Cog):
         lang = await lang_service.get_guild_lang(ctx.guild.id if ctx.guild else None)
         
         from services.core import db_service
-        success = await db_service.sync_shop_catalog()
+        report = await db_service.sync_shop_catalog()
         
-        if success:
+        if report is not None:
+            changes = "\n".join(
+                f"> **{label}:** {', '.join(f'`{item_id}`' for item_id in report[key]) or '—'}"
+                for key, label in (
+                    ("added", lang_service.get_text("dev_shop_sync_added", lang)),
+                    ("updated", lang_service.get_text("dev_shop_sync_updated", lang)),
+                    ("removed", lang_service.get_text("dev_shop_sync_removed", lang))
+                )
+            )
             embed = embed_service.success(
                 lang_service.get_text("shop_purchase_title", lang),
-                "Catálogo de la tienda sincronizado con éxito desde `shop_items.json`.",
+                f"{lang_service.get_text('dev_shop_sync_success', lang)}\n{changes}\n"
+                f"> **{lang_service.get_text('dev_shop_sync_unchanged', lang)}:** {report['unchanged']}",
                 lite=True
             )
         else:
@@ -506,6 +515,18 @@ class Developer(commands.Cog):
             )
         await ctx.send(embed=embed, ephemeral=True)
 
+    @dev_group.command(name="backup", description="Crea, lista, verifica o restaura copias de seguridad de la base de datos.")
+    @app_commands.describe(
+        accion="crear, listar, verificar o restaurar (la restauración se aplica al reiniciar el bot)",
+        nombre="Nombre de la copia para verificar o restaurar (por defecto la más reciente)"
+    )
+    async def backup(self, ctx: commands.Context, accion: Literal["crear", "listar", "verificar", "restaurar"], nombre: Optional[str] = None):
+        """Gestiona las copias de seguridad locales de la base de datos."""
+        await ctx.defer(ephemeral=True)
+        lang = await lang_service.get_guild_lang(ctx.guild.id if ctx.guild else None)
+        embed = await developer_service.handle_backup(accion, nombre, lang)
+        await ctx.send(embed=embed, ephemeral=True)
+
     @dev_group.command(name="cloudflare", description="Gestiona la caché y zonas de Cloudflare (Solo Owner).")
     @app_commands.describe(
         accion="Acción a realizar: list_zones o purge_cache",
@@ -7,7 +7,7 @@ from discord.ext import commands
 from config import settings
 from services.features import music_service
 from services.integrations import lyrics_service
-from services.core import lang_service
+from services.core import lang_service, startup_profiler
 from services.utils import embed_service, pagination_service
 
 logger = logging.getLogger(__name__)
@@ -20,7 +20,12 @@ class Music(commands.Cog):
 
     async def cog_load(self):
         """Conecta a Lavalink al cargar el Cog."""
-        self.bot.loop.create_task(music_service.connect_nodes(self.bot))
+        self.bot.loop.create_task(self._connect_nodes())
+
+    async def _connect_nodes(self):
+        await self.bot.wait_until_ready()
+        with startup_profiler.phase("lavalink"):
+            await music_service.connect_nodes(self.bot)
 
     async def cog_unload(self):
         pass
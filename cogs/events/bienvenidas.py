@@ -1,6 +1,6 @@
 import discord
 from discord.ext import commands
-from services.utils import embed_service
+from services.utils import embed_service, channel_resolver
 from services.core import db_service, lang_service
 
 class Bienvenidas(commands.Cog):
@@ -11,15 +11,7 @@ class Bienvenidas(commands.Cog):
     async def on_member_join(self, member: discord.Member):
         # Optimizamos usando el caché de configuración en lugar de consulta directa
         config = await db_service.get_guild_config(member.guild.id)
-        channel_id = config.get('welcome_channel_id')
-        if not channel_id: return
-        
-        channel = self.bot.get_channel(channel_id)
-        if not channel:
-            try:
-                channel = await self.bot.fetch_channel(channel_id)
-            except discord.HTTPException:
-                return
+        channel = channel_resolver.get_sendable_channel(member.guild, config.get('welcome_channel_id'))
         if channel:
             lang = await lang_service.get_guild_lang(member.guild.id)
             title = lang_service.get_text("welcome_title", lang, user=member.name)
@@ -39,15 +31,7 @@ class Bienvenidas(commands.Cog):
     @commands.Cog.listener()
     async def on_member_remove(self, member: discord.Member):
         config = await db_service.get_guild_config(member.guild.id)
-        channel_id = config.get('welcome_channel_id')
-        if not channel_id: return
-
-        channel = self.bot.get_channel(channel_id)
-        if not channel:
-            try:
-                channel = await self.bot.fetch_channel(channel_id)
-            except discord.HTTPException:
-                return
+        channel = channel_resolver.get_sendable_channel(member.guild, config.get('welcome_channel_id'))
         if channel:
             lang = await lang_service.get_guild_lang(member.guild.id)
             title = lang_service.get_text("goodbye_title", lang)
@@ -0,0 +1,36 @@
+import logging
+import time
+import discord
+from discord.ext import commands
+from services.core import db_service
+
+logger = logging.getLogger(__name__)
+
+class CacheWarmup(commands.Cog):
+    """Precarga en caché los datos que el primer mensaje de cada servidor necesitaría leer de la DB."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        start = time.perf_counter()
+        try:
+            found = await db_service.preload_guild_configs([guild.id for guild in self.bot.guilds])
+        except Exception:
+            logger.exception("❌ Error precargando configuraciones de servidor")
+            return
+        logger.info(
+            f"🔥 [Warmup] Configuración de {len(self.bot.guilds)} servidores en caché "
+            f"({found} desde DB) en {(time.perf_counter() - start) * 1000:.0f} ms."
+        )
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild):
+        try:
+            await db_service.preload_guild_configs([guild.id])
+        except Exception:
+            logger.exception(f"❌ Error precargando la configuración de {guild.name}")
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(CacheWarmup(bot))
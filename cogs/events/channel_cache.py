@@ -0,0 +1,43 @@
+import discord
+from discord.ext import commands
+from services.utils import channel_resolver
+
+class ChannelCache(commands.Cog):
+    """Invalida los destinos de anuncios resueltos cuando cambian los canales, roles o permisos de un servidor."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
+        channel_resolver.invalidate_guild(channel.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        channel_resolver.invalidate_guild(channel.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        # Incluye cambios de posición, categoría y overwrites de permisos
+        channel_resolver.invalidate_guild(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        channel_resolver.invalidate_guild(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        channel_resolver.invalidate_guild(role.guild.id)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        # Solo importa el propio bot (roles o aislamiento temporal cambian sus permisos)
+        if after.id == self.bot.user.id:
+            channel_resolver.invalidate_guild(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        channel_resolver.invalidate_guild(guild.id)
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(ChannelCache(bot))
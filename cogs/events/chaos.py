@@ -4,8 +4,9 @@ import discord
 from discord.ext import commands
 from config import settings
 from services.utils import embed_service
-from services.core import db_service, lang_service
+from services.core import db_service, lang_service, message_dispatch
 from services.utils import random_service
+from services.core.message_context import MessageContext
 
 logger = logging.getLogger(__name__)
 
@@ -13,12 +14,19 @@ class Chaos(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
+    async def cog_load(self):
+        message_dispatch.register_handler("chaos", self.process_message_chaos)
+
+    async def cog_unload(self):
+        message_dispatch.unregister_handler("chaos")
+
     def update_local_config(self, guild_id: int, enabled: bool, prob: float):
         """Método obsoleto para mantener compatibilidad con setup_service."""
         pass
 
-    async def process_message_chaos(self, message: discord.Message, lang: str, config: dict):
-        """Procesa la ruleta de caos usando la configuración provista."""
+    async def process_message_chaos(self, ctx: MessageContext):
+        """Procesa la ruleta de caos usando la configuración del contexto del mensaje."""
+        message, lang, config = ctx.message, ctx.lang, ctx.config
         enabled = bool(config.get("chaos_enabled", 1))
         if not enabled:
             return
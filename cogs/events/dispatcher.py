@@ -1,7 +1,7 @@
 import logging
 import discord
 from discord.ext import commands
-from services.core import db_service, lang_service
+from services.core import admission_control, message_context, message_dispatch
 
 logger = logging.getLogger(__name__)
 
@@ -9,6 +9,7 @@ class EventDispatcher(commands.Cog):
     """
     Despachador centralizado de eventos on_message.
     Reduce consultas redundantes de base de datos e I/O innecesarios de Discord.
+    Los cogs registran sus manejadores en `message_dispatch` y aquí se ejecutan en paralelo.
     """
     def __init__(self, bot: commands.Bot):
         self.bot = bot
@@ -19,39 +20,20 @@ class EventDispatcher(commands.Cog):
         if message.author.bot or not message.guild or not message.content:
             return
 
-        # 2. Única consulta estructurada (Caché optimizado)
+        # 2. Control de admisión: en una inundación (raid) se omiten XP, Caos y Menciones.
+        # Los comandos de prefijo (moderación) los procesa discord.py aparte y no se ven afectados.
+        if not admission_control.admit(message.guild.id, message.channel.id):
+            return
+
+        # 3. Contexto del mensaje: configuración, idioma y prefijo se resuelven una sola vez
         try:
-            config = await db_service.get_guild_config(message.guild.id)
-            lang = await lang_service.get_guild_lang(message.guild.id)
+            ctx = await message_context.build(self.bot, message)
         except Exception:
             logger.exception("Error al recuperar configuración en dispatcher")
             return
 
-        # 3. Invocar componentes independientes de forma segura
-        
-        # A. Procesamiento de XP de niveles
-        level_cog = self.bot.get_cog("LevelEvents")
-        if level_cog:
-            try:
-                await level_cog.process_message_xp(message, lang, config)
-            except Exception:
-                logger.exception("Error procesando XP en despachador")
-
-        # B. Ruleta de Caos
-        chaos_cog = self.bot.get_cog("Chaos")
-        if chaos_cog:
-            try:
-                await chaos_cog.process_message_chaos(message, lang, config)
-            except Exception:
-                logger.exception("Error procesando ruleta de caos en despachador")
-
-        # C. Menciones al Bot
-        mencion_cog = self.bot.get_cog("Mencion")
-        if mencion_cog:
-            try:
-                await mencion_cog.process_message_mention(message, lang, config)
-            except Exception:
-                logger.exception("Error procesando respuesta de mención en despachador")
+        # 4. Manejadores registrados (XP, Caos, Menciones...): concurrentes, medidos y con límite de tiempo
+        await message_dispatch.dispatch(ctx)
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(EventDispatcher(bot))
@@ -4,7 +4,8 @@ import discord
 from discord.ext import commands
 from config import settings
 from services.features import level_service
-from services.core import db_service
+from services.core import db_service, message_dispatch
+from services.core.message_context import MessageContext
 
 logger = logging.getLogger(__name__)
 
@@ -17,15 +18,20 @@ class LevelEvents(commands.Cog):
             commands.BucketType.user
         )
 
-    async def process_message_xp(self, message: discord.Message, lang: str, config: dict):
+    async def cog_load(self):
+        message_dispatch.register_handler("xp", self.process_message_xp)
+
+    async def cog_unload(self):
+        message_dispatch.unregister_handler("xp")
+
+    async def process_message_xp(self, ctx: MessageContext):
         """Procesa la asignación de XP por mensajes."""
+        message = ctx.message
         if len(message.content) < 5: # Ignorar mensajes muy cortos (spam de emojis/letras)
             return
         
-        # Evitar dar XP por comandos
-        prefix = await self.bot.get_prefix(message)
-        if isinstance(prefix, list) and any(message.content.startswith(p) for p in prefix): return
-        if isinstance(prefix, str) and message.content.startswith(prefix): return
+        # Evitar dar XP por comandos (prefijo ya resuelto por el despachador)
+        if ctx.is_command: return
 
         # Sistema de Cooldown
         bucket = self._cd.get_bucket(message)
@@ -40,7 +46,10 @@ class LevelEvents(commands.Cog):
         nuevo_nivel, subio_de_nivel = await db_service.add_xp(message.guild.id, message.author.id, xp_ganada)
         
         if subio_de_nivel:
-            await level_service.notify_level_up(message.guild, message.author, nuevo_nivel, fallback_channel=message.channel)
+            await level_service.notify_level_up(
+                message.guild, message.author, nuevo_nivel, fallback_channel=message.channel,
+                lang=ctx.lang, config=ctx.config
+            )
 
 async def setup(bot):
     await bot.add_cog(LevelEvents(bot))
\ No newline at end of file
@@ -1,15 +1,23 @@
 import discord
 from discord.ext import commands
 from services.utils import embed_service
-from services.core import db_service, lang_service
+from services.core import lang_service, message_dispatch
+from services.core.message_context import MessageContext
 
 class Mencion(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
-    async def process_message_mention(self, message: discord.Message, lang: str, config: dict):
-        if self.bot.user in message.mentions and len(message.content.split()) == 1 and not message.mention_everyone:
-            respuesta = config.get('mention_response') or lang_service.get_text("mention_response_default", lang, bot=self.bot.user.name)
+    async def cog_load(self):
+        message_dispatch.register_handler("mention", self.process_message_mention)
+
+    async def cog_unload(self):
+        message_dispatch.unregister_handler("mention")
+
+    async def process_message_mention(self, ctx: MessageContext):
+        message, lang = ctx.message, ctx.lang
+        if ctx.mentions_bot and len(message.content.split()) == 1 and not message.mention_everyone:
+            respuesta = ctx.config.get('mention_response') or lang_service.get_text("mention_response_default", lang, bot=self.bot.user.name)
             await message.channel.send(embed=embed_service.info(lang_service.get_text("mention_title", lang), respuesta))
 
 async def setup(bot: commands.Bot):
@@ -1,16 +1,26 @@
 import asyncio
 import datetime
+import io
+import json
 import logging
-import pathlib
-import shutil
+import os
 import discord
 from discord.ext import commands, tasks
 from config import settings
-from services.core import lang_service
+from services.core import backup_service, lang_service
 from services.core import db_service
 
 logger = logging.getLogger(__name__)
 
+def _backup_name(message: discord.Message) -> str | None:
+    """Nombre de la copia a la que pertenece un mensaje del bot (varias partes comparten nombre), o None."""
+    for attachment in message.attachments:
+        if attachment.filename.startswith("backup_"):
+            return attachment.filename.split(".", 1)[0]
+    if message.attachments and settings.BACKUP_CONFIG["KEYWORD"] in message.content:
+        return message.attachments[0].filename.split(".", 1)[0]
+    return None
+
 class Backup(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
@@ -21,88 +31,82 @@ class Backup(commands.Cog):
 
     async def _cleanup_dm(self, channel: discord.DMChannel):
         """Limpia backups antiguos y otros mensajes basura del bot en DMs."""
-        backups_encontrados = []
+        backups_conservados = set()
         async for message in channel.history(limit=settings.BACKUP_CONFIG["HISTORY_LIMIT"]):
             if message.author.id != self.bot.user.id:
                 continue
-            
-            # Identificar si es un backup preestablecido (con archivo y palabra clave)
-            es_backup = len(message.attachments) > 0 and settings.BACKUP_CONFIG["KEYWORD"] in message.content
-            
-            if es_backup:
-                backups_encontrados.append(message)
-            else:
-                # Cualquier otro mensaje del bot se considera basura en el canal de backups
-                try:
-                    await message.delete()
-                    await asyncio.sleep(0.5)
-                except discord.HTTPException:
-                    pass
-
-        if len(backups_encontrados) > settings.BACKUP_CONFIG["MAX_BACKUPS_TO_KEEP"]:
-            for msg in backups_encontrados[settings.BACKUP_CONFIG["MAX_BACKUPS_TO_KEEP"]:]:
-                try:
-                    await msg.delete()
-                    await asyncio.sleep(1)
-                except discord.HTTPException:
-                    pass
+
+            # Las partes de una misma copia cuentan como un único backup
+            nombre = _backup_name(message)
+            if nombre is not None and (nombre in backups_conservados or len(backups_conservados) < settings.BACKUP_CONFIG["MAX_BACKUPS_TO_KEEP"]):
+                backups_conservados.add(nombre)
+                continue
+
+            # Backups que exceden el máximo y cualquier otro mensaje del bot se consideran basura
+            try:
+                await message.delete()
+                await asyncio.sleep(0.5 if nombre is None else 1)
+            except discord.HTTPException:
+                pass
+
+    async def _send_to_owner(self, manifest: dict):
+        """Envía la copia al dueño por DM, troceada en partes que caben en un adjunto (máx. 1 envío cada COOLDOWN_SECONDS)."""
+        app_info = await self.bot.application_info()
+        owner = app_info.owner
+        dm_channel = await owner.create_dm()
+
+        # --- LÓGICA DE 24 HORAS ---
+        # Revisamos el historial reciente para no saturar al dueño con archivos duplicados.
+        async for message in dm_channel.history(limit=settings.BACKUP_CONFIG["DM_HISTORY_LIMIT"]):
+            if message.author.id == self.bot.user.id and _backup_name(message):
+                diff = datetime.datetime.now(datetime.timezone.utc) - message.created_at
+                # Si han pasado menos de 23.5 horas, no se envía (damos margen de 30min)
+                if diff.total_seconds() < settings.BACKUP_CONFIG["COOLDOWN_SECONDS"]:
+                    return
+                break
+
+        lang = settings.GENERAL_CONFIG["DEFAULT_LANG"]
+        fecha = manifest["created_at"][:10]
+        parts = backup_service.count_chunks(manifest)
+        for index in range(1, parts + 1):
+            # La lectura del disco va en un hilo: una parte puede ocupar varios MB
+            chunk = await asyncio.to_thread(backup_service.read_chunk, manifest, index - 1)
+            filename = manifest["file"] if parts == 1 else f"{manifest['file']}.part{index:02d}"
+            files = [discord.File(io.BytesIO(chunk), filename=filename)]
+            if index == parts:
+                # El manifiesto (hashes, compresión, versión de esquema) permite verificar la copia al recuperarla
+                files.append(discord.File(io.BytesIO(json.dumps(manifest, indent=2).encode("utf-8")), filename=f"{manifest['name']}.json"))
+            content = (
+                lang_service.get_text("backup_msg", lang, date=fecha) if parts == 1
+                else lang_service.get_text("backup_msg_part", lang, date=fecha, part=index, parts=parts)
+            )
+            await dm_channel.send(content=content, files=files)
+
+        await self._cleanup_dm(dm_channel)
+        logger.info(f"✅ Backup de base de datos enviado a {owner.name} ({parts} partes)")
 
     # ponytail: Eliminado bucle flush_xp redundante porque ya existe cache_flush_loop en optimization.py
 
     @tasks.loop(hours=settings.BACKUP_CONFIG["INTERVAL_HOURS"])
     async def backup_db(self):
         await self.bot.wait_until_ready()
-        
-        # Rutas usando pathlib
-        db_path = pathlib.Path(settings.BASE_DIR) / settings.DB_CONFIG["DIR_NAME"] / settings.DB_CONFIG["FILE_NAME"]
-        temp_backup_path = db_path.with_name(settings.DB_CONFIG["TEMP_BACKUP_NAME"])
-        
-        if not db_path.exists():
+
+        if not os.path.exists(db_service.DB_PATH):
             return
 
         try:
             # 1. Forzar el guardado de la XP que está en RAM a la DB antes del backup
             await db_service.flush_xp_cache()
 
-            app_info = await self.bot.application_info()
-            owner = app_info.owner
-            
-            # --- LÓGICA DE 24 HORAS ---
-            # Buscamos el último backup en el DM
-            ultimo_backup = None
-            dm_channel = await owner.create_dm()
-            
-            # Revisamos el historial reciente para no saturar al dueño con archivos duplicados.
-            async for message in dm_channel.history(limit=settings.BACKUP_CONFIG["DM_HISTORY_LIMIT"]): 
-                if message.author.id == self.bot.user.id and len(message.attachments) > 0 and settings.BACKUP_CONFIG["KEYWORD"] in message.content:
-                    ultimo_backup = message
-                    break
-            
-            # Si existe un backup previo, verificamos la fecha
-            if ultimo_backup:
-                now = datetime.datetime.now(datetime.timezone.utc)
-                diff = now - ultimo_backup.created_at
-                # Si han pasado menos de 23.5 horas, abortamos (damos margen de 30min)
-                if diff.total_seconds() < settings.BACKUP_CONFIG["COOLDOWN_SECONDS"]: 
-                    return 
-
-            # 2. Crear copia temporal para evitar bloqueos/corrupción durante el envío
-            await asyncio.to_thread(shutil.copy2, db_path, temp_backup_path)
+            # 2. Copia online (API de backup de SQLite), comprimida y verificada en la rotación local
+            manifest = await backup_service.create_backup()
 
             # 3. ENVIAR BACKUP
-            fecha = datetime.date.today().strftime("%Y-%m-%d")
-            archivo = discord.File(temp_backup_path, filename=f"backup_{fecha}.sqlite3")
-            msg = await owner.send(content=lang_service.get_text("backup_msg", settings.GENERAL_CONFIG["DEFAULT_LANG"], date=fecha), file=archivo)
-            
-            await self._cleanup_dm(msg.channel)
-            logger.info(f"✅ Backup de base de datos enviado a {owner.name}")
+            if settings.SEND_BACKUP_TO_OWNER:
+                await self._send_to_owner(manifest)
 
         except Exception as e:
             logger.error(f"❌ Error en el sistema de Backup: {e}")
-        finally:
-            # 4. Limpiar el archivo temporal siempre
-            if temp_backup_path.exists():
-                temp_backup_path.unlink()
 
 async def setup(bot: commands.Bot):
-    await bot.add_cog(Backup(bot))
\ No newline at end of file
+    await bot.add_cog(Backup(bot))
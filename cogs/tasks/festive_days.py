@@ -4,7 +4,7 @@ import datetime
 import logging
 from services.core import db_service, lang_service, persistence_service
 from services.repositories.config_repository import ConfigRepository
-from services.utils import embed_service
+from services.utils import embed_service, channel_resolver
 
 logger = logging.getLogger(__name__)
 
@@ -60,7 +60,7 @@ class FestiveDaysTask(commands.Cog):
                 if not guild:
                     continue
 
-                channel = guild.get_channel(channel_id)
+                channel = channel_resolver.get_sendable_channel(guild, channel_id)
                 if not channel:
                     continue
 
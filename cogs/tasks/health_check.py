@@ -1,15 +1,14 @@
 import logging
 import asyncio
 import discord
-import wavelink
 import os
 from discord.ext import commands, tasks
 from ui.shared import help_ui
 from config import settings
-from services.core import db_service, lang_service, persistence_service
+from services.core import db_service, extension_loader, lang_service, persistence_service
 from services.features import developer_service, level_service, moderation_service, profile_service, diversion_service, setup_service, birthday_service
 from services.utils import embed_service, voice_service
-from services.features import voice_chill_service, music_algorithm_service
+from services.features import voice_chill_service
 
 logger = logging.getLogger(__name__)
 
@@ -90,6 +89,9 @@ class HealthCheck(commands.Cog):
 
     async def _check_lavalink(self, errors):
         # 2. Comprobación de Nodos de Música (Lavalink)
+        if not extension_loader.is_feature_enabled("MUSIC"):
+            return
+        import wavelink
         if not wavelink.Pool.nodes:
             errors.append("Music: No hay nodos configurados en el Pool.")
         else:
@@ -99,8 +101,9 @@ class HealthCheck(commands.Cog):
 
     async def _check_spotify(self, errors):
         # 3. APIs Externas (Spotify)
-        if settings.LAVALINK_CONFIG["SPOTIFY"]["CLIENT_ID"]:
+        if extension_loader.is_feature_enabled("MUSIC") and settings.LAVALINK_CONFIG["SPOTIFY"]["CLIENT_ID"]:
             try:
+                from services.features import music_algorithm_service
                 engine = music_algorithm_service.RecommendationEngine()
                 token = await engine._get_spotify_token()
                 if not token:
@@ -209,11 +212,13 @@ class HealthCheck(commands.Cog):
 
             # Prueba lógica de Algoritmo de Música
             try:
-                engine = music_algorithm_service.RecommendationEngine()
-                class MockTrack:
-                    def __init__(self, t, a, l, i): self.title, self.author, self.length, self.identifier = t, a, l, i
-                seed, cand = MockTrack("A", "A", 100, "1"), MockTrack("B", "B", 100, "2")
-                engine._calculate_score(cand, seed, set(), "day", {})
+                if extension_loader.is_feature_enabled("MUSIC"):
+                    from services.features import music_algorithm_service
+                    engine = music_algorithm_service.RecommendationEngine()
+                    class MockTrack:
+                        def __init__(self, t, a, l, i): self.title, self.author, self.length, self.identifier = t, a, l, i
+                    seed, cand = MockTrack("A", "A", 100, "1"), MockTrack("B", "B", 100, "2")
+                    engine._calculate_score(cand, seed, set(), "day", {})
             except Exception as e:
                 errors.append(f"Command Logic (Algorithm): {e}")
 
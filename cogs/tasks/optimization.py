@@ -1,15 +1,24 @@
 import gc
 import asyncio
 import logging
-import wavelink
 from discord.ext import commands, tasks
-from services.core import db_service
-from services.features import music_service
+from services.core import admission_control, db_service, extension_loader
 from services.features import voice_chill_service
 from config import settings
 
 logger = logging.getLogger(__name__)
 
+def _music_player_type():
+    """Clase de reproductor de wavelink, importada en el primer uso; None si la música está desactivada."""
+    if not extension_loader.is_feature_enabled("MUSIC"):
+        return None
+    import wavelink
+    return wavelink.Player
+
+async def _cleanup_music_player(player):
+    from services.features import music_service  # Diferido: arrastra wavelink
+    await music_service.cleanup_player(player)
+
 class OptimizationTasks(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -30,6 +39,13 @@ class OptimizationTasks(commands.Cog):
             await db_service.flush_xp_cache()
         except Exception as e:
             logger.error(f"⚠️ Error guardando XP caché: {e}")
+        try:
+            # Las entradas caducadas salen poco a poco en lugar de vaciar la caché cada 6 horas
+            await db_service.purge_expired_cache()
+        except Exception as e:
+            logger.error(f"⚠️ Error expirando entradas de caché: {e}")
+        # Cierra sobrecargas ya calmadas y libera cubos de admisión inactivos
+        admission_control.prune()
 
     @cache_flush_loop.error
     async def cache_flush_error(self, error):
@@ -51,15 +67,12 @@ class OptimizationTasks(commands.Cog):
             # 3. Limpieza de persistencia binaria antigua (Mantenido por 3 días)
             await db_service.prune_old_persistence(days=3)
             
-            # 4. Limpiamos el caché de configuración (se recargará bajo demanda)
-            if hasattr(db_service, 'clear_memory_cache'):
-                db_service.clear_memory_cache()
-            
-            # 5. Limpiamos usuarios inactivos de la RAM (XP Cache)
+            # 4. Limpiamos usuarios inactivos de la RAM (XP Cache)
+            # (la caché de configuración ya está acotada por LRU + TTL y no se vacía de golpe)
             if hasattr(db_service, 'clear_xp_cache_safe'):
                 db_service.clear_xp_cache_safe()
             
-            # 6. Forzamos a Python a liberar memoria no usada
+            # 5. Forzamos a Python a liberar memoria no usada
             await asyncio.to_thread(gc.collect)
             logger.info("🧹 [Optimization] Mantenimiento integral completado (DB optimizada y RAM liberada).")
         except Exception as e:
@@ -73,6 +86,7 @@ class OptimizationTasks(commands.Cog):
     # Desconecta el bot de canales vacíos o reproductores inactivos (idle).
     @tasks.loop(seconds=30)
     async def network_optimization_loop(self):
+        player_type = _music_player_type()
         for guild in list(self.bot.guilds):
             try:
                 player = guild.voice_client
@@ -88,8 +102,8 @@ class OptimizationTasks(commands.Cog):
                     human_members = [m for m in player.channel.members if not m.bot]
                     if not human_members:
                         try:
-                            if isinstance(player, wavelink.Player):
-                                await music_service.cleanup_player(player)
+                            if player_type and isinstance(player, player_type):
+                                await _cleanup_music_player(player)
                             await player.disconnect()
                             logger.info(f"🔌 [Network Opt] Desconectado de {guild.name} (Canal vacío).")
                         except Exception as e:
@@ -101,7 +115,7 @@ class OptimizationTasks(commands.Cog):
                         continue
 
                 # 2. Comprobación de inactividad (Idle Timeout)
-                if isinstance(player, wavelink.Player):
+                if player_type and isinstance(player, player_type):
                     # Un player está inactivo si no está reproduciendo nada o está pausado
                     is_inactive = (player.current is None) or player.paused
                     
@@ -116,7 +130,7 @@ class OptimizationTasks(commands.Cog):
                             if elapsed >= timeout:
                                 logger.info(f"💤 [Network Opt] Desconectando {guild.name} por inactividad prolongada ({timeout}s).")
                                 try:
-                                    await music_service.cleanup_player(player)
+                                    await _cleanup_music_player(player)
                                     await player.disconnect()
                                 except Exception as e:
                                     logger.warning(f"⚠️ Error al desconectar {guild.name} por inactividad: {e}")
@@ -1,13 +1,13 @@
 from discord.ext import commands, tasks
-from services.features import level_service
+from services.features import level_service, voice_xp_service
 from config import settings
 import logging
 
-from services.core import db_service
-
 logger = logging.getLogger(__name__)
 
 class VoiceXP(commands.Cog):
+    """XP de voz por eventos: las sesiones se abren/cierran en on_voice_state_update y se acreditan en lote."""
+
     def __init__(self, bot):
         self.bot = bot
         self.voice_xp_loop.start()
@@ -15,39 +15,42 @@ class VoiceXP(commands.Cog):
     def cog_unload(self):
         self.voice_xp_loop.cancel()
 
-    @tasks.loop(seconds=settings.XP_CONFIG["VOICE_INTERVAL"])
-    async def voice_xp_loop(self):
-        await self.bot.wait_until_ready()
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # Tras una reconexión el gateway puede haber perdido eventos de voz
+        voice_xp_service.sync_guilds(self.bot.guilds)
+
+    @commands.Cog.listener()
+    async def on_voice_state_update(self, member, before, after):
+        voice_xp_service.handle_voice_state_update(member, before, after)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        voice_xp_service.drop_guild(guild.id)
 
-        import asyncio
-        async def process_member(guild, member, channel):
+    @tasks.loop(seconds=settings.XP_CONFIG["VOICE_CREDIT_INTERVAL"])
+    async def voice_xp_loop(self):
+        try:
+            level_ups = await voice_xp_service.credit_voice_xp()
+        except Exception:
+            logger.exception("Error acreditando XP de voz")
+            return
+
+        for guild_id, user_id, nuevo_nivel in level_ups:
+            guild = self.bot.get_guild(guild_id)
+            member = guild.get_member(user_id) if guild else None
+            if not member:
+                continue
+            channel = member.voice.channel if member.voice else None
             try:
-                nuevo_nivel, subio = await db_service.add_xp(
-                    guild.id, 
-                    member.id, 
-                    settings.XP_CONFIG["VOICE_AMOUNT"]
-                )
-                
-                if subio:
-                    await level_service.notify_level_up(guild, member, nuevo_nivel, fallback_channel=channel)
-                    
+                await level_service.notify_level_up(guild, member, nuevo_nivel, fallback_channel=channel)
             except Exception:
                 logger.exception(f"Error VoiceXP en {guild.name} para {member.name}")
 
-        tasks = []
-        for guild in self.bot.guilds:
-            for channel in guild.voice_channels:
-                if len(channel.members) < 2: continue
-                if guild.afk_channel and channel.id == guild.afk_channel.id: continue
-
-                for member in channel.members:
-                    if member.bot: continue
-                    if member.voice.self_mute or member.voice.self_deaf or member.voice.deaf: continue
-
-                    tasks.append(process_member(guild, member, channel))
-
-        if tasks:
-            await asyncio.gather(*tasks)
+    @voice_xp_loop.before_loop
+    async def before_voice_xp_loop(self):
+        await self.bot.wait_until_ready()
+        voice_xp_service.sync_guilds(self.bot.guilds)
 
 async def setup(bot):
-    await bot.add_cog(VoiceXP(bot))
\ No newline at end of file
+    await bot.add_cog(VoiceXP(bot))
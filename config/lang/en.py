@@ -94,6 +94,7 @@ EN = {
     # --- LEVELS & PROFILE ---
     "rank_title": "{user}'s Rank",
     "rank_no_data": "No XP data found.",
+    "rank_position": "Position: **#{position}** of **{total}**",
     "level_up_default": "🎉 Congrats {user}! You reached **Level {level}** in {server} 🆙",
     "leaderboard_title": "🏆 Top XP: {server}",
     "leaderboard_empty": "No one has experience in this server yet.",
@@ -127,6 +128,19 @@ EN = {
     
     # --- BACKUP ---
     "backup_msg": "📦 **Backup** {date}",
+    "backup_msg_part": "📦 **Backup** {date} · part {part}/{parts}",
+    "dev_backup_title": "📦 Backups",
+    "dev_backup_list_empty": "There are no local backups.",
+    "dev_backup_line": ">  • `{name}` · {date} · **{size} KB** ({raw} KB uncompressed, {compression}) · schema v{version}",
+    "dev_backup_created": "Backup `{name}` created in {ms} ms: **{size} KB** ({raw} KB uncompressed, {compression}).",
+    "dev_backup_verify_ok": "✅ Backup `{name}` is intact: schema v{version}, {pages} pages ({size} KB).",
+    "dev_backup_verify_fail": "❌ Backup `{name}` is not valid: `{error}`.",
+    "dev_backup_restore_staged": "♻️ Restore staged: it will be applied when the bot restarts. The current database will be kept as `.pre-restore`.",
+    "dev_shop_sync_success": "Shop catalog successfully synced from `shop_items.json`.",
+    "dev_shop_sync_added": "Added",
+    "dev_shop_sync_updated": "Modified",
+    "dev_shop_sync_removed": "Removed",
+    "dev_shop_sync_unchanged": "Unchanged",
     
     # --- BIRTHDAY ---
     "bday_title": "🎉 Happy Birthday! 🎂",
@@ -290,6 +304,20 @@ EN = {
     "botinfo_btn_system": "System",
     "botinfo_btn_memory": "Memory",
     "botinfo_btn_config": "Config",
+    "botinfo_btn_cache": "Cache",
+    "botinfo_cache_title": "🗃️ Cache Efficiency",
+    "botinfo_cache_empty": "No instrumented caches yet.",
+    "botinfo_cache_line": "> **{name}** · `{ratio}` ({hits} hits / {misses} misses)\n>  • Loads: `{loads}` (avg `{avg_load}`) · Evicted: `{evictions}` · Size: `{size}`",
+    "botinfo_handlers": "Message handlers",
+    "botinfo_handler_line": ">  • `{name}`: avg `{avg}` · max `{max}` · slow `{slow}` · timeouts `{timeouts}` · errors `{errors}`",
+    "botinfo_admission_line": ">  • Admission: `{admitted}` processed · `{shed}` shed under load · `{overloaded}` guilds overloaded",
+    "botinfo_btn_boot": "Boot",
+    "botinfo_boot_title": "🚀 Boot Profile",
+    "botinfo_boot_empty": "No boot data recorded.",
+    "botinfo_boot_ready": "> **Ready in:** `{seconds} s` since process start",
+    "botinfo_boot_phases": "Phases",
+    "botinfo_boot_extensions": "Slowest extensions ({count} loaded)",
+    "botinfo_boot_ext_line": ">  • `{name}` · **{total} ms** (import `{imports} ms` · setup `{setup} ms`)",
 
     # --- HELP (CATEGORY DESCRIPTIONS) ---
 
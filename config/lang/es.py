@@ -92,6 +92,7 @@ ES = {
     # --- NIVELES & PERFIL ---
     "rank_title": "Rango de {user}",
     "rank_no_data": "Sin datos de XP.",
+    "rank_position": "Posición: **#{position}** de **{total}**",
     "level_up_default": "🎉 ¡Felicidades {user}! Has subido al **Nivel {level}** en {server} 🆙",
     "leaderboard_title": "🏆 Top XP: {server}",
     "leaderboard_empty": "Nadie tiene experiencia en este servidor aún.",
@@ -125,6 +126,19 @@ ES = {
     
     # --- BACKUP ---
     "backup_msg": "📦 **Backup** {date}",
+    "backup_msg_part": "📦 **Backup** {date} · parte {part}/{parts}",
+    "dev_backup_title": "📦 Copias de Seguridad",
+    "dev_backup_list_empty": "No hay copias de seguridad locales.",
+    "dev_backup_line": ">  • `{name}` · {date} · **{size} KB** ({raw} KB sin comprimir, {compression}) · esquema v{version}",
+    "dev_backup_created": "Copia `{name}` creada en {ms} ms: **{size} KB** ({raw} KB sin comprimir, {compression}).",
+    "dev_backup_verify_ok": "✅ La copia `{name}` es íntegra: esquema v{version}, {pages} páginas ({size} KB).",
+    "dev_backup_verify_fail": "❌ La copia `{name}` no es válida: `{error}`.",
+    "dev_backup_restore_staged": "♻️ Restauración preparada: se aplicará al reiniciar el bot. La base de datos actual se conservará como `.pre-restore`.",
+    "dev_shop_sync_success": "Catálogo de la tienda sincronizado con éxito desde `shop_items.json`.",
+    "dev_shop_sync_added": "Añadidos",
+    "dev_shop_sync_updated": "Modificados",
+    "dev_shop_sync_removed": "Eliminados",
+    "dev_shop_sync_unchanged": "Sin cambios",
     
     # --- CUMPLEAÑOS ---
     "bday_title": "🎉 ¡Feliz Cumpleaños! 🎂",
@@ -288,6 +302,20 @@ ES = {
     "botinfo_btn_system": "Sistema",
     "botinfo_btn_memory": "Memoria",
     "botinfo_btn_config": "Config",
+    "botinfo_btn_cache": "Caché",
+    "botinfo_cache_title": "🗃️ Eficacia de Cachés",
+    "botinfo_cache_empty": "No hay cachés instrumentadas todavía.",
+    "botinfo_cache_line": "> **{name}** · `{ratio}` ({hits} aciertos / {misses} fallos)\n>  • Cargas: `{loads}` (media `{avg_load}`) · Expulsadas: `{evictions}` · Tamaño: `{size}`",
+    "botinfo_handlers": "Manejadores de mensajes",
+    "botinfo_handler_line": ">  • `{name}`: media `{avg}` · máx `{max}` · lentos `{slow}` · timeouts `{timeouts}` · errores `{errors}`",
+    "botinfo_admission_line": ">  • Admisión: `{admitted}` procesados · `{shed}` omitidos por sobrecarga · `{overloaded}` servidores en sobrecarga",
+    "botinfo_btn_boot": "Arranque",
+    "botinfo_boot_title": "🚀 Perfil de Arranque",
+    "botinfo_boot_empty": "No hay datos de arranque registrados.",
+    "botinfo_boot_ready": "> **Listo en:** `{seconds} s` desde el inicio del proceso",
+    "botinfo_boot_phases": "Fases",
+    "botinfo_boot_extensions": "Extensiones más lentas ({count} cargadas)",
+    "botinfo_boot_ext_line": ">  • `{name}` · **{total} ms** (importación `{imports} ms` · registro `{setup} ms`)",
 
     # --- AYUDA (DESCRIPCIONES DE CATEGORÍAS) ---
 
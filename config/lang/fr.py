@@ -92,6 +92,7 @@ FR = {
     # --- NIVELES & PROFIL ---
     "rank_title": "Rang de {user}",
     "rank_no_data": "Aucune donnée d'XP trouvée.",
+    "rank_position": "Position : **#{position}** sur **{total}**",
     "level_up_default": "🎉 Félicitations {user} ! Vous avez atteint le **Niveau {level}** sur {server} 🆙",
     "leaderboard_title": "🏆 Top XP : {server}",
     "leaderboard_empty": "Personne n'a encore d'expérience sur ce serveur.",
@@ -125,6 +126,19 @@ FR = {
     
     # --- SAUVEGARDE ---
     "backup_msg": "📦 **Sauvegarde** {date}",
+    "backup_msg_part": "📦 **Sauvegarde** {date} · partie {part}/{parts}",
+    "dev_backup_title": "📦 Sauvegardes",
+    "dev_backup_list_empty": "Aucune sauvegarde locale.",
+    "dev_backup_line": ">  • `{name}` · {date} · **{size} Ko** ({raw} Ko non compressés, {compression}) · schéma v{version}",
+    "dev_backup_created": "Sauvegarde `{name}` créée en {ms} ms : **{size} Ko** ({raw} Ko non compressés, {compression}).",
+    "dev_backup_verify_ok": "✅ La sauvegarde `{name}` est intègre : schéma v{version}, {pages} pages ({size} Ko).",
+    "dev_backup_verify_fail": "❌ La sauvegarde `{name}` n'est pas valide : `{error}`.",
+    "dev_backup_restore_staged": "♻️ Restauration préparée : elle sera appliquée au redémarrage du bot. La base de données actuelle sera conservée sous `.pre-restore`.",
+    "dev_shop_sync_success": "Catalogue de la boutique synchronisé avec succès depuis `shop_items.json`.",
+    "dev_shop_sync_added": "Ajoutés",
+    "dev_shop_sync_updated": "Modifiés",
+    "dev_shop_sync_removed": "Supprimés",
+    "dev_shop_sync_unchanged": "Inchangés",
     
     # --- ANNIVERSAIRE ---
     "bday_title": "🎉 Joyeux Anniversaire ! 🎂",
@@ -288,6 +302,20 @@ FR = {
     "botinfo_btn_system": "Système",
     "botinfo_btn_memory": "Mémoire",
     "botinfo_btn_config": "Config",
+    "botinfo_btn_cache": "Cache",
+    "botinfo_cache_title": "🗃️ Efficacité des Caches",
+    "botinfo_cache_empty": "Aucun cache instrumenté pour le moment.",
+    "botinfo_cache_line": "> **{name}** · `{ratio}` ({hits} succès / {misses} échecs)\n>  • Chargements : `{loads}` (moy. `{avg_load}`) · Évincées : `{evictions}` · Taille : `{size}`",
+    "botinfo_handlers": "Gestionnaires de messages",
+    "botinfo_handler_line": ">  • `{name}` : moy. `{avg}` · max `{max}` · lents `{slow}` · timeouts `{timeouts}` · erreurs `{errors}`",
+    "botinfo_admission_line": ">  • Admission : `{admitted}` traités · `{shed}` ignorés en surcharge · `{overloaded}` serveurs en surcharge",
+    "botinfo_btn_boot": "Démarrage",
+    "botinfo_boot_title": "🚀 Profil de Démarrage",
+    "botinfo_boot_empty": "Aucune donnée de démarrage enregistrée.",
+    "botinfo_boot_ready": "> **Prêt en :** `{seconds} s` depuis le lancement du processus",
+    "botinfo_boot_phases": "Phases",
+    "botinfo_boot_extensions": "Extensions les plus lentes ({count} chargées)",
+    "botinfo_boot_ext_line": ">  • `{name}` · **{total} ms** (import `{imports} ms` · enregistrement `{setup} ms`)",
 
     # --- AIDE (DESCRIPTIONS DES CATÉGORIES) ---
 
@@ -92,6 +92,7 @@ PT = {
     # --- NÍVEIS & PERFIL ---
     "rank_title": "Rank de {user}",
     "rank_no_data": "Sem dados de XP.",
+    "rank_position": "Posição: **#{position}** de **{total}**",
     "level_up_default": "🎉 Parabéns {user}! Subiste para o **Nível {level}** em {server} 🆙",
     "leaderboard_title": "🏆 Top XP: {server}",
     "leaderboard_empty": "Ninguém tem experiência neste servidor ainda.",
@@ -125,6 +126,19 @@ PT = {
     
     # --- BACKUP ---
     "backup_msg": "📦 **Backup** {date}",
+    "backup_msg_part": "📦 **Backup** {date} · parte {part}/{parts}",
+    "dev_backup_title": "📦 Cópias de Segurança",
+    "dev_backup_list_empty": "Não há cópias de segurança locais.",
+    "dev_backup_line": ">  • `{name}` · {date} · **{size} KB** ({raw} KB sem compressão, {compression}) · esquema v{version}",
+    "dev_backup_created": "Cópia `{name}` criada em {ms} ms: **{size} KB** ({raw} KB sem compressão, {compression}).",
+    "dev_backup_verify_ok": "✅ A cópia `{name}` está íntegra: esquema v{version}, {pages} páginas ({size} KB).",
+    "dev_backup_verify_fail": "❌ A cópia `{name}` não é válida: `{error}`.",
+    "dev_backup_restore_staged": "♻️ Restauração preparada: será aplicada ao reiniciar o bot. O banco de dados atual será mantido como `.pre-restore`.",
+    "dev_shop_sync_success": "Catálogo da loja sincronizado com sucesso a partir de `shop_items.json`.",
+    "dev_shop_sync_added": "Adicionados",
+    "dev_shop_sync_updated": "Modificados",
+    "dev_shop_sync_removed": "Removidos",
+    "dev_shop_sync_unchanged": "Sem alterações",
     
     # --- ANIVERSÁRIO ---
     "bday_title": "🎉 Feliz Aniversário! 🎂",
@@ -288,6 +302,20 @@ PT = {
     "botinfo_btn_system": "Sistema",
     "botinfo_btn_memory": "Memória",
     "botinfo_btn_config": "Config",
+    "botinfo_btn_cache": "Cache",
+    "botinfo_cache_title": "🗃️ Eficiência dos Caches",
+    "botinfo_cache_empty": "Ainda não há caches instrumentados.",
+    "botinfo_cache_line": "> **{name}** · `{ratio}` ({hits} acertos / {misses} falhas)\n>  • Cargas: `{loads}` (média `{avg_load}`) · Removidas: `{evictions}` · Tamanho: `{size}`",
+    "botinfo_handlers": "Manipuladores de mensagens",
+    "botinfo_handler_line": ">  • `{name}`: média `{avg}` · máx `{max}` · lentos `{slow}` · timeouts `{timeouts}` · erros `{errors}`",
+    "botinfo_admission_line": ">  • Admissão: `{admitted}` processadas · `{shed}` descartadas por sobrecarga · `{overloaded}` servidores em sobrecarga",
+    "botinfo_btn_boot": "Inicialização",
+    "botinfo_boot_title": "🚀 Perfil de Inicialização",
+    "botinfo_boot_empty": "Nenhum dado de inicialização registrado.",
+    "botinfo_boot_ready": "> **Pronto em:** `{seconds} s` desde o início do processo",
+    "botinfo_boot_phases": "Fases",
+    "botinfo_boot_extensions": "Extensões mais lentas ({count} carregadas)",
+    "botinfo_boot_ext_line": ">  • `{name}` · **{total} ms** (importação `{imports} ms` · registro `{setup} ms`)",
 
     # --- AJUDA (DESCRIÇÕES) ---
 
@@ -1,11 +1,36 @@
-from .lang.es import ES
-from .lang.en import EN
-from .lang.pt import PT
-from .lang.fr import FR
-
-LOCALES = {
-    "es": ES,
-    "en": EN,
-    "pt": PT,
-    "fr": FR
-}
\ No newline at end of file
+import importlib
+from collections.abc import Mapping
+
+# Idioma -> (módulo, diccionario). Cada idioma se importa la primera vez que se usa.
+_MODULES = {
+    "es": ("config.lang.es", "ES"),
+    "en": ("config.lang.en", "EN"),
+    "pt": ("config.lang.pt", "PT"),
+    "fr": ("config.lang.fr", "FR")
+}
+
+
+class _LazyLocales(Mapping):
+    """Mapa idioma -> textos que importa cada archivo de idioma en su primer acceso."""
+
+    def __init__(self) -> None:
+        self._loaded: dict[str, dict] = {}
+
+    def __getitem__(self, lang: str) -> dict:
+        texts = self._loaded.get(lang)
+        if texts is None:
+            module, attr = _MODULES[lang]
+            texts = self._loaded[lang] = getattr(importlib.import_module(module), attr)
+        return texts
+
+    def __contains__(self, lang: object) -> bool:
+        return lang in _MODULES
+
+    def __iter__(self):
+        return iter(_MODULES)
+
+    def __len__(self) -> int:
+        return len(_MODULES)
+
+
+LOCALES = _LazyLocales()
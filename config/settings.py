@@ -99,7 +99,8 @@ HELP_CONFIG = {
 }
 
 BOTINFO_CONFIG = {
-    "EMOJIS": {"GENERAL": "📊", "SYSTEM": "💻", "MEMORY": "🧠", "CONFIG": "⚙️"},
+    "EMOJIS": {"GENERAL": "📊", "SYSTEM": "💻", "MEMORY": "🧠", "CONFIG": "⚙️", "CACHE": "🗃️", "BOOT": "🚀"},
+    "BOOT_TOP_EXTENSIONS": 8,  # Extensiones más lentas mostradas en la pestaña de arranque
     "TITLE_EMOJI": "🤖",
     "SELECT_EMOJI": "👇"
 }
@@ -213,18 +214,22 @@ XP_CONFIG = {
     "MAX_XP": 25,  # XP máxima generada por mensaje
     "COOLDOWN": 60.0,  # Cooldown en segundos antes de volver a ganar XP por chat
     "VOICE_AMOUNT": 15,  # XP otorgada por intervalo en canal de voz
-    "VOICE_INTERVAL": 300  # Intervalo de recuento en canal de voz (5 minutos en segundos)
+    "VOICE_INTERVAL": 300,  # Segundos de voz elegibles que equivalen a VOICE_AMOUNT de XP (5 minutos)
+    "VOICE_CREDIT_INTERVAL": 60  # Cada cuántos segundos se liquida en lote la XP de voz acumulada
 }
 
 LEVELS_CONFIG = {
     "LEADERBOARD_LIMIT": 50,  # Límite del ranking de usuarios
     "XP_MULTIPLIER": 100,  # Multiplicador del nivel para calcular XP necesaria
     "XP_EXPONENT": 1.2,  # Exponente matemático de curva de dificultad
+    "XP_TABLE_LEVELS": 1000,  # Niveles precalculados al iniciar (la tabla crece sola si alguien los supera)
     "REBIRTH_LEVEL": 100,  # Nivel mínimo requerido para poder renacer (Hacer Rebirth)
     "MEDALS": ["🥇", "🥈", "🥉"],  # Emojis decorativos para el top del ranking
     "LEADERBOARD_CHUNK_SIZE": 10,  # Miembros listados por página en /levels
     "REBIRTH_COST": 100,  # Coste en monedas por cada rebirth ejecutado
-    "COINS_PER_LEVEL": (5, 10)  # Rango de monedas ganadas al subir de nivel (mínimo, máximo)
+    "COINS_PER_LEVEL": (5, 10),  # Rango de monedas ganadas al subir de nivel (mínimo, máximo)
+    "RANKING_TTL": 3600,  # Segundos sin consultas antes de liberar el ranking en memoria de un servidor
+    "RANKING_BUILD_BATCH": 2000  # Filas leídas por lote al construir un ranking (el event loop queda libre entre lotes)
 }
 
 
@@ -236,9 +241,13 @@ LEVELS_CONFIG = {
 DB_CONFIG = {
     "DIR_NAME": "data",  # Directorio para almacenar la base de datos
     "FILE_NAME": "database.sqlite3",  # Nombre físico del archivo
-    "TEMP_BACKUP_NAME": "temp_backup.sqlite3",  # Archivo temporal para generación de backups
+    "TEMP_BACKUP_NAME": "temp_backup.sqlite3",  # Base del nombre de los temporales de backup (cada copia añade un sufijo único)
     "RETRIES": 3,  # Cantidad de reintentos en bloqueos por concurrencia
-    "RETRY_DELAY": 0.1  # Segundos de delay entre reintentos
+    "RETRY_DELAY": 0.1,  # Segundos de delay entre reintentos
+    "READ_POOL_SIZE": 4,  # Conexiones de solo lectura concurrentes (0 = usar solo la conexión de escritura)
+    "GROUP_COMMIT": False,  # Agrupa las escrituras de execute() en una sola transacción por lote (opt-in)
+    "GROUP_COMMIT_WINDOW_MS": 5,  # Milisegundos máximos de espera para completar un lote
+    "GROUP_COMMIT_MAX_BATCH": 200  # Sentencias máximas por transacción agrupada
 }
 
 BACKUP_CONFIG = {
@@ -248,7 +257,17 @@ BACKUP_CONFIG = {
     "DM_HISTORY_LIMIT": 20,  # Límite de limpieza de mensajes en el chat del dueño
     "KEYWORD": "Backup",  # Palabra clave para buscar mensajes del sistema de backup
     "INTERVAL_HOURS": 12,  # Frecuencia en horas para respaldar
-    "XP_FLUSH_MINUTES": 5  # Minutos de intervalo para bajar el XP en memoria a la DB
+    "XP_FLUSH_MINUTES": 5,  # Minutos de intervalo para bajar el XP en memoria a la DB
+    "LOCAL_DIR": os.path.join(BASE_DIR, "data", "backups"),  # Carpeta de rotación de copias locales (archivo + manifiesto JSON)
+    "LOCAL_KEEP": 14,  # Copias locales conservadas (las más recientes)
+    "LOCAL_MAX_AGE_DAYS": 30,  # Antigüedad máxima de una copia local
+    "PAGES_PER_STEP": 256,  # Páginas copiadas por paso de la API de backup de SQLite
+    "STEP_SLEEP": 0.005,  # Segundos de pausa entre pasos (deja escribir a la conexión principal)
+    "COMPRESSION": "auto",  # "zstd" (requiere el paquete zstandard), "gzip" o "auto" (zstd si está disponible)
+    "ZSTD_LEVEL": 10,  # Nivel de compresión zstd
+    "GZIP_LEVEL": 6,  # Nivel de compresión gzip
+    "CHUNK_SIZE_MB": 8,  # Tamaño máximo de cada parte enviada por DM (límite de adjuntos de Discord)
+    "RESTORE_FILE": os.path.join(BASE_DIR, "data", "database.restore.sqlite3")  # Copia verificada que se aplica en el próximo arranque
 }
 
 SEND_BACKUP_TO_OWNER = True  # Bandera para habilitar o desactivar el envío de backups por mensaje directo
@@ -299,11 +318,46 @@ VOICE_CONFIG = {
     "RECONNECT_BACKOFF": [5, 10, 30]  # Tiempos de espera al intentar reconectar canales de voz
 }
 
+DISPATCHER_CONFIG = {
+    "HANDLER_TIMEOUT": 5.0,  # Segundos máximos por manejador de on_message antes de cancelarlo
+    "SLOW_HANDLER_MS": 250,  # Umbral en milisegundos a partir del cual un manejador se registra como lento
+    "TIMEOUTS": {  # Límites propios por manejador (nombre de registro -> segundos)
+        "xp": 5.0,
+        "chaos": 10.0,
+        "mention": 5.0
+    }
+}
+
+ADMISSION_CONFIG = {  # Control de admisión de mensajes (cubos de fichas) frente a raids y spam masivo
+    "ENABLED": True,
+    "GUILD_RATE": 20,  # Mensajes por segundo sostenidos por servidor que reciben el procesado completo
+    "GUILD_BURST": 100,  # Ráfaga máxima por servidor antes de empezar a descartar
+    "CHANNEL_RATE": 5,  # Mensajes por segundo sostenidos por canal
+    "CHANNEL_BURST": 20,  # Ráfaga máxima por canal
+    "RECOVERY_SECONDS": 30,  # Segundos sin descartes para dar por terminada la sobrecarga de un servidor
+    "IDLE_SECONDS": 600  # Segundos sin mensajes tras los que se libera el cubo de un canal o servidor
+}
+
 OPTIMIZATION_CONFIG = {
     "FLUSH_INTERVAL": 60,  # Segundos para purgar caché de niveles
     "CLEANUP_INTERVAL": 6  # Frecuencia en horas para liberar variables de memoria RAM no usadas
 }
 
+CACHE_CONFIG = {
+    "DEFAULT_MAX_ENTRIES": 10000,  # Máximo de claves por espacio de nombres sin límite propio (LRU)
+    "DEFAULT_TTL": 3600,  # Segundos de vida por defecto si set() no recibe ttl (None = sin caducidad)
+    "SWEEP_BATCH": 500,  # Entradas revisadas por espacio de nombres en cada barrido de caducadas
+    "L1_ENABLED": True,  # Con REDIS_URL, caché cercana en memoria del proceso delante de Redis
+    "L1_TTL": 60,  # Segundos máximos de vida en L1 (red de seguridad si se pierde una invalidación)
+    "INVALIDATION_CHANNEL": "cache:invalidate",  # Canal pub/sub de Redis para invalidar el L1 de otros procesos
+    "RESUBSCRIBE_DELAY": 5,  # Segundos de espera antes de volver a suscribirse tras perder la conexión
+    "PRELOAD_TTL_JITTER": 0.25,  # Fracción aleatoria restada al TTL de lo precargado al arrancar (no caduca todo a la vez)
+    "NAMESPACES": {  # Límites por prefijo de clave ('guild_config:123' -> 'guild_config')
+        "guild_config": {"MAX_ENTRIES": 5000, "TTL": 6 * 3600},
+        "user_prefix": {"MAX_ENTRIES": 50000, "TTL": 3600}
+    }
+}
+
 
 # =============================================================================
 # 10. SEGURIDAD, PERMISOS Y DESARROLLADOR (DEV & COMMANDS)
@@ -312,6 +366,24 @@ OPTIMIZATION_CONFIG = {
 
 STATUS_COMMAND_ONLY_OWNER = False  # True: Solo el dueño gestiona estados. False: Admins de guild también.
 
+BOOT_PROFILE_CONFIG = {  # Perfil de arranque (fases y extensiones) visible en /botinfo
+    "FILE": os.path.join(BASE_DIR, "data", "boot_profile.json"),  # Línea de tiempo completa del último arranque
+    "HISTORY_FILE": os.path.join(BASE_DIR, "data", "boot_profile_history.jsonl"),  # Un resumen por arranque
+    "HISTORY_LIMIT": 50  # Arranques conservados en el historial
+}
+
+FEATURES_CONFIG = {  # Subsistemas opcionales pesados: si están desactivados no se importan ni se cargan sus extensiones
+    "MUSIC": os.getenv("ENABLE_MUSIC", "True").lower() == "true",  # Música con Lavalink (wavelink)
+    "WEB": os.getenv("ENABLE_WEB", "True").lower() == "true"  # Portal web y API de métricas (FastAPI, Jinja2, uvicorn)
+}
+
+EXTENSIONS_CONFIG = {
+    "CONCURRENCY": 1,  # Extensiones cargándose a la vez (>1 apenas acelera: las importaciones bloquean el loop y el perfil deja de ser fiable)
+    "FEATURE_EXTENSIONS": {  # Extensiones que solo se cargan con su subsistema activo en FEATURES_CONFIG
+        "MUSIC": ("cogs.commands.music", "cogs.events.music_events")
+    }
+}
+
 MATH_CONFIG = {
     "OP_MAP": {  # Diccionario mapeador para calculadora en lenguaje natural (/calc)
         "sumar": "+", "suma": "+", "add": "+", "+": "+", "mas": "+",
@@ -3,12 +3,14 @@ import logging
 import logging.handlers
 import pathlib
 import datetime
+import time
+from services.core import startup_profiler  # Primero: fija el origen del perfil de arranque
 import discord
 from discord.ext import commands
 from discord import app_commands
 from config import settings
-from services.features import music_service
-from services.core import db_service
+from services.core import db_service, extension_loader
+from services.core.cache_service import cache
 
 # --- CONFIGURACIÓN DE LOGS ---
 data_dir = pathlib.Path("./data")
@@ -58,6 +60,7 @@ logging.getLogger("aiohttp").setLevel(logging.WARNING)
 
 
 logger = logging.getLogger("bot")
+startup_profiler.record_since_origin("imports")
 
 
 # Configuración de Intents
@@ -100,20 +103,28 @@ class BotPersonal(commands.AutoShardedBot):
 
     async def setup_hook(self):
         """Configuración inicial del bot en orden lógico."""
+        with startup_profiler.phase("setup_hook"):
+            await self._setup()
+        self._setup_finished_at = time.perf_counter()
+
+    async def _setup(self):
         # 1. Base de Datos: Debe estar lista antes de cargar cualquier lógica.
-        await self._init_database()
+        with startup_profiler.phase("database"):
+            await self._init_database()
         
         # 1.5 Registrar chequeos globales (Cooldowns)
         self.add_check(self.check_global_cooldown)
         self.tree.interaction_check = self.check_global_interaction
 
         # 2. Extensiones: Carga todos los Cogs (comandos, eventos, tareas).
-        await self._load_extensions()
+        with startup_profiler.phase("extensions"):
+            await self._load_extensions()
 
         # 3. Sincronización: Registra los Slash Commands en la API de Discord si está activado
         import os
         if os.getenv("SYNC_COMMANDS", "False").lower() == "true":
-            await self._sync_commands()
+            with startup_profiler.phase("sync_commands"):
+                await self._sync_commands()
         else:
             self.synced_commands_cache = {}
             logger.info("ℹ️ Sincronización automática de comandos desactivada (usa SYNC_COMMANDS=True o el comando !sync para sincronizar).")
@@ -151,23 +162,24 @@ class BotPersonal(commands.AutoShardedBot):
     async def _init_database(self):
         logger.info("💾 [Bot] Iniciando base de datos...")
         await db_service.init_db()
+        with startup_profiler.phase("database.prefix_index"):
+            count = await db_service.load_prefix_index()
+        logger.info(f"💾 [Bot] Índice de prefijos personalizados cargado ({count} usuarios).")
 
     async def _load_extensions(self):
         logger.info("⚙️ [Bot] Cargando extensiones...")
-        cogs_dir = pathlib.Path("./cogs")
-        loaded_count = 0
-        
-        for file in cogs_dir.rglob("*.py"):
-            if file.name == "__init__.py": continue
-            
-            extension_name = ".".join(file.parts).replace(".py", "")
-            try:
-                await self.load_extension(extension_name)
-                logger.debug(f'✅ Extensión cargada: {extension_name}')
-                loaded_count += 1
-            except Exception:
-                logger.exception(f'❌ Error cargando {extension_name}')
-        logger.info(f"⚙️ [Bot] Se cargaron {loaded_count} extensiones de forma exitosa.")
+        # Sin los subsistemas desactivados en FEATURES_CONFIG (sus dependencias ni se importan)
+        names = extension_loader.discover_extensions("cogs")
+        loaded_count = await extension_loader.load_extensions(self, names)
+        logger.info(f"⚙️ [Bot] Se cargaron {loaded_count}/{len(names)} extensiones de forma exitosa.")
+
+    async def add_cog(self, cog, **kwargs):
+        """add_cog cronometrado: separa en el perfil de arranque el registro del cog de la importación de su extensión."""
+        start = time.perf_counter()
+        try:
+            await super().add_cog(cog, **kwargs)
+        finally:
+            startup_profiler.record_cog_setup(time.perf_counter() - start)
 
     async def _sync_commands(self):
         logger.info("🔄 [Bot] Sincronizando comandos...")
@@ -179,6 +191,11 @@ class BotPersonal(commands.AutoShardedBot):
             logger.error(f"❌ [Bot] Error al sincronizar: {e}")
 
     async def on_ready(self):
+        first_ready = startup_profiler.mark("ready")
+        if first_ready:
+            startup_profiler.record_phase("gateway", self._setup_finished_at, time.perf_counter())
+            startup_profiler.dump()
+
         logger.info('------------------------------------')
         logger.info(f'🤖 Bot conectado: {self.user}')
         logger.info(f'🆔 ID: {self.user.id}')
@@ -191,30 +208,55 @@ class BotPersonal(commands.AutoShardedBot):
             console_handler.setLevel(logging.WARNING)
             
         # Intentar restaurar sesiones de música previas
-        self.loop.create_task(music_service.restore_players(self))
+        if first_ready:
+            self.loop.create_task(self._restore_players_profiled())
+        elif extension_loader.is_feature_enabled("MUSIC"):
+            from services.features import music_service  # Diferido: arrastra wavelink
+            self.loop.create_task(music_service.restore_players(self))
+
+    async def _restore_players_profiled(self):
+        """Primera restauración de música (incluye la espera a los nodos Lavalink); cierra el perfil de arranque."""
+        try:
+            if extension_loader.is_feature_enabled("MUSIC"):
+                from services.features import music_service  # Diferido: arrastra wavelink
+                with startup_profiler.phase("restore_players"):
+                    await music_service.restore_players(self)
+        finally:
+            startup_profiler.dump(final=True)
 
 async def main():
     from services.utils import http_client
-    from web.app import create_app
-    from web.server import WebServer
-    from web.config import web_settings
 
     bot = BotPersonal()
-    
-    app = create_app()
-    app.state.bot = bot
-    web_server = WebServer(app, host=web_settings.WEB_HOST, port=web_settings.WEB_PORT)
-    
+    web_server = None
+
+    # El portal web (FastAPI, Jinja2, uvicorn) solo se importa si está activado
+    if extension_loader.is_feature_enabled("WEB"):
+        from web.app import create_app
+        from web.server import WebServer
+        from web.config import web_settings
+
+        with startup_profiler.phase("web_app"):
+            app = create_app()
+        app.state.bot = bot
+        web_server = WebServer(app, host=web_settings.WEB_HOST, port=web_settings.WEB_PORT)
+    else:
+        logger.info("ℹ️ Portal web desactivado (ENABLE_WEB=False).")
+
     try:
-        web_server.start()
+        if web_server:
+            with startup_profiler.phase("web_server"):
+                web_server.start()
         async with bot:
             await bot.start(settings.TOKEN)
     except Exception as e:
         logger.error(f"❌ Error inesperado al iniciar el bot: {e}")
     finally:
         logger.info("🛑 [Bot] Apagando servicios...")
-        await web_server.stop()
+        if web_server:
+            await web_server.stop()
         await db_service.close_db()
+        await cache.close()
         await http_client.close_session()
 
 
@@ -0,0 +1,120 @@
+import logging
+import time
+from typing import Dict, Optional
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """Cubo de fichas: `rate` fichas por segundo hasta un máximo de `burst`."""
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, burst: float, now: float) -> None:
+        self.tokens = burst
+        self.updated = now
+
+    def refill(self, rate: float, burst: float, now: float) -> None:
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(burst, self.tokens + elapsed * rate)
+            self.updated = now
+
+
+class AdmissionStats:
+    """Contadores de la admisión de mensajes (admitidos y descartados por motivo)."""
+    __slots__ = ("admitted", "shed_guild", "shed_channel", "overloads")
+
+    def __init__(self) -> None:
+        self.admitted = 0
+        self.shed_guild = 0  # Descartados por superar el límite del servidor
+        self.shed_channel = 0  # Descartados por superar el límite del canal
+        self.overloads = 0  # Veces que un servidor ha entrado en sobrecarga
+
+    def as_dict(self) -> dict:
+        total = self.admitted + self.shed_guild + self.shed_channel
+        shed = self.shed_guild + self.shed_channel
+        return {
+            "admitted": self.admitted,
+            "shed": shed,
+            "shed_guild": self.shed_guild,
+            "shed_channel": self.shed_channel,
+            "shed_ratio": round(shed / total, 4) if total else None,
+            "overloads": self.overloads,
+            "overloaded_guilds": len(_overloaded),
+            "top_shed_guilds": dict(sorted(_shed_by_guild.items(), key=lambda item: item[1], reverse=True)[:5])
+        }
+
+
+_guild_buckets: Dict[int, TokenBucket] = {}
+_channel_buckets: Dict[int, TokenBucket] = {}
+# Servidores en sobrecarga: guild_id -> instante monotónico del último descarte
+_overloaded: Dict[int, float] = {}
+# Mensajes descartados por servidor desde el arranque
+_shed_by_guild: Dict[int, int] = {}
+stats = AdmissionStats()
+
+
+def _bucket(buckets: Dict[int, TokenBucket], key: int, rate: float, burst: float, now: float) -> TokenBucket:
+    bucket = buckets.get(key)
+    if bucket is None:
+        bucket = buckets[key] = TokenBucket(burst, now)
+    else:
+        bucket.refill(rate, burst, now)
+    return bucket
+
+
+def admit(guild_id: int, channel_id: int, now: Optional[float] = None) -> bool:
+    """
+    Decide en O(1) si un mensaje entra por el camino completo (XP, Caos, Menciones...).
+    Devuelve False cuando el canal o el servidor superan su ritmo sostenido más la ráfaga permitida.
+    """
+    config = settings.ADMISSION_CONFIG
+    if not config["ENABLED"]:
+        return True
+    now = time.monotonic() if now is None else now
+
+    channel = _bucket(_channel_buckets, channel_id, config["CHANNEL_RATE"], config["CHANNEL_BURST"], now)
+    guild = _bucket(_guild_buckets, guild_id, config["GUILD_RATE"], config["GUILD_BURST"], now)
+    if channel.tokens >= 1 and guild.tokens >= 1:
+        channel.tokens -= 1
+        guild.tokens -= 1
+        stats.admitted += 1
+        return True
+
+    if channel.tokens < 1:
+        stats.shed_channel += 1
+    else:
+        stats.shed_guild += 1
+    _shed_by_guild[guild_id] = _shed_by_guild.get(guild_id, 0) + 1
+    if guild_id not in _overloaded:
+        stats.overloads += 1
+        logger.warning(f"🌊 [Admission] Servidor {guild_id} en sobrecarga: se omiten XP, Caos y Menciones hasta que baje el ritmo.")
+    _overloaded[guild_id] = now
+    return False
+
+
+def prune(now: Optional[float] = None) -> int:
+    """Cierra las sobrecargas ya calmadas y libera los cubos inactivos (ya llenos). Devuelve los cubos liberados."""
+    config = settings.ADMISSION_CONFIG
+    now = time.monotonic() if now is None else now
+
+    for guild_id, last_shed in list(_overloaded.items()):
+        if now - last_shed >= config["RECOVERY_SECONDS"]:
+            del _overloaded[guild_id]
+            logger.info(f"✅ [Admission] Servidor {guild_id} fuera de sobrecarga ({_shed_by_guild.get(guild_id, 0)} mensajes omitidos en total).")
+
+    removed = 0
+    for buckets, burst, rate in (
+        (_channel_buckets, config["CHANNEL_BURST"], config["CHANNEL_RATE"]),
+        (_guild_buckets, config["GUILD_BURST"], config["GUILD_RATE"])
+    ):
+        # Un cubo que se habría rellenado por completo equivale a uno nuevo: se puede descartar
+        idle = max(config["IDLE_SECONDS"], burst / rate)
+        for key in [k for k, b in buckets.items() if now - b.updated >= idle]:
+            del buckets[key]
+            removed += 1
+    return removed
+
+
+def get_admission_snapshot() -> dict:
+    return stats.as_dict()
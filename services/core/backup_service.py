@@ -0,0 +1,306 @@
+import asyncio
+import datetime
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+from typing import Optional
+from config import settings
+from services.core import database, migrations
+
+logger = logging.getLogger(__name__)
+
+_READ_BLOCK = 1024 * 1024  # Bytes por lectura al comprimir, descomprimir y calcular hashes
+_EXTENSIONS = {"zstd": ".zst", "gzip": ".gz"}
+_backup_lock = asyncio.Lock()  # Una copia a la vez (la programada y las manuales comparten directorio y retención)
+
+
+def _codec() -> str:
+    """Compresión a usar: zstd si está instalado `zstandard` (y no se fuerza gzip), gzip en caso contrario."""
+    preferred = settings.BACKUP_CONFIG["COMPRESSION"]
+    if preferred in ("auto", "zstd"):
+        try:
+            import zstandard  # noqa: F401
+            return "zstd"
+        except ImportError:
+            if preferred == "zstd":
+                logger.warning("⚠️ [Backup] `zstandard` no está instalado; se usará gzip.")
+    return "gzip"
+
+
+def _open_compressed(path: str, mode: str, codec: str):
+    if codec == "zstd":
+        import zstandard
+        if mode == "wb":
+            return zstandard.open(path, "wb", cctx=zstandard.ZstdCompressor(level=settings.BACKUP_CONFIG["ZSTD_LEVEL"]))
+        return zstandard.open(path, "rb")
+    return gzip.open(path, mode, compresslevel=settings.BACKUP_CONFIG["GZIP_LEVEL"]) if mode == "wb" else gzip.open(path, mode)
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(_READ_BLOCK)
+            if not block:
+                break
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _online_backup(source_path: str, dest_path: str) -> None:
+    """
+    Copia consistente de la base de datos en uso (incluido el contenido del -wal) con la API de backup de SQLite.
+    Avanza por lotes de páginas y cede el archivo entre lotes para no bloquear a la conexión de escritura.
+    """
+    if os.path.exists(dest_path):
+        os.remove(dest_path)
+    source = sqlite3.connect(f"file:{source_path}?mode=ro", uri=True)
+    dest = sqlite3.connect(dest_path)
+    try:
+        source.backup(dest, pages=settings.BACKUP_CONFIG["PAGES_PER_STEP"], sleep=settings.BACKUP_CONFIG["STEP_SLEEP"])
+        # La copia queda autónoma: sin -wal propio que haya que acompañar
+        dest.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        dest.close()
+        source.close()
+
+
+def _inspect(path: str) -> dict:
+    """Comprueba la integridad de un archivo SQLite y devuelve sus datos básicos."""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        rows = conn.execute("PRAGMA integrity_check").fetchall()
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        return {
+            "integrity": "ok" if rows == [("ok",)] else "; ".join(str(row[0]) for row in rows[:5]),
+            "schema_version": conn.execute("PRAGMA user_version").fetchone()[0],
+            "page_count": conn.execute("PRAGMA page_count").fetchone()[0],
+            "page_size": conn.execute("PRAGMA page_size").fetchone()[0],
+            "missing_tables": sorted(t for t in database.REQUIRED_TABLES - tables if not t.startswith("sqlite_"))
+        }
+    finally:
+        conn.close()
+
+
+def _compress(source_path: str, dest_path: str, codec: str) -> None:
+    with open(source_path, "rb") as src, _open_compressed(dest_path, "wb", codec) as dst:
+        while True:
+            block = src.read(_READ_BLOCK)
+            if not block:
+                break
+            dst.write(block)
+
+
+def _decompress(source_path: str, dest_path: str, codec: str) -> None:
+    with _open_compressed(source_path, "rb", codec) as src, open(dest_path, "wb") as dst:
+        while True:
+            block = src.read(_READ_BLOCK)
+            if not block:
+                break
+            dst.write(block)
+
+
+def _manifest_path(name: str) -> str:
+    return os.path.join(settings.BACKUP_CONFIG["LOCAL_DIR"], f"{name}.json")
+
+
+def _create_backup_sync(name: str, codec: str) -> dict:
+    config = settings.BACKUP_CONFIG
+    os.makedirs(config["LOCAL_DIR"], exist_ok=True)
+    # Temporales con nombre único: nunca se pisa el de otra copia aunque coincidan dos procesos
+    stem, suffix = os.path.splitext(settings.DB_CONFIG["TEMP_BACKUP_NAME"])
+    fd, snapshot = tempfile.mkstemp(prefix=f"{stem}_", suffix=suffix, dir=database.DATA_DIR)
+    os.close(fd)
+    file_name = f"{name}.sqlite3{_EXTENSIONS[codec]}"
+    archive = os.path.join(config["LOCAL_DIR"], file_name)
+    fd, partial = tempfile.mkstemp(prefix=f"{file_name}.", suffix=".tmp", dir=config["LOCAL_DIR"])
+    os.close(fd)
+    start = time.perf_counter()
+    try:
+        _online_backup(database.DB_PATH, snapshot)
+        info = _inspect(snapshot)
+        if info["integrity"] != "ok":
+            raise sqlite3.DatabaseError(f"La copia no supera integrity_check: {info['integrity']}")
+        raw_size, raw_sha256 = os.path.getsize(snapshot), _sha256(snapshot)
+        _compress(snapshot, partial, codec)
+        os.replace(partial, archive)
+    finally:
+        for path in (snapshot, partial):
+            if os.path.exists(path):
+                os.remove(path)
+
+    manifest = {
+        "name": name,
+        "file": file_name,
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "compression": codec,
+        "size": os.path.getsize(archive),
+        "sha256": _sha256(archive),
+        "raw_size": raw_size,
+        "raw_sha256": raw_sha256,
+        "schema_version": info["schema_version"],
+        "page_count": info["page_count"],
+        "page_size": info["page_size"],
+        "duration_ms": round((time.perf_counter() - start) * 1000, 1)
+    }
+    with open(_manifest_path(name), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+async def create_backup() -> dict:
+    """
+    Crea una copia comprimida y verificada en BACKUP_CONFIG["LOCAL_DIR"] (archivo + manifiesto JSON)
+    y aplica la política de retención. Todo el trabajo de disco corre fuera del bucle de eventos.
+    Las peticiones simultáneas (tarea programada y comando manual) se atienden de una en una.
+
+    Cada copia es completa, no incremental: SQLite no expone qué páginas cambiaron, así que un delta exigiría
+    guardar sin comprimir la copia anterior para compararla, y restaurar dependería de que sigan intactos todos
+    los eslabones de la cadena (en disco con retención LOCAL_KEEP y en los DMs, que se limpian). Una copia
+    comprimida es autónoma: se verifica y se restaura por sí sola.
+    """
+    async with _backup_lock:
+        name = base = datetime.datetime.now(datetime.timezone.utc).strftime("backup_%Y%m%d_%H%M%S")
+        suffix = 1
+        while os.path.exists(_manifest_path(name)):
+            # Dos copias en el mismo segundo: no se sobrescribe la anterior
+            name, suffix = f"{base}_{suffix}", suffix + 1
+        manifest = await asyncio.to_thread(_create_backup_sync, name, _codec())
+        removed = await asyncio.to_thread(apply_retention)
+    logger.info(
+        f"📦 [Backup] {manifest['file']} creado en {manifest['duration_ms']:.0f} ms "
+        f"({manifest['raw_size'] / 1024:.0f} KB -> {manifest['size'] / 1024:.0f} KB, {manifest['compression']}); "
+        f"{removed} copias antiguas eliminadas."
+    )
+    return manifest
+
+
+def list_backups() -> list[dict]:
+    """Manifiestos de las copias locales, de la más reciente a la más antigua."""
+    directory = settings.BACKUP_CONFIG["LOCAL_DIR"]
+    if not os.path.isdir(directory):
+        return []
+    manifests = []
+    for entry in os.listdir(directory):
+        if not (entry.startswith("backup_") and entry.endswith(".json")):
+            continue
+        try:
+            with open(os.path.join(directory, entry), "r", encoding="utf-8") as f:
+                manifests.append(json.load(f))
+        except (OSError, ValueError):
+            logger.warning(f"⚠️ [Backup] Manifiesto ilegible: {entry}")
+    return sorted(manifests, key=lambda m: m["name"], reverse=True)
+
+
+def get_backup(name: str) -> Optional[dict]:
+    """Manifiesto de una copia local por nombre (con o sin extensión)."""
+    name = name.split(".", 1)[0]
+    return next((m for m in list_backups() if m["name"] == name), None)
+
+
+def apply_retention() -> int:
+    """Conserva las LOCAL_KEEP copias más recientes y ninguna más antigua que LOCAL_MAX_AGE_DAYS. Devuelve las eliminadas."""
+    config = settings.BACKUP_CONFIG
+    cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=config["LOCAL_MAX_AGE_DAYS"])
+    removed = 0
+    for index, manifest in enumerate(list_backups()):
+        if index < config["LOCAL_KEEP"] and datetime.datetime.fromisoformat(manifest["created_at"]) >= cutoff:
+            continue
+        for path in (os.path.join(config["LOCAL_DIR"], manifest["file"]), _manifest_path(manifest["name"])):
+            if os.path.exists(path):
+                os.remove(path)
+        removed += 1
+    return removed
+
+
+def read_chunk(manifest: dict, index: int) -> bytes:
+    """
+    Parte `index` (desde 0) del archivo comprimido, del tamaño de un adjunto de Discord (BACKUP_CONFIG["CHUNK_SIZE_MB"]).
+    Lee de disco: llamar con asyncio.to_thread desde el bucle de eventos.
+    """
+    chunk_size = int(settings.BACKUP_CONFIG["CHUNK_SIZE_MB"] * 1024 * 1024)
+    with open(os.path.join(settings.BACKUP_CONFIG["LOCAL_DIR"], manifest["file"]), "rb") as f:
+        f.seek(index * chunk_size)
+        return f.read(chunk_size)
+
+
+def count_chunks(manifest: dict) -> int:
+    chunk_size = int(settings.BACKUP_CONFIG["CHUNK_SIZE_MB"] * 1024 * 1024)
+    return max(1, -(-manifest["size"] // chunk_size))
+
+
+def _verify_sync(manifest: dict, keep_as: Optional[str] = None) -> dict:
+    directory = settings.BACKUP_CONFIG["LOCAL_DIR"]
+    archive = os.path.join(directory, manifest["file"])
+    result = {"name": manifest["name"], "ok": False, "error": None}
+    if not os.path.exists(archive):
+        result["error"] = "missing_file"
+        return result
+    if _sha256(archive) != manifest["sha256"]:
+        result["error"] = "checksum"
+        return result
+
+    restored = os.path.join(directory, f"{manifest['name']}.verify.sqlite3")
+    try:
+        _decompress(archive, restored, manifest["compression"])
+        if _sha256(restored) != manifest["raw_sha256"]:
+            result["error"] = "checksum"
+            return result
+        info = _inspect(restored)
+        result.update(info)
+        if info["integrity"] != "ok":
+            result["error"] = "integrity"
+        elif info["schema_version"] > migrations.SCHEMA_VERSION:
+            result["error"] = "schema_newer"
+        elif info["missing_tables"]:
+            result["error"] = "missing_tables"
+        else:
+            result["ok"] = True
+            if keep_as:
+                os.replace(restored, keep_as)
+        return result
+    except (OSError, EOFError, sqlite3.DatabaseError) as e:
+        result["error"] = f"corrupt: {e}"
+        return result
+    finally:
+        if os.path.exists(restored):
+            os.remove(restored)
+
+
+async def verify_backup(manifest: dict) -> dict:
+    """
+    Verifica una copia sin tocar la base de datos en uso: hash del archivo comprimido y del descomprimido,
+    PRAGMA integrity_check, versión de esquema y tablas requeridas. `ok` es True si la copia es restaurable.
+    """
+    return await asyncio.to_thread(_verify_sync, manifest)
+
+
+async def stage_restore(manifest: dict) -> dict:
+    """
+    Verifica la copia y, si es válida, la deja preparada en BACKUP_CONFIG["RESTORE_FILE"].
+    Se aplica en el siguiente arranque (apply_pending_restore), antes de abrir conexiones y cachés.
+    """
+    return await asyncio.to_thread(_verify_sync, manifest, settings.BACKUP_CONFIG["RESTORE_FILE"])
+
+
+def apply_pending_restore() -> bool:
+    """
+    Sustituye la base de datos por una restauración preparada (si existe). Debe llamarse antes de abrir ninguna conexión.
+    La base de datos anterior se conserva junto a la original con el sufijo `.pre-restore`.
+    """
+    staged = settings.BACKUP_CONFIG["RESTORE_FILE"]
+    if not os.path.exists(staged):
+        return False
+    previous = database.DB_PATH + ".pre-restore"
+    # El -wal acompaña a su base de datos (puede contener transacciones sin volcar si el cierre no fue limpio)
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(database.DB_PATH + suffix):
+            os.replace(database.DB_PATH + suffix, previous + suffix)
+    os.replace(staged, database.DB_PATH)
+    logger.warning(f"♻️ [Backup] Base de datos restaurada desde una copia verificada (anterior en {database.DB_PATH}.pre-restore).")
+    return True
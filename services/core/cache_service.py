@@ -1,7 +1,14 @@
+import asyncio
 import logging
 import os
 import json
-from typing import Any, Optional
+import time
+import uuid
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, Callable, Optional
+from config import settings
+from services.utils.cache_helper import CacheStats, get_cache_stats
 
 logger = logging.getLogger(__name__)
 
@@ -13,38 +20,139 @@ class CacheBackend:
     async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
         raise NotImplementedError()
 
+    async def fill(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """
+        Guarda un valor recién leído de la base de datos (read-through). A diferencia de set(), no es un cambio:
+        no invalida la copia de otros procesos.
+        """
+        await self.set(key, value, ttl)
+
     async def delete(self, key: str) -> None:
         raise NotImplementedError()
 
     async def clear(self) -> None:
         raise NotImplementedError()
 
+    async def purge_expired(self, limit: Optional[int] = None) -> int:
+        """Elimina entradas caducadas de forma incremental. Los backends con expiración nativa no hacen nada."""
+        return 0
+
+    async def close(self) -> None:
+        """Libera recursos en segundo plano del backend (si los tiene)."""
+        return None
+
+    def add_invalidation_listener(self, callback: Callable[[Optional[str]], None]) -> bool:
+        """
+        Registra `callback(key)` para las claves que otros procesos modifican (None = cualquier clave pudo cambiar).
+        Devuelve False si el backend no puede avisar de esos cambios.
+        """
+        return False
+
+def _namespace_of(key: str) -> str:
+    """El espacio de nombres es el prefijo anterior al primer ':' (ej. 'guild_config:123' -> 'guild_config')."""
+    return key.split(":", 1)[0]
+
+class _Namespace:
+    """LRU acotado de un espacio de nombres: clave -> (valor, instante de expiración o None)."""
+    __slots__ = ("entries", "max_entries", "default_ttl", "stats")
+
+    def __init__(self, max_entries: int, default_ttl: Optional[int], stats: Optional[CacheStats]) -> None:
+        self.entries: OrderedDict[str, tuple[Any, Optional[float]]] = OrderedDict()
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.stats = stats
+        if stats is not None:
+            stats.track_size(self.entries.__len__)
+
 class MemoryCacheBackend(CacheBackend):
-    """Implementación de caché en memoria RAM local."""
-    def __init__(self) -> None:
-        self._store = {}
+    """Implementación de caché en memoria RAM local (LRU acotado con TTL por clave y por espacio de nombres)."""
+    def __init__(self, stats_prefix: Optional[str] = "") -> None:
+        self._namespaces: dict[str, _Namespace] = {}
+        self._stats_prefix = stats_prefix  # Prefijo de los contadores por espacio de nombres (None = sin métricas)
+
+    def _get_namespace(self, key: str) -> _Namespace:
+        name = _namespace_of(key)
+        ns = self._namespaces.get(name)
+        if ns is None:
+            limits = settings.CACHE_CONFIG["NAMESPACES"].get(name, {})
+            ns = _Namespace(
+                limits.get("MAX_ENTRIES", settings.CACHE_CONFIG["DEFAULT_MAX_ENTRIES"]),
+                limits.get("TTL", settings.CACHE_CONFIG["DEFAULT_TTL"]),
+                get_cache_stats(self._stats_prefix + name) if self._stats_prefix is not None else None
+            )
+            self._namespaces[name] = ns
+        return ns
 
     async def get(self, key: str) -> Optional[Any]:
-        return self._store.get(key)
+        ns = self._get_namespace(key)
+        item = ns.entries.get(key)
+        if item is None:
+            if ns.stats:
+                ns.stats.misses += 1
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del ns.entries[key]
+            if ns.stats:
+                ns.stats.expirations += 1
+                ns.stats.misses += 1
+            return None
+        ns.entries.move_to_end(key)
+        if ns.stats:
+            ns.stats.hits += 1
+        return value
 
     async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
-        # En memoria local omitimos el TTL por simplicidad de desarrollo
-        self._store[key] = value
+        ns = self._get_namespace(key)
+        ttl = ttl if ttl is not None else ns.default_ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        ns.entries[key] = (value, expires_at)
+        ns.entries.move_to_end(key)
+        # Expulsar los menos usados recientemente (de uno en uno, nunca la caché entera)
+        while len(ns.entries) > ns.max_entries:
+            ns.entries.popitem(last=False)
+            if ns.stats:
+                ns.stats.evictions += 1
 
     async def delete(self, key: str) -> None:
-        if key in self._store:
-            del self._store[key]
+        self._get_namespace(key).entries.pop(key, None)
 
     async def clear(self) -> None:
-        self._store.clear()
+        for ns in self._namespaces.values():
+            ns.entries.clear()
+
+    async def purge_expired(self, limit: Optional[int] = None) -> int:
+        """Revisa como máximo `limit` entradas por espacio de nombres empezando por las menos usadas."""
+        limit = limit if limit is not None else settings.CACHE_CONFIG["SWEEP_BATCH"]
+        now = time.monotonic()
+        removed = 0
+        for ns in self._namespaces.values():
+            expired = [
+                key for key, (_, expires_at) in islice(ns.entries.items(), limit)
+                if expires_at is not None and expires_at <= now
+            ]
+            for key in expired:
+                del ns.entries[key]
+            if ns.stats:
+                ns.stats.expirations += len(expired)
+            removed += len(expired)
+        return removed
+
+    def __len__(self) -> int:
+        return sum(len(ns.entries) for ns in self._namespaces.values())
+
+    def add_invalidation_listener(self, callback: Callable[[Optional[str]], None]) -> bool:
+        # Caché local del proceso: ningún otro proceso escribe en ella
+        return True
 
 class RedisCacheBackend(CacheBackend):
     """Implementación de caché usando Redis (distribuido y escalable)."""
-    def __init__(self, redis_url: str) -> None:
+    def __init__(self, redis_url: Optional[str] = None, client: Any = None) -> None:
         self.redis_url = redis_url
-        self._redis = None
-        self._fallback = MemoryCacheBackend()
-        self._active = False
+        self._redis = client  # Permite inyectar un cliente compatible (p. ej. fakeredis) para pruebas locales
+        self._fallback = MemoryCacheBackend(stats_prefix=None)
+        self._active = client is not None
+        self.record_stats = True  # Aciertos/fallos por espacio de nombres (desactivado si va detrás de un L1)
         
         try:
             import redis.asyncio as aioredis
@@ -54,6 +162,8 @@ class RedisCacheBackend(CacheBackend):
             self._aioredis = None
 
     async def _get_client(self) -> CacheBackend:
+        if self._redis is not None:
+            return self._redis
         if not self._aioredis:
             return self._fallback
             
@@ -70,6 +180,12 @@ class RedisCacheBackend(CacheBackend):
         return self._redis
 
     async def get(self, key: str) -> Optional[Any]:
+        value = await self._get(key)
+        if self.record_stats:
+            get_cache_stats(_namespace_of(key)).record_lookup(value is not None)
+        return value
+
+    async def _get(self, key: str) -> Optional[Any]:
         client = await self._get_client()
         if not self._active:
             return await client.get(key)
@@ -121,9 +237,160 @@ class RedisCacheBackend(CacheBackend):
             logger.exception("Error al limpiar base de datos en Redis")
             await self._fallback.clear()
 
+class TwoTierCacheBackend(CacheBackend):
+    """Caché cercana (L1 en memoria del proceso) delante de Redis (L2), coherente entre procesos vía pub/sub.
+
+    Cada escritura o borrado publica la clave en INVALIDATION_CHANNEL; los demás procesos la retiran de su L1.
+    Las recargas desde la base de datos (fill) no publican: no cambian nada que los demás tengan que descartar.
+    Mientras no haya suscripción activa (o Redis no esté disponible) el L1 se omite y todo va directo a L2.
+    """
+    def __init__(self, remote: RedisCacheBackend) -> None:
+        self._remote = remote
+        self._remote.record_stats = False  # Los aciertos se cuentan aquí (L1 o L2); el L1 publica los suyos como 'l1:<ns>'
+        self._local = MemoryCacheBackend(stats_prefix="l1:")
+        self._origin = uuid.uuid4().hex  # Identifica los mensajes propios para ignorarlos
+        self._channel = settings.CACHE_CONFIG["INVALIDATION_CHANNEL"]
+        self._l1_ttl = settings.CACHE_CONFIG["L1_TTL"]
+        self._listener: Optional[asyncio.Task] = None
+        self._subscribed = False
+        self._generation = 0  # Se incrementa con cada invalidación recibida
+        self._closing = False
+        self._invalidation_listeners: list[Callable[[Optional[str]], None]] = []
+
+    def _ensure_listener(self) -> None:
+        if self._closing:
+            return
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    async def _listen(self) -> None:
+        """Mantiene la suscripción al canal de invalidación, reintentando si la conexión se pierde."""
+        while not self._closing:
+            client = await self._remote._get_client()
+            if not self._remote._active:
+                return
+            pubsub = None
+            try:
+                pubsub = client.pubsub()
+                await pubsub.subscribe(self._channel)
+                # Lo que se guardó en L1 sin suscripción pudo invalidarse sin que nos enterásemos
+                await self._local.clear()
+                self._notify_listeners(None)
+                self._subscribed = True
+                while not self._closing:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is not None and message.get("type") == "message":
+                        await self._apply_invalidation(message["data"])
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Error en la suscripción de invalidación de caché (Redis pub/sub)")
+            finally:
+                self._subscribed = False
+                self._generation += 1
+                if pubsub is not None:
+                    try:
+                        close = getattr(pubsub, "aclose", None) or pubsub.close
+                        await close()
+                    except Exception:
+                        pass
+            await asyncio.sleep(settings.CACHE_CONFIG["RESUBSCRIBE_DELAY"])
+
+    async def _apply_invalidation(self, raw: str) -> None:
+        try:
+            message = json.loads(raw)
+        except (TypeError, ValueError):
+            return
+        if message.get("origin") == self._origin:
+            return
+        self._generation += 1
+        key = message.get("key")
+        if key is None:
+            await self._local.clear()
+        else:
+            await self._local.delete(key)
+        self._notify_listeners(key)
+
+    def _notify_listeners(self, key: Optional[str]) -> None:
+        for callback in self._invalidation_listeners:
+            try:
+                callback(key)
+            except Exception:
+                logger.exception(f"Error en un oyente de invalidación de caché (key: {key})")
+
+    def add_invalidation_listener(self, callback: Callable[[Optional[str]], None]) -> bool:
+        self._ensure_listener()
+        self._invalidation_listeners.append(callback)
+        return True
+
+    async def _publish(self, key: Optional[str]) -> None:
+        if not self._remote._active:
+            return
+        try:
+            client = await self._remote._get_client()
+            await client.publish(self._channel, json.dumps({"origin": self._origin, "key": key}))
+        except Exception:
+            logger.exception(f"Error publicando invalidación de caché (key: {key})")
+
+    async def get(self, key: str) -> Optional[Any]:
+        self._ensure_listener()
+        stats = get_cache_stats(_namespace_of(key))
+        if self._subscribed:
+            value = await self._local.get(key)
+            if value is not None:
+                stats.hits += 1
+                return value
+
+        generation = self._generation
+        value = await self._remote.get(key)
+        stats.record_lookup(value is not None)
+        # No instalar en L1 un valor que pudo quedar obsoleto por una invalidación recibida durante la lectura
+        if value is not None and self._subscribed and generation == self._generation:
+            await self._local.set(key, value, self._l1_ttl)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        self._ensure_listener()
+        await self._remote.set(key, value, ttl)
+        if self._subscribed:
+            await self._local.set(key, value, min(ttl, self._l1_ttl) if ttl else self._l1_ttl)
+        await self._publish(key)
+
+    async def fill(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        # Solo L2 y sin publicar: el siguiente get() lo sube a L1 con la comprobación de invalidaciones
+        self._ensure_listener()
+        await self._remote.set(key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        self._ensure_listener()
+        await self._local.delete(key)
+        await self._remote.delete(key)
+        await self._publish(key)
+
+    async def clear(self) -> None:
+        self._ensure_listener()
+        await self._local.clear()
+        await self._remote.clear()
+        await self._publish(None)
+
+    async def purge_expired(self, limit: Optional[int] = None) -> int:
+        return await self._local.purge_expired(limit)
+
+    async def close(self) -> None:
+        """Detiene la suscripción de invalidación (el bucle termina en su siguiente sondeo)."""
+        self._closing = True
+        if self._listener is not None:
+            await asyncio.wait({self._listener}, timeout=settings.CACHE_CONFIG["RESUBSCRIBE_DELAY"])
+            if not self._listener.done():
+                self._listener.cancel()
+            self._listener = None
+
 # --- CONFIGURACIÓN E INSTANCIACIÓN ---
 redis_uri = os.getenv("REDIS_URL")
 if redis_uri:
     cache = RedisCacheBackend(redis_uri)
+    if settings.CACHE_CONFIG["L1_ENABLED"]:
+        cache = TwoTierCacheBackend(cache)
 else:
     cache = MemoryCacheBackend()
@@ -3,6 +3,7 @@ import os
 import asyncio
 import sqlite3
 import aiosqlite
+from contextlib import asynccontextmanager
 from config import settings
 
 logger = logging.getLogger(__name__)
@@ -13,25 +14,91 @@ if not os.path.exists(DATA_DIR):
 
 DB_NAME = settings.DB_CONFIG["FILE_NAME"]
 DB_PATH = os.path.join(DATA_DIR, DB_NAME)
-_connection = None
+_connection = None  # Conexión única de escritura (writer)
+_read_pool: asyncio.Queue | None = None  # Conexiones de solo lectura disponibles
+_read_connections: list[aiosqlite.Connection] = []
+_read_pool_lock = asyncio.Lock()
+_write_lock = asyncio.Lock()  # Serializa transacciones sobre el writer
+_write_queue: asyncio.Queue | None = None  # Cola de escrituras agrupadas (group commit)
+_group_writer_task: asyncio.Task | None = None
+_write_stats = {"statements": 0, "commits": 0, "batches": 0, "fallbacks": 0}
 
-REQUIRED_TABLES = {
+_BATCHABLE_PREFIXES = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+
+REQUIRED_TABLES = {  # Tablas creadas por services/core/migrations.py (el resto se avisa como fuera de esquema)
     "users", "guild_stats", "guild_config", 
     "bot_persistence", "bot_statuses", "sqlite_sequence", "warns", "stream_alerts",
-    "user_inventory", "shop_items"
+    "user_inventory", "shop_items", "user_badges", "raffle_tickets"
 }
 
+async def _apply_connection_pragmas(db: aiosqlite.Connection):
+    """Aplica los PRAGMA que SQLite mantiene por conexión (no persistentes en el archivo)."""
+    await db.execute("PRAGMA synchronous=NORMAL;")
+    await db.execute("PRAGMA temp_store=MEMORY;")
+    await db.execute("PRAGMA foreign_keys=ON;")
+    await db.execute("PRAGMA mmap_size=268435456;")
+    await db.execute("PRAGMA cache_size=-64000;")
+    await db.execute("PRAGMA busy_timeout=5000;")
+
 async def get_db() -> aiosqlite.Connection:
-    """Obtiene o crea la conexión a la base de datos."""
+    """Obtiene o crea la conexión de escritura a la base de datos."""
     global _connection
     if _connection is None:
         _connection = await aiosqlite.connect(DB_PATH)
         _connection.row_factory = aiosqlite.Row
     return _connection
 
+async def _get_read_pool() -> asyncio.Queue | None:
+    """Crea bajo demanda el pool de conexiones de solo lectura (WAL permite lectores concurrentes)."""
+    global _read_pool
+    if _read_pool is not None:
+        return _read_pool
+
+    size = settings.DB_CONFIG.get("READ_POOL_SIZE", 0)
+    if size <= 0:
+        return None
+
+    async with _read_pool_lock:
+        if _read_pool is None:
+            # El writer debe existir primero para que el archivo y el modo WAL estén creados
+            await get_db()
+            pool = asyncio.Queue()
+            for _ in range(size):
+                conn = await aiosqlite.connect(DB_PATH)
+                conn.row_factory = aiosqlite.Row
+                await _apply_connection_pragmas(conn)
+                await conn.execute("PRAGMA query_only=ON;")
+                _read_connections.append(conn)
+                pool.put_nowait(conn)
+            _read_pool = pool
+            logger.debug(f"💾 Pool de lectura inicializado con {size} conexiones.")
+    return _read_pool
+
+@asynccontextmanager
+async def read_connection():
+    """Presta una conexión de lectura del pool (o el writer si el pool está desactivado)."""
+    pool = await _get_read_pool()
+    if pool is None:
+        yield await get_db()
+        return
+
+    conn = await pool.get()
+    try:
+        yield conn
+    finally:
+        pool.put_nowait(conn)
+
 async def close_db():
-    """Cierra la conexión a la base de datos de forma segura."""
-    global _connection
+    """Cierra las conexiones a la base de datos de forma segura."""
+    global _connection, _read_pool
+    await _stop_group_writer()
+    try:
+        for conn in _read_connections:
+            await conn.close()
+        _read_connections.clear()
+        _read_pool = None
+    except Exception:
+        logger.exception("❌ Error cerrando el pool de lectura de base de datos")
     try:
         if _connection:
             await _connection.close()
@@ -44,25 +111,7 @@ async def init_db_structure():
     """Inicializa la base de datos y la configuración del modo WAL."""
     db = await get_db()
     await db.execute("PRAGMA journal_mode=WAL;") 
-    await db.execute("PRAGMA synchronous=NORMAL;")
-    await db.execute("PRAGMA temp_store=MEMORY;")
-    await db.execute("PRAGMA foreign_keys=ON;")
-    await db.execute("PRAGMA mmap_size=268435456;")
-    await db.execute("PRAGMA cache_size=-64000;")
-    await db.execute("PRAGMA busy_timeout=5000;")
-
-async def ensure_column(table: str, column: str, definition: str):
-    """Verifica si una columna existe y si no, la crea."""
-    db = await get_db()
-    async with db.execute(f"PRAGMA table_info({table})") as cursor:
-        columns = [row['name'] for row in await cursor.fetchall()]
-        if column not in columns:
-            try:
-                await db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
-                await db.commit()
-                logger.info(f"🛠️ Columna '{column}' añadida a la tabla '{table}'.")
-            except Exception:
-                logger.exception(f"❌ Error en migración {table}.{column}")
+    await _apply_connection_pragmas(db)
 
 async def cleanup_unused_tables():
     """Detecta y alerta sobre tablas que ya no son utilizadas por el bot."""
@@ -76,28 +125,160 @@ async def cleanup_unused_tables():
 
 async def execute(query: str, params: tuple = ()):
     """Ejecuta una consulta de escritura (INSERT, UPDATE, DELETE)."""
+    if settings.DB_CONFIG.get("GROUP_COMMIT", False) and _is_batchable(query):
+        await execute_batched(query, params)
+        return
+
     async def _op():
-        db = await get_db()
-        await db.execute(query, params)
-        await db.commit()
+        async with _write_lock:
+            db = await get_db()
+            await db.execute(query, params)
+            await db.commit()
+            _write_stats["statements"] += 1
+            _write_stats["commits"] += 1
     await execute_with_retry(_op)
 
+def _is_batchable(query: str) -> bool:
+    """Solo DML puede agruparse; PRAGMA, VACUUM o DDL se ejecutan fuera de la cola."""
+    return query.lstrip().upper().startswith(_BATCHABLE_PREFIXES)
+
+async def execute_batched(query: str, params: tuple = ()):
+    """Encola una escritura para el group commit y espera a que su transacción se confirme."""
+    global _write_queue, _group_writer_task
+    if _write_queue is None:
+        _write_queue = asyncio.Queue()
+    if _group_writer_task is None or _group_writer_task.done():
+        _group_writer_task = asyncio.get_running_loop().create_task(_group_commit_loop(_write_queue))
+
+    future = asyncio.get_running_loop().create_future()
+    _write_queue.put_nowait((query, params, future))
+    await future
+
+async def _group_commit_loop(queue: asyncio.Queue):
+    """Drena la cola en lotes: espera hasta GROUP_COMMIT_WINDOW_MS o GROUP_COMMIT_MAX_BATCH sentencias."""
+    window = settings.DB_CONFIG.get("GROUP_COMMIT_WINDOW_MS", 5) / 1000
+    max_batch = settings.DB_CONFIG.get("GROUP_COMMIT_MAX_BATCH", 200)
+    loop = asyncio.get_running_loop()
+
+    while True:
+        item = await queue.get()
+        if item is None:
+            return
+        batch = [item]
+        stop = False
+        deadline = loop.time() + window
+
+        while len(batch) < max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if item is None:
+                stop = True
+                break
+            batch.append(item)
+
+        try:
+            await _commit_batch(batch)
+        except Exception:
+            logger.exception("❌ Error inesperado en el group commit de escrituras")
+        if stop:
+            return
+
+async def _commit_batch(batch: list[tuple[str, tuple, asyncio.Future]]):
+    """Confirma un lote en una sola transacción; si una sentencia falla, reintenta una a una."""
+    async def _op():
+        async with _write_lock:
+            db = await get_db()
+            await db.execute("BEGIN TRANSACTION;")
+            try:
+                for query, params, _ in batch:
+                    await db.execute(query, params)
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+
+    try:
+        await execute_with_retry(_op)
+        _write_stats["statements"] += len(batch)
+        _write_stats["commits"] += 1
+        _write_stats["batches"] += 1
+        for _, _, future in batch:
+            if not future.done():
+                future.set_result(None)
+        return
+    except Exception as e:
+        if len(batch) == 1:
+            _, _, future = batch[0]
+            if not future.done():
+                future.set_exception(e)
+            return
+
+    # Aislar la sentencia defectuosa para no fallar las escrituras válidas del lote
+    _write_stats["fallbacks"] += 1
+    for query, params, future in batch:
+        async def _single(query=query, params=params):
+            async with _write_lock:
+                db = await get_db()
+                await db.execute(query, params)
+                await db.commit()
+        try:
+            await execute_with_retry(_single)
+            _write_stats["statements"] += 1
+            _write_stats["commits"] += 1
+            if not future.done():
+                future.set_result(None)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+
+async def _stop_group_writer():
+    """Vacía la cola pendiente y detiene la tarea de group commit."""
+    global _group_writer_task
+    if _group_writer_task is None:
+        return
+    if not _group_writer_task.done():
+        _write_queue.put_nowait(None)
+        try:
+            await _group_writer_task
+        except Exception:
+            logger.exception("❌ Error deteniendo el group commit de escrituras")
+    _group_writer_task = None
+
+def get_write_stats() -> dict:
+    """Devuelve contadores de sentencias escritas y commits realizados por el writer."""
+    return dict(_write_stats)
+
 async def fetch_one(query: str, params: tuple = ()):
     """Ejecuta una consulta de lectura y retorna un solo resultado."""
     async def _op():
-        db = await get_db()
-        async with db.execute(query, params) as c: 
-            return await c.fetchone()
+        async with read_connection() as db:
+            async with db.execute(query, params) as c: 
+                return await c.fetchone()
     return await execute_with_retry(_op)
 
 async def fetch_all(query: str, params: tuple = ()):
     """Ejecuta una consulta de lectura y retorna todos los resultados."""
     async def _op():
-        db = await get_db()
-        async with db.execute(query, params) as c: 
-            return await c.fetchall()
+        async with read_connection() as db:
+            async with db.execute(query, params) as c: 
+                return await c.fetchall()
     return await execute_with_retry(_op)
 
+async def iter_batches(query: str, params: tuple = (), size: int = 5000):
+    """Recorre el resultado de una lectura en lotes de `size` filas; entre lotes el event loop queda libre."""
+    async with read_connection() as db:
+        async with db.execute(query, params) as c:
+            while True:
+                rows = await c.fetchmany(size)
+                if not rows:
+                    return
+                yield rows
+
 async def execute_with_retry(func, *args, **kwargs):
     """Wrapper para reintentar operaciones si SQLite está bloqueada."""
     retries = settings.DB_CONFIG["RETRIES"]
@@ -114,16 +295,47 @@ async def execute_with_retry(func, *args, **kwargs):
         except Exception as e:
             raise e
 
-async def execute_transaction(queries: list[tuple[str, tuple]]):
-    """Ejecuta una lista de consultas (query, params) dentro de una única transacción atómica."""
+async def execute_many(query: str, params_seq: list[tuple]):
+    """Ejecuta la misma sentencia para cada juego de parámetros dentro de una única transacción."""
+    await execute_many_batches([(query, params_seq)])
+
+async def execute_many_batches(batches: list[tuple[str, list[tuple]]]):
+    """Ejecuta varios executemany (query, lista de parámetros) dentro de una única transacción atómica."""
+    batches = [(query, params_seq) for query, params_seq in batches if params_seq]
+    if not batches:
+        return
+
     async def _op():
-        db = await get_db()
-        await db.execute("BEGIN TRANSACTION;")
-        try:
-            for query, params in queries:
-                await db.execute(query, params)
-            await db.commit()
-        except Exception as e:
-            await db.rollback()
-            raise e
+        async with _write_lock:
+            db = await get_db()
+            await db.execute("BEGIN TRANSACTION;")
+            try:
+                for query, params_seq in batches:
+                    await db.executemany(query, params_seq)
+                await db.commit()
+            except Exception as e:
+                await db.rollback()
+                raise e
+            _write_stats["statements"] += sum(len(params_seq) for _, params_seq in batches)
+            _write_stats["commits"] += 1
     await execute_with_retry(_op)
+
+async def execute_transaction(queries: list[tuple[str, tuple]]) -> int:
+    """Ejecuta una lista de consultas (query, params) dentro de una única transacción atómica. Devuelve las filas afectadas."""
+    async def _op():
+        async with _write_lock:
+            db = await get_db()
+            await db.execute("BEGIN TRANSACTION;")
+            changed = 0
+            try:
+                for query, params in queries:
+                    cursor = await db.execute(query, params)
+                    changed += max(cursor.rowcount, 0)
+                await db.commit()
+            except Exception as e:
+                await db.rollback()
+                raise e
+            _write_stats["statements"] += len(queries)
+            _write_stats["commits"] += 1
+            return changed
+    return await execute_with_retry(_op)
@@ -1,7 +1,10 @@
 import logging
 import asyncio
+import hashlib
+import json
+import os
 from config import settings
-from services.core import database
+from services.core import backup_service, database, migrations, startup_profiler
 from services.repositories.config_repository import ConfigRepository
 from services.repositories.xp_repository import XpRepository, calculate_xp_required
 from services.repositories.user_repository import UserRepository
@@ -21,14 +24,7 @@ fetch_one = database.fetch_one
 fetch_all = database.fetch_all
 DB_PATH = database.DB_PATH
 
-REQUIRED_TABLES = {
-    "users", "guild_stats", "guild_config", "bot_persistence",
-    "bot_statuses", "warns", "stream_alerts", "user_inventory", "shop_items"
-}
-
-async def _ensure_column(table: str, column: str, definition: str):
-    """Verifica si una columna existe en la tabla y si no, la crea."""
-    await database.ensure_column(table, column, definition)
+REQUIRED_TABLES = database.REQUIRED_TABLES
 
 from services.repositories.xp_repository import _xp_cache
 
@@ -40,205 +36,21 @@ async def close_db():
         await database.close_db()
 
 async def init_db():
-    """Inicializa la estructura de base de datos, tablas y migraciones."""
+    """Inicializa la base de datos: restauración pendiente, modo WAL, migraciones del esquema y catálogo de la tienda."""
+    # Una copia preparada con /dev backup restaurar sustituye al archivo antes de abrir ninguna conexión
+    if backup_service.apply_pending_restore():
+        from services.core.cache_service import cache
+        await cache.clear()  # Con Redis la caché sobrevive al reinicio y contendría datos posteriores a la copia
     await database.init_db_structure()
-    db = await database.get_db()
-    
-    # 1. Usuarios (Preferencias globales)
-    await db.execute("""
-    CREATE TABLE IF NOT EXISTS users (
-        user_id INTEGER PRIMARY KEY,
-        birthday TEXT DEFAULT NULL,
-        celebrate BOOLEAN DEFAULT 1,
-        custom_prefix TEXT DEFAULT NULL,
-        description TEXT DEFAULT 'Sin descripción.',
-        personal_level_msg TEXT DEFAULT NULL,
-        personal_birthday_msg TEXT DEFAULT NULL,
-        coins INTEGER DEFAULT 0,
-        gender TEXT DEFAULT NULL,
-        web_notifications BOOLEAN DEFAULT 1
-    )
-    """)
-    
-    # 2. Estadísticas por Servidor (XP, Niveles, Rebirths)
-    await db.execute("""
-    CREATE TABLE IF NOT EXISTS guild_stats (
-        guild_id INTEGER,
-        user_id INTEGER,
-        rebirths INTEGER DEFAULT 0,
-        xp INTEGER DEFAULT 0,
-        level INTEGER DEFAULT 1,
-        PRIMARY KEY (guild_id, user_id)
-    )
-    """)
-    
-    # Crear índice para optimizar leaderboard si no existe
-    await db.execute("CREATE INDEX IF NOT EXISTS idx_ranking ON guild_stats (guild_id, rebirths DESC, level DESC, xp DESC)")
-
-    # 3. Configuración del Servidor
-    await db.execute("""
-    CREATE TABLE IF NOT EXISTS guild_config (
-        guild_id INTEGER PRIMARY KEY,
-        chaos_enabled BOOLEAN DEFAULT 1,
-        chaos_probability REAL DEFAULT 0.01,
-        welcome_channel_id INTEGER DEFAULT 0,
-        confessions_channel_id INTEGER DEFAULT 0,
-        logs_channel_id INTEGER DEFAULT 0,
-        birthday_channel_id INTEGER DEFAULT 0,
-        autorole_id INTEGER DEFAULT 0,
-        mention_response TEXT DEFAULT NULL,
-        server_level_msg TEXT DEFAULT NULL,
-        server_birthday_msg TEXT DEFAULT NULL,
-        server_kick_msg TEXT DEFAULT NULL,
-        server_ban_msg TEXT DEFAULT NULL,
-        server_welcome_msg TEXT DEFAULT NULL,
-        server_goodbye_msg TEXT DEFAULT NULL,
-
-        minecraft_channel_id INTEGER DEFAULT 0,
-        wordday_channel_id INTEGER DEFAULT 0,
-        wordday_role_id INTEGER DEFAULT 0,
-        language TEXT DEFAULT 'es',
-        festivedays_enabled BOOLEAN DEFAULT 0,
-        festivedays_channel_id INTEGER DEFAULT 0,
-        festivedays_role_id INTEGER DEFAULT 0
-    )
-    """)
-
-    # 4. Persistencia Binaria Genérica
-    await db.execute("""
-    CREATE TABLE IF NOT EXISTS bot_persistence (
-        namespace TEXT,
-        key TEXT,
-        data BLOB,
-        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-        PRIMARY KEY (namespace, key)
-    )
-    """)
-
-    # 5. Estados Rotativos del Bot
-    await db.execute("""
-    CREATE TABLE IF NOT EXISTS bot_statuses (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        type TEXT DEFAULT 'playing',
-        text TEXT
-    )
-    """)
-
-    # 6. Registro de Advertencias (Warns)
-    await db.execute("""
-    CREATE TABLE IF NOT EXISTS warns (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        guild_id INTEGER,
-        user_id INTEGER,
-        mod_id INTEGER,
-        reason TEXT,
-        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
-
-    # 7. Alertas de Stream (YouTube / Twitch)
-    await db.execute("""
-    CREATE TABLE IF NOT EXISTS stream_alerts (
-        guild_id INTEGER,
-        platform TEXT,
-        channel_name TEXT,
-        discord_channel_id INTEGER,
-        role_id INTEGER DEFAULT 0,
-        custom_message TEXT DEFAULT NULL,
-        last_status TEXT DEFAULT NULL,
-        last_check DATETIME DEFAULT (datetime('now')),
-        PRIMARY KEY (guild_id, platform, channel_name)
-    )
-    """)
-
-    # 8. Inventario de Usuario (Objetos comprados)
-    await db.execute("""
-    CREATE TABLE IF NOT EXISTS user_inventory (
-        user_id INTEGER,
-        item_id TEXT,
-        quantity INTEGER DEFAULT 1,
-        PRIMARY KEY (user_id, item_id)
-    )
-    """)
-
-    # 9. Catálogo de Objetos de la Tienda
-    await db.execute("""
-    CREATE TABLE IF NOT EXISTS shop_items (
-        item_id TEXT PRIMARY KEY,
-        emoji TEXT,
-        cost INTEGER,
-        availability TEXT DEFAULT 'permanent',
-        start_date TEXT DEFAULT NULL,
-        end_date TEXT DEFAULT NULL,
-        purchase_limit INTEGER DEFAULT NULL,
-        total_stock INTEGER DEFAULT NULL,
-        name_default TEXT DEFAULT NULL,
-        desc_default TEXT DEFAULT NULL,
-        category TEXT DEFAULT 'Otros',
-        names_json TEXT DEFAULT NULL,
-        descs_json TEXT DEFAULT NULL
-    )
-    """)
-
-    # 10. Insignias de Usuario
-    await db.execute("""
-    CREATE TABLE IF NOT EXISTS user_badges (
-        user_id INTEGER,
-        badge_id TEXT,
-        PRIMARY KEY (user_id, badge_id)
-    )
-    """)
+    with startup_profiler.phase("database.migrations"):
+        await migrations.migrate()
 
-    # 11. Boletos de Lotería Diaria
-    await db.execute("""
-    CREATE TABLE IF NOT EXISTS raffle_tickets (
-        user_id INTEGER PRIMARY KEY,
-        ticket_count INTEGER DEFAULT 1
-    )
-    """)
-
-    # Sincronizar catálogo con config/shop_items.json
-    await sync_shop_catalog()
-
-
-    # --- MIGRACIONES DE COLUMNAS (Asegura consistencia estructural en actualizaciones) ---
-    await _ensure_column("users", "coins", "INTEGER DEFAULT 0")
-    await _ensure_column("users", "gender", "TEXT DEFAULT NULL")
-    await _ensure_column("users", "bank_coins", "INTEGER DEFAULT 0")
-    await _ensure_column("users", "web_notifications", "BOOLEAN DEFAULT 1")
-    
-    await _ensure_column("shop_items", "category", "TEXT DEFAULT 'Otros'")
-    await _ensure_column("shop_items", "names_json", "TEXT DEFAULT NULL")
-    await _ensure_column("shop_items", "descs_json", "TEXT DEFAULT NULL")
-    
-    await _ensure_column("guild_stats", "rebirths", "INTEGER DEFAULT 0")
-    
-    await _ensure_column("guild_config", "server_welcome_msg", "TEXT DEFAULT NULL")
-    await _ensure_column("guild_config", "server_goodbye_msg", "TEXT DEFAULT NULL")
-
-    await _ensure_column("guild_config", "minecraft_channel_id", "INTEGER DEFAULT 0")
-    await _ensure_column("guild_config", "wordday_channel_id", "INTEGER DEFAULT 0")
-    await _ensure_column("guild_config", "wordday_role_id", "INTEGER DEFAULT 0")
-    await _ensure_column("guild_config", "language", "TEXT DEFAULT 'es'")
-    
-    await _ensure_column("guild_config", "festivedays_enabled", "BOOLEAN DEFAULT 0")
-    await _ensure_column("guild_config", "festivedays_channel_id", "INTEGER DEFAULT 0")
-    await _ensure_column("guild_config", "festivedays_role_id", "INTEGER DEFAULT 0")
-    
-    await _ensure_column("bot_persistence", "created_at", "DATETIME DEFAULT CURRENT_TIMESTAMP")
-    
-    await _ensure_column("stream_alerts", "guild_id", "INTEGER")
-    await _ensure_column("stream_alerts", "platform", "TEXT")
-    await _ensure_column("stream_alerts", "channel_name", "TEXT")
-    await _ensure_column("stream_alerts", "discord_channel_id", "INTEGER")
-    await _ensure_column("stream_alerts", "role_id", "INTEGER DEFAULT 0")
-    await _ensure_column("stream_alerts", "custom_message", "TEXT DEFAULT NULL")
-    await _ensure_column("stream_alerts", "last_status", "TEXT DEFAULT NULL")
-    await _ensure_column("stream_alerts", "last_check", "DATETIME DEFAULT (datetime('now'))")
+    # Sincronizar catálogo con config/shop_items.json (requiere el esquema ya migrado)
+    with startup_profiler.phase("database.shop_catalog"):
+        await sync_shop_catalog()
 
     await database.cleanup_unused_tables()
-    await db.commit()
-    logger.info("💾 Base de datos inicializada correctamente.")
+    logger.info(f"💾 Base de datos inicializada correctamente (esquema v{migrations.SCHEMA_VERSION}).")
 
 # --- DELEGACIÓN DE MÉTODOS DE REPOSITORIO ---
 
@@ -248,12 +60,18 @@ async def get_guild_config(guild_id: int) -> dict:
 async def update_guild_config(guild_id: int, updates: dict):
     await ConfigRepository.update_guild_config(guild_id, updates)
 
+async def preload_guild_configs(guild_ids: list[int]) -> int:
+    return await ConfigRepository.preload_guild_configs(guild_ids)
+
 async def get_user_prefix(user_id: int) -> str | None:
     return await UserRepository.get_user_prefix(user_id)
 
 async def set_user_prefix(user_id: int, prefix: str | None):
     await UserRepository.set_user_prefix(user_id, prefix)
 
+async def load_prefix_index() -> int:
+    return await UserRepository.load_prefix_index()
+
 async def get_user_coins(user_id: int) -> int:
     return await UserRepository.get_user_coins(user_id)
 
@@ -266,14 +84,17 @@ async def set_user_coins(user_id: int, amount: int):
 async def add_xp(guild_id: int, user_id: int, amount: int) -> tuple[int, bool]:
     return await XpRepository.add_xp(guild_id, user_id, amount)
 
+async def add_xp_many(grants: list[tuple[int, int, int]]) -> list[tuple[int, int, int]]:
+    return await XpRepository.add_xp_many(grants)
+
 async def set_user_xp_level(guild_id: int, user_id: int, xp: int, level: int, rebirths: int = None):
     await XpRepository.set_user_xp_level(guild_id, user_id, xp, level, rebirths)
 
 async def do_rebirth(guild_id: int, user_id: int) -> tuple[bool, any]:
     return await XpRepository.do_rebirth(guild_id, user_id)
 
-async def flush_xp_cache():
-    await XpRepository.flush_xp_cache()
+async def flush_xp_cache() -> dict:
+    return await XpRepository.flush_xp_cache()
 
 async def get_user_guild_data(guild_id: int, user_id: int) -> dict:
     return await XpRepository.get_user_guild_data(guild_id, user_id)
@@ -288,6 +109,11 @@ def clear_memory_cache():
     except RuntimeError:
         asyncio.run(cache.clear())
 
+async def purge_expired_cache() -> int:
+    """Expira de forma incremental las entradas caducadas de la caché (sin vaciarla entera)."""
+    from services.core.cache_service import cache
+    return await cache.purge_expired()
+
 async def prune_old_persistence(days: int = 7):
     """Elimina datos de persistencia más antiguos que X días."""
     await database.execute("DELETE FROM bot_persistence WHERE created_at < datetime('now', ?) OR created_at IS NULL", (f'-{days} days',))
@@ -349,53 +175,72 @@ async def delete_shop_item(item_id: str) -> bool:
 async def get_shop_item_global_sales(item_id: str) -> int:
     return await ShopRepository.get_global_sales(item_id)
 
-async def sync_shop_catalog() -> bool:
-    """Sincroniza el catálogo de la tienda desde el archivo config/shop_items.json a la base de datos."""
-    import json
-    import os
+def _shop_catalog_row(item: dict) -> tuple:
+    """Convierte un objeto de shop_items.json en la fila de shop_items, con su huella SHA-256 al final."""
+    names_dict = item.get("names", {})
+    descs_dict = item.get("descriptions", {})
+    item_id = item["item_id"]
+
+    row = (
+        item_id,
+        item["emoji"],
+        item["cost"],
+        item.get("availability", "permanent"),
+        item.get("start_date"),
+        item.get("end_date"),
+        item.get("purchase_limit"),
+        item.get("total_stock"),
+        names_dict.get("es") or names_dict.get("en") or next(iter(names_dict.values()), item_id),
+        descs_dict.get("es") or descs_dict.get("en") or next(iter(descs_dict.values()), ""),
+        item.get("category", "Otros"),
+        json.dumps(names_dict, ensure_ascii=False),
+        json.dumps(descs_dict, ensure_ascii=False)
+    )
+    # JSON canónico de la fila: cambia si cambia el objeto o la forma de derivar sus columnas
+    canonical = json.dumps(row, ensure_ascii=False, separators=(",", ":"))
+    return row + (hashlib.sha256(canonical.encode("utf-8")).hexdigest(),)
+
+async def sync_shop_catalog() -> dict | None:
+    """
+    Sincroniza el catálogo de la tienda desde config/shop_items.json comparando huellas de contenido:
+    solo se escriben (en una única transacción) los objetos añadidos, modificados o retirados.
+    Devuelve {"added": [...], "updated": [...], "removed": [...], "unchanged": n} o None si falla.
+    """
     json_path = "./config/shop_items.json"
     if not os.path.exists(json_path):
         logger.warning(f"⚠️ [DB Service] Archivo no encontrado: {json_path}")
-        return False
+        return None
     try:
         with open(json_path, "r", encoding="utf-8") as f:
             items_data = json.load(f)
-        
-        json_item_ids = set()
+
+        stored = await ShopRepository.get_content_hashes()
+        report = {"added": [], "updated": [], "removed": [], "unchanged": 0}
+        upserts = []
         for item in items_data:
-            item_id = item["item_id"]
-            json_item_ids.add(item_id)
-            
-            names_dict = item.get("names", {})
-            descs_dict = item.get("descriptions", {})
-            names_str = json.dumps(names_dict, ensure_ascii=False)
-            descs_str = json.dumps(descs_dict, ensure_ascii=False)
-            
-            name_default = names_dict.get("es") or names_dict.get("en") or next(iter(names_dict.values()), item_id)
-            desc_default = descs_dict.get("es") or descs_dict.get("en") or next(iter(descs_dict.values()), "")
-            
-            await add_or_update_shop_item(
-                item_id=item_id,
-                emoji=item["emoji"],
-                cost=item["cost"],
-                availability=item.get("availability", "permanent"),
-                start_date=item.get("start_date"),
-                end_date=item.get("end_date"),
-                purchase_limit=item.get("purchase_limit"),
-                total_stock=item.get("total_stock"),
-                name_default=name_default,
-                desc_default=desc_default,
-                category=item.get("category", "Otros"),
-                names_json=names_str,
-                descs_json=descs_str
+            row = _shop_catalog_row(item)
+            item_id, content_hash = row[0], row[-1]
+            if item_id not in stored:
+                report["added"].append(item_id)
+            elif stored[item_id] != content_hash:
+                report["updated"].append(item_id)
+            else:
+                report["unchanged"] += 1
+                continue
+            upserts.append(row)
+
+        json_item_ids = {item["item_id"] for item in items_data}
+        report["removed"] = [item_id for item_id in stored if item_id not in json_item_ids]
+
+        if upserts or report["removed"]:
+            await ShopRepository.apply_catalog_changes(upserts, report["removed"])
+            for item_id in report["removed"]:
+                logger.info(f"🗑️ [DB Service] Eliminando item '{item_id}' no presente en shop_items.json")
+            logger.info(
+                f"🛒 [DB Service] Catálogo sincronizado: {len(report['added'])} añadidos, {len(report['updated'])} "
+                f"modificados, {len(report['removed'])} eliminados, {report['unchanged']} sin cambios."
             )
-        
-        db_items = await get_all_shop_items()
-        for db_item in db_items:
-            if db_item["item_id"] not in json_item_ids:
-                logger.info(f"🗑️ [DB Service] Eliminando item '{db_item['item_id']}' no presente en shop_items.json")
-                await delete_shop_item(db_item["item_id"])
-        return True
+        return report
     except Exception as e:
         logger.error(f"❌ Error al sincronizar shop_items.json: {e}")
-        return False
+        return None
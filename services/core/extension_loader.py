@@ -0,0 +1,63 @@
+import asyncio
+import logging
+import pathlib
+from discord.ext import commands
+from config import settings
+from services.core import startup_profiler
+
+logger = logging.getLogger(__name__)
+
+
+def is_feature_enabled(feature: str) -> bool:
+    """Indica si un subsistema opcional (FEATURES_CONFIG) está activo; los desconocidos se consideran activos."""
+    return settings.FEATURES_CONFIG.get(feature, True)
+
+
+def disabled_extensions() -> set[str]:
+    """Extensiones que pertenecen a subsistemas desactivados."""
+    return {
+        name
+        for feature, names in settings.EXTENSIONS_CONFIG["FEATURE_EXTENSIONS"].items()
+        if not is_feature_enabled(feature)
+        for name in names
+    }
+
+
+def discover_extensions(root: str = "cogs") -> list[str]:
+    """Nombres de extensión de todos los módulos de `root` (orden alfabético), sin los de subsistemas desactivados."""
+    skipped = disabled_extensions()
+    names = []
+    for file in sorted(pathlib.Path(root).rglob("*.py")):
+        if file.name == "__init__.py":
+            continue
+        name = ".".join(file.with_suffix("").parts)
+        if name in skipped:
+            logger.info(f"⏭️ [Bot] Extensión omitida (subsistema desactivado): {name}")
+            continue
+        names.append(name)
+    return names
+
+
+async def _load_one(bot: commands.Bot, name: str, semaphore: asyncio.Semaphore) -> bool:
+    async with semaphore:
+        try:
+            with startup_profiler.extension(name):
+                await bot.load_extension(name)
+            logger.debug(f'✅ Extensión cargada: {name}')
+            return True
+        except Exception:
+            logger.exception(f'❌ Error cargando {name}')
+            return False
+
+
+async def load_extensions(bot: commands.Bot, names: list[str], concurrency: int | None = None) -> int:
+    """
+    Carga las extensiones (hasta `concurrency` a la vez; por defecto una detrás de otra) y devuelve cuántas se cargaron.
+    Con `concurrency` > 1 el perfil de arranque de cada extensión incluye el tiempo que espera a las demás.
+    Las extensiones no pueden depender unas de otras al cargarse: el orden de llegada de sus cogs no está garantizado.
+    """
+    concurrency = concurrency or settings.EXTENSIONS_CONFIG["CONCURRENCY"]
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    # Cada corrutina de gather corre en su propia tarea (y copia de contexto): el perfil atribuye bien cada add_cog
+    results = await asyncio.gather(*(_load_one(bot, name, semaphore) for name in names))
+    return sum(results)
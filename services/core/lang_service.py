@@ -10,9 +10,12 @@ async def get_guild_lang(guild_id: int) -> str:
     """
     # Usamos la nueva función optimizada
     config = await db_service.get_guild_config(guild_id)
-    
+    return get_lang_from_config(config)
+
+def get_lang_from_config(config: dict) -> str:
+    """Idioma de una configuración ya obtenida (evita volver a consultar la caché)."""
     # Si la config existe y tiene idioma, lo retornamos, si no, default
-    return config.get("language", DEFAULT_LANG)
+    return config.get("language") or DEFAULT_LANG
 
 def get_text(key: str, lang: str = "es", **kwargs) -> str:
     """
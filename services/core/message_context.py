@@ -0,0 +1,40 @@
+import logging
+from services.core import db_service, lang_service
+
+logger = logging.getLogger(__name__)
+
+class MessageContext:
+    """
+    Datos de un mensaje resueltos una sola vez por el despachador (configuración, idioma, prefijo y banderas del autor)
+    y compartidos por todos los manejadores de on_message.
+    """
+    __slots__ = ("message", "guild", "author", "config", "lang", "prefixes", "is_command", "mentions_bot")
+
+    def __init__(self, message, config: dict, lang: str, prefixes: tuple[str, ...], mentions_bot: bool) -> None:
+        self.message = message
+        self.guild = message.guild
+        self.author = message.author
+        self.config = config  # Instantánea de la configuración del servidor para este mensaje
+        self.lang = lang
+        self.prefixes = prefixes
+        self.is_command = message.content.startswith(prefixes) if prefixes else False
+        self.mentions_bot = mentions_bot
+
+    @property
+    def channel(self):
+        return self.message.channel
+
+    @property
+    def content(self) -> str:
+        return self.message.content
+
+
+async def build(bot, message) -> MessageContext:
+    """Construye el contexto con una única lectura de configuración y una sola resolución de prefijo."""
+    config = await db_service.get_guild_config(message.guild.id)
+    lang = lang_service.get_lang_from_config(config)
+
+    prefix = await bot.get_prefix(message)
+    prefixes = (prefix,) if isinstance(prefix, str) else tuple(prefix)
+    mentions_bot = bot.user in message.mentions
+    return MessageContext(message, config, lang, prefixes, mentions_bot)
@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional
+from config import settings
+from services.core.message_context import MessageContext
+
+logger = logging.getLogger(__name__)
+
+MessageHandler = Callable[[MessageContext], Awaitable[None]]
+
+class HandlerStats:
+    """Contadores de latencia y fallos de un manejador de mensajes."""
+    __slots__ = ("name", "calls", "errors", "timeouts", "slow", "total_time", "max_time")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.slow = 0  # Ejecuciones por encima de SLOW_HANDLER_MS
+        self.total_time = 0.0  # Segundos acumulados
+        self.max_time = 0.0
+
+    def record(self, seconds: float, slow: bool) -> None:
+        self.calls += 1
+        self.total_time += seconds
+        if seconds > self.max_time:
+            self.max_time = seconds
+        if slow:
+            self.slow += 1
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "slow": self.slow,
+            "avg_ms": round(self.total_time * 1000 / self.calls, 3) if self.calls else None,
+            "max_ms": round(self.max_time * 1000, 3)
+        }
+
+
+class _Registration:
+    __slots__ = ("name", "handler", "timeout", "stats")
+
+    def __init__(self, name: str, handler: MessageHandler, timeout: float, stats: HandlerStats) -> None:
+        self.name = name
+        self.handler = handler
+        self.timeout = timeout
+        self.stats = stats
+
+
+# Manejadores registrados por los cogs: nombre -> registro (orden de registro conservado)
+_handlers: Dict[str, _Registration] = {}
+# Contadores por nombre; sobreviven a la recarga de un cog
+_handler_stats: Dict[str, HandlerStats] = {}
+
+
+def register_handler(name: str, handler: MessageHandler, timeout: Optional[float] = None) -> None:
+    """
+    Registra un manejador de on_message. Se ejecuta en paralelo con los demás, por lo que no debe
+    depender de su orden ni de sus efectos. Sin `timeout` se usa DISPATCHER_CONFIG["TIMEOUTS"][name].
+    """
+    config = settings.DISPATCHER_CONFIG
+    if timeout is None:
+        timeout = config["TIMEOUTS"].get(name, config["HANDLER_TIMEOUT"])
+    stats = _handler_stats.get(name)
+    if stats is None:
+        stats = _handler_stats[name] = HandlerStats(name)
+    _handlers[name] = _Registration(name, handler, timeout, stats)
+
+def unregister_handler(name: str) -> None:
+    _handlers.pop(name, None)
+
+def get_handler_stats_snapshot() -> Dict[str, dict]:
+    """Instantánea de los contadores de cada manejador, ordenada por nombre."""
+    return {name: _handler_stats[name].as_dict() for name in sorted(_handler_stats)}
+
+
+async def _run(registration: _Registration, ctx: MessageContext) -> None:
+    stats = registration.stats
+    start = time.perf_counter()
+    timed_out = False
+    try:
+        await asyncio.wait_for(registration.handler(ctx), timeout=registration.timeout)
+    except asyncio.TimeoutError:
+        stats.timeouts += 1
+        timed_out = True
+        logger.warning(f"⏱️ Manejador '{registration.name}' cancelado tras {registration.timeout}s en {ctx.guild.id}")
+    except Exception:
+        stats.errors += 1
+        logger.exception(f"Error en el manejador de mensajes '{registration.name}'")
+    finally:
+        elapsed = time.perf_counter() - start
+        slow = elapsed * 1000 > settings.DISPATCHER_CONFIG["SLOW_HANDLER_MS"]
+        stats.record(elapsed, slow)
+        if slow and not timed_out:
+            logger.warning(f"🐢 Manejador '{registration.name}' lento: {elapsed * 1000:.0f} ms en {ctx.guild.id}")
+
+
+async def dispatch(ctx: MessageContext) -> None:
+    """Ejecuta los manejadores registrados de forma concurrente, cada uno con su propio límite de tiempo."""
+    registrations = list(_handlers.values())
+    if not registrations:
+        return
+    if len(registrations) == 1:
+        await _run(registrations[0], ctx)
+        return
+    await asyncio.gather(*(_run(registration, ctx) for registration in registrations))
@@ -0,0 +1,280 @@
+import logging
+import time
+from typing import NamedTuple, Union
+import aiosqlite
+from services.core import database
+
+logger = logging.getLogger(__name__)
+
+class AddColumn(NamedTuple):
+    """
+    Paso idempotente: añade la columna solo si la tabla aún no la tiene (bases anteriores a las migraciones).
+    SQLite no admite ADD COLUMN con un DEFAULT no constante (CURRENT_TIMESTAMP, expresiones) en tablas con filas:
+    en ese caso la columna se añade sin él y `backfill` (expresión SQL) rellena las filas existentes.
+    """
+    table: str
+    column: str
+    definition: str
+    backfill: str | None = None
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    steps: list[Union[str, AddColumn]]
+
+
+# =============================================================================
+# MIGRACIONES DEL ESQUEMA (fuente única de verdad de la estructura de la base de datos)
+# =============================================================================
+# Cada migración se aplica una sola vez y su número queda guardado en PRAGMA user_version.
+# Nunca se edita una migración ya publicada: los cambios de esquema se añaden como una nueva al final.
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "Esquema base (tablas, índice de ranking y columnas añadidas antes del versionado)", [
+        # 1. Usuarios (Preferencias globales)
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            user_id INTEGER PRIMARY KEY,
+            birthday TEXT DEFAULT NULL,
+            celebrate BOOLEAN DEFAULT 1,
+            custom_prefix TEXT DEFAULT NULL,
+            description TEXT DEFAULT 'Sin descripción.',
+            personal_level_msg TEXT DEFAULT NULL,
+            personal_birthday_msg TEXT DEFAULT NULL,
+            coins INTEGER DEFAULT 0,
+            gender TEXT DEFAULT NULL,
+            web_notifications BOOLEAN DEFAULT 1
+        )
+        """,
+
+        # 2. Estadísticas por Servidor (XP, Niveles, Rebirths)
+        """
+        CREATE TABLE IF NOT EXISTS guild_stats (
+            guild_id INTEGER,
+            user_id INTEGER,
+            rebirths INTEGER DEFAULT 0,
+            xp INTEGER DEFAULT 0,
+            level INTEGER DEFAULT 1,
+            PRIMARY KEY (guild_id, user_id)
+        )
+        """,
+
+        # 3. Configuración del Servidor
+        """
+        CREATE TABLE IF NOT EXISTS guild_config (
+            guild_id INTEGER PRIMARY KEY,
+            chaos_enabled BOOLEAN DEFAULT 1,
+            chaos_probability REAL DEFAULT 0.01,
+            welcome_channel_id INTEGER DEFAULT 0,
+            confessions_channel_id INTEGER DEFAULT 0,
+            logs_channel_id INTEGER DEFAULT 0,
+            birthday_channel_id INTEGER DEFAULT 0,
+            autorole_id INTEGER DEFAULT 0,
+            mention_response TEXT DEFAULT NULL,
+            server_level_msg TEXT DEFAULT NULL,
+            server_birthday_msg TEXT DEFAULT NULL,
+            server_kick_msg TEXT DEFAULT NULL,
+            server_ban_msg TEXT DEFAULT NULL,
+            server_welcome_msg TEXT DEFAULT NULL,
+            server_goodbye_msg TEXT DEFAULT NULL,
+
+            minecraft_channel_id INTEGER DEFAULT 0,
+            wordday_channel_id INTEGER DEFAULT 0,
+            wordday_role_id INTEGER DEFAULT 0,
+            language TEXT DEFAULT 'es',
+            festivedays_enabled BOOLEAN DEFAULT 0,
+            festivedays_channel_id INTEGER DEFAULT 0,
+            festivedays_role_id INTEGER DEFAULT 0
+        )
+        """,
+
+        # 4. Persistencia Binaria Genérica
+        """
+        CREATE TABLE IF NOT EXISTS bot_persistence (
+            namespace TEXT,
+            key TEXT,
+            data BLOB,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (namespace, key)
+        )
+        """,
+
+        # 5. Estados Rotativos del Bot
+        """
+        CREATE TABLE IF NOT EXISTS bot_statuses (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            type TEXT DEFAULT 'playing',
+            text TEXT
+        )
+        """,
+
+        # 6. Registro de Advertencias (Warns)
+        """
+        CREATE TABLE IF NOT EXISTS warns (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            guild_id INTEGER,
+            user_id INTEGER,
+            mod_id INTEGER,
+            reason TEXT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+
+        # 7. Alertas de Stream (YouTube / Twitch)
+        """
+        CREATE TABLE IF NOT EXISTS stream_alerts (
+            guild_id INTEGER,
+            platform TEXT,
+            channel_name TEXT,
+            discord_channel_id INTEGER,
+            role_id INTEGER DEFAULT 0,
+            custom_message TEXT DEFAULT NULL,
+            last_status TEXT DEFAULT NULL,
+            last_check DATETIME DEFAULT (datetime('now')),
+            PRIMARY KEY (guild_id, platform, channel_name)
+        )
+        """,
+
+        # 8. Inventario de Usuario (Objetos comprados)
+        """
+        CREATE TABLE IF NOT EXISTS user_inventory (
+            user_id INTEGER,
+            item_id TEXT,
+            quantity INTEGER DEFAULT 1,
+            PRIMARY KEY (user_id, item_id)
+        )
+        """,
+
+        # 9. Catálogo de Objetos de la Tienda
+        """
+        CREATE TABLE IF NOT EXISTS shop_items (
+            item_id TEXT PRIMARY KEY,
+            emoji TEXT,
+            cost INTEGER,
+            availability TEXT DEFAULT 'permanent',
+            start_date TEXT DEFAULT NULL,
+            end_date TEXT DEFAULT NULL,
+            purchase_limit INTEGER DEFAULT NULL,
+            total_stock INTEGER DEFAULT NULL,
+            name_default TEXT DEFAULT NULL,
+            desc_default TEXT DEFAULT NULL,
+            category TEXT DEFAULT 'Otros',
+            names_json TEXT DEFAULT NULL,
+            descs_json TEXT DEFAULT NULL
+        )
+        """,
+
+        # 10. Insignias de Usuario
+        """
+        CREATE TABLE IF NOT EXISTS user_badges (
+            user_id INTEGER,
+            badge_id TEXT,
+            PRIMARY KEY (user_id, badge_id)
+        )
+        """,
+
+        # 11. Boletos de Lotería Diaria
+        """
+        CREATE TABLE IF NOT EXISTS raffle_tickets (
+            user_id INTEGER PRIMARY KEY,
+            ticket_count INTEGER DEFAULT 1
+        )
+        """,
+
+        # Columnas que las bases creadas con versiones antiguas del bot pueden no tener
+        AddColumn("users", "coins", "INTEGER DEFAULT 0"),
+        AddColumn("users", "gender", "TEXT DEFAULT NULL"),
+        AddColumn("users", "bank_coins", "INTEGER DEFAULT 0"),
+        AddColumn("users", "web_notifications", "BOOLEAN DEFAULT 1"),
+        AddColumn("shop_items", "category", "TEXT DEFAULT 'Otros'"),
+        AddColumn("shop_items", "names_json", "TEXT DEFAULT NULL"),
+        AddColumn("shop_items", "descs_json", "TEXT DEFAULT NULL"),
+        AddColumn("guild_stats", "rebirths", "INTEGER DEFAULT 0"),
+        AddColumn("guild_config", "server_welcome_msg", "TEXT DEFAULT NULL"),
+        AddColumn("guild_config", "server_goodbye_msg", "TEXT DEFAULT NULL"),
+        AddColumn("guild_config", "minecraft_channel_id", "INTEGER DEFAULT 0"),
+        AddColumn("guild_config", "wordday_channel_id", "INTEGER DEFAULT 0"),
+        AddColumn("guild_config", "wordday_role_id", "INTEGER DEFAULT 0"),
+        AddColumn("guild_config", "language", "TEXT DEFAULT 'es'"),
+        AddColumn("guild_config", "festivedays_enabled", "BOOLEAN DEFAULT 0"),
+        AddColumn("guild_config", "festivedays_channel_id", "INTEGER DEFAULT 0"),
+        AddColumn("guild_config", "festivedays_role_id", "INTEGER DEFAULT 0"),
+        AddColumn("bot_persistence", "created_at", "DATETIME DEFAULT NULL", backfill="CURRENT_TIMESTAMP"),
+        AddColumn("stream_alerts", "guild_id", "INTEGER"),
+        AddColumn("stream_alerts", "platform", "TEXT"),
+        AddColumn("stream_alerts", "channel_name", "TEXT"),
+        AddColumn("stream_alerts", "discord_channel_id", "INTEGER"),
+        AddColumn("stream_alerts", "role_id", "INTEGER DEFAULT 0"),
+        AddColumn("stream_alerts", "custom_message", "TEXT DEFAULT NULL"),
+        AddColumn("stream_alerts", "last_status", "TEXT DEFAULT NULL"),
+        AddColumn("stream_alerts", "last_check", "DATETIME DEFAULT NULL", backfill="datetime('now')"),
+
+        # Índice para optimizar el leaderboard (tras añadir 'rebirths' a las bases antiguas)
+        "CREATE INDEX IF NOT EXISTS idx_ranking ON guild_stats (guild_id, rebirths DESC, level DESC, xp DESC)",
+    ]),
+    Migration(2, "Huella de contenido de los objetos de la tienda (sincronización incremental del catálogo)", [
+        AddColumn("shop_items", "content_hash", "TEXT DEFAULT NULL"),
+    ]),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+
+async def _table_columns(db: aiosqlite.Connection, table: str) -> set[str]:
+    async with db.execute(f"PRAGMA table_info({table})") as cursor:
+        return {row[1] for row in await cursor.fetchall()}
+
+
+async def get_schema_version(db: aiosqlite.Connection) -> int:
+    async with db.execute("PRAGMA user_version") as cursor:
+        row = await cursor.fetchone()
+    return row[0]
+
+
+async def migrate(db: aiosqlite.Connection | None = None) -> list[int]:
+    """
+    Aplica en una única transacción las migraciones pendientes y devuelve sus versiones.
+    Con la base de datos al día solo cuesta una lectura de PRAGMA user_version.
+    """
+    if db is None:
+        db = await database.get_db()
+    current = await get_schema_version(db)
+    if current > SCHEMA_VERSION:
+        logger.warning(f"⚠️ La base de datos está en la versión v{current}, posterior a la del bot (v{SCHEMA_VERSION}).")
+    pending = [m for m in MIGRATIONS if m.version > current]
+    if not pending:
+        return []
+
+    start = time.perf_counter()
+    columns: dict[str, set[str]] = {}  # Columnas por tabla, leídas una sola vez por ejecución
+    await db.execute("BEGIN TRANSACTION;")
+    try:
+        for migration in pending:
+            for step in migration.steps:
+                if isinstance(step, AddColumn):
+                    if step.table not in columns:
+                        columns[step.table] = await _table_columns(db, step.table)
+                    if step.column in columns[step.table]:
+                        continue
+                    await db.execute(f"ALTER TABLE {step.table} ADD COLUMN {step.column} {step.definition}")
+                    if step.backfill:
+                        await db.execute(f"UPDATE {step.table} SET {step.column} = {step.backfill} WHERE {step.column} IS NULL")
+                    columns[step.table].add(step.column)
+                    logger.info(f"🛠️ Columna '{step.column}' añadida a la tabla '{step.table}'.")
+                else:
+                    await db.execute(step)
+                    columns.clear()  # El paso puede haber cambiado la estructura de cualquier tabla
+            logger.info(f"🛠️ Migración {migration.version} aplicada: {migration.description}")
+        await db.execute(f"PRAGMA user_version = {pending[-1].version}")
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        logger.exception(f"❌ Error migrando el esquema desde la versión {current}; no se aplicó ningún cambio.")
+        raise
+
+    logger.info(
+        f"💾 Esquema actualizado de v{current} a v{pending[-1].version} "
+        f"({len(pending)} migraciones) en {(time.perf_counter() - start) * 1000:.0f} ms."
+    )
+    return [m.version for m in pending]
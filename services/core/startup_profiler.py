@@ -0,0 +1,133 @@
+import contextvars
+import datetime
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Origen del cronómetro: main.py importa este módulo antes que cualquier dependencia pesada
+_origin = time.perf_counter()
+_started_at = datetime.datetime.now(datetime.timezone.utc)
+
+_phases: list[dict] = []  # Fases del arranque: {"name", "start_ms", "duration_ms"}
+_extensions: Dict[str, dict] = {}  # Extensión -> {"start_ms", "total_ms", "setup_ms", "import_ms", "ok"}
+_marks: Dict[str, float] = {}  # Hitos puntuales (p. ej. "ready") en ms desde el origen
+_finished = False  # Tras el volcado final se ignoran las fases (recargas de cogs, reconexiones)
+# Extensión que se está cargando en la tarea actual (para atribuirle el tiempo de add_cog)
+_loading_extension: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("loading_extension", default=None)
+
+
+def _ms_since_origin(instant: float) -> float:
+    return round((instant - _origin) * 1000, 3)
+
+
+def record_phase(name: str, start: float, end: float) -> None:
+    """Registra una fase con instantes de time.perf_counter(). Los nombres con punto son subfases ('database.migrations')."""
+    if _finished:
+        return
+    _phases.append({"name": name, "start_ms": _ms_since_origin(start), "duration_ms": round((end - start) * 1000, 3)})
+
+
+def record_since_origin(name: str) -> None:
+    """Registra como fase todo lo transcurrido desde el origen (p. ej. las importaciones de main.py)."""
+    record_phase(name, _origin, time.perf_counter())
+
+
+@contextmanager
+def phase(name: str):
+    """Cronometra un bloque (síncrono o con awaits dentro) como fase del arranque."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(name, start, time.perf_counter())
+
+
+def mark(name: str) -> bool:
+    """Registra un hito solo la primera vez (on_ready se repite en cada reconexión). Devuelve si era nuevo."""
+    if name in _marks:
+        return False
+    _marks[name] = _ms_since_origin(time.perf_counter())
+    return True
+
+
+@contextmanager
+def extension(name: str):
+    """Cronometra la carga de una extensión; el tiempo de add_cog se descuenta como 'setup' (ver record_cog_setup)."""
+    start = time.perf_counter()
+    entry = _extensions[name] = {"start_ms": _ms_since_origin(start), "total_ms": None, "setup_ms": 0.0, "import_ms": None, "ok": False}
+    token = _loading_extension.set(name)
+    try:
+        yield
+        entry["ok"] = True
+    finally:
+        _loading_extension.reset(token)
+        entry["total_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        # Resto de la carga: importación del módulo y sus dependencias + constructor del cog
+        entry["import_ms"] = round(max(entry["total_ms"] - entry["setup_ms"], 0.0), 3)
+
+
+def record_cog_setup(seconds: float) -> None:
+    """Suma a la extensión en carga el tiempo de add_cog (registro de comandos y cog_load)."""
+    name = _loading_extension.get()
+    if name is not None and name in _extensions:
+        _extensions[name]["setup_ms"] = round(_extensions[name]["setup_ms"] + seconds * 1000, 3)
+
+
+def get_boot_timeline() -> dict:
+    """Instantánea del arranque: fases por orden de inicio y extensiones de la más lenta a la más rápida."""
+    return {
+        "started_at": _started_at.isoformat(timespec="seconds"),
+        "version": settings.CONFIG["bot_config"]["version"],
+        "python": sys.version.split()[0],
+        "marks": dict(_marks),
+        "phases": sorted(_phases, key=lambda p: p["start_ms"]),
+        "extensions": {
+            name: _extensions[name]
+            for name in sorted(_extensions, key=lambda n: _extensions[n]["total_ms"] or 0.0, reverse=True)
+        }
+    }
+
+
+def dump(final: bool = False) -> None:
+    """
+    Escribe la línea de tiempo completa en BOOT_PROFILE_CONFIG["FILE"]. Con `final` (arranque terminado)
+    añade además un resumen a BOOT_PROFILE_CONFIG["HISTORY_FILE"] para comparar versiones entre sí.
+    """
+    global _finished
+    config = settings.BOOT_PROFILE_CONFIG
+    if final:
+        _finished = True
+    timeline = get_boot_timeline()
+    try:
+        os.makedirs(os.path.dirname(config["FILE"]), exist_ok=True)
+        tmp_path = config["FILE"] + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(timeline, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, config["FILE"])
+        if not final:
+            return
+
+        summary = {
+            "started_at": timeline["started_at"],
+            "version": timeline["version"],
+            "marks": timeline["marks"],
+            "phases": {p["name"]: p["duration_ms"] for p in timeline["phases"]},
+            "extensions_ms": round(sum(e["total_ms"] or 0.0 for e in _extensions.values()), 3)
+        }
+        history = []
+        if os.path.exists(config["HISTORY_FILE"]):
+            with open(config["HISTORY_FILE"], "r", encoding="utf-8") as f:
+                history = [line for line in f.read().splitlines() if line.strip()]
+        history = history[-(config["HISTORY_LIMIT"] - 1):] if config["HISTORY_LIMIT"] > 1 else []
+        history.append(json.dumps(summary, ensure_ascii=False))
+        with open(config["HISTORY_FILE"], "w", encoding="utf-8") as f:
+            f.write("\n".join(history) + "\n")
+    except Exception:
+        logger.exception("❌ Error guardando el perfil de arranque")
@@ -4,6 +4,7 @@ import logging
 from services.core import db_service, lang_service
 from services.repositories.user_repository import UserRepository
 from ui.social import birthday_ui
+from services.utils import channel_resolver
 
 logger = logging.getLogger(__name__)
 
@@ -27,10 +28,7 @@ async def notify_guild_birthdays(guild: discord.Guild, users_rows: list):
     lang = await lang_service.get_guild_lang(guild.id)
     config = await db_service.get_guild_config(guild.id)
     
-    channel_id = config.get('birthday_channel_id')
-    if not channel_id: return
-    
-    channel = guild.get_channel(channel_id)
+    channel = channel_resolver.get_sendable_channel(guild, config.get('birthday_channel_id'))
     if not channel: return
 
     genericos = []
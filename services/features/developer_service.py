@@ -3,7 +3,7 @@ import asyncio
 import os
 import sys
 import discord
-from services.core import db_service
+from services.core import backup_service, db_service
 from services.core import lang_service
 from services.repositories.status_repository import StatusRepository
 from services.repositories.user_repository import UserRepository
@@ -11,14 +11,21 @@ from ui.admin import developer_ui
 
 logger = logging.getLogger(__name__)
 
-try:
-    import psutil
-    HAS_PSUTIL = True
-except ImportError:
-    HAS_PSUTIL = False
+_psutil = None  # Módulo psutil, importado en la primera consulta de métricas (False = no instalado)
+
+def _get_psutil():
+    global _psutil
+    if _psutil is None:
+        try:
+            import psutil
+            _psutil = psutil
+        except ImportError:
+            _psutil = False
+    return _psutil or None
 
 def _get_psutil_info_sync():
-    if not HAS_PSUTIL: return {"available": False}
+    psutil = _get_psutil()
+    if psutil is None: return {"available": False}
     try:
         proc = psutil.Process()
         with proc.oneshot():
@@ -106,6 +113,27 @@ async def handle_db_maintenance(lang: str):
     await perform_db_maintenance()
     return developer_ui.get_db_maint_success_embed(lang)
 
+async def handle_backup(action: str, name: str | None, lang: str):
+    """Crea, lista, verifica o prepara la restauración de una copia local y retorna el embed del resultado."""
+    if action == "crear":
+        await db_service.flush_xp_cache()
+        manifest = await backup_service.create_backup()
+        return developer_ui.get_backup_created_embed(lang, manifest)
+
+    backups = backup_service.list_backups()
+    if action == "listar":
+        return developer_ui.get_backup_list_embed(lang, backups)
+
+    manifest = backup_service.get_backup(name) if name else (backups[0] if backups else None)
+    if manifest is None:
+        return developer_ui.get_backup_check_embed(lang, {"name": name or "—", "ok": False, "error": "not_found"})
+    if action == "restaurar":
+        result = await backup_service.stage_restore(manifest)
+        if result["ok"]:
+            logger.warning(f"♻️ [Backup] Restauración de {manifest['name']} preparada; se aplicará en el próximo arranque.")
+        return developer_ui.get_backup_check_embed(lang, result, restore=True)
+    return developer_ui.get_backup_check_embed(lang, await backup_service.verify_backup(manifest))
+
 async def handle_edit_coins(user_id: int, amount: int, lang: str):
     """Establece directamente las monedas de un usuario y retorna el embed de éxito."""
     await db_service.set_user_coins(user_id, amount)
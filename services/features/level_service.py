@@ -2,6 +2,7 @@ import discord
 import logging
 from services.core import db_service, lang_service
 from services.repositories.xp_repository import XpRepository
+from services.utils import channel_resolver
 from config import settings
 from ui.social import level_ui
 
@@ -24,7 +25,8 @@ async def handle_rank(guild: discord.Guild, target: discord.Member, lang: str):
         return None
 
     xp_next = db_service.calculate_xp_required(stats['level'])
-    return level_ui.get_rank_embed(target, stats, xp_next, lang)
+    position, total = await XpRepository.get_user_rank(guild.id, target.id)
+    return level_ui.get_rank_embed(target, stats, xp_next, lang, position, total)
 
 
 
@@ -49,13 +51,13 @@ async def handle_rebirth(guild_id: int, user_id: int, lang: str):
     else:
         return level_ui.get_rebirth_fail_embed(lang, result), False
 
-async def get_level_up_message(member: discord.Member, nuevo_nivel: int, lang: str) -> str:
+async def get_level_up_message(member: discord.Member, nuevo_nivel: int, lang: str, guild_conf: dict = None) -> str:
     """Obtiene y formatea el mensaje de subida de nivel según prioridades (Usuario > Servidor > Default)."""
     from services.repositories.user_repository import UserRepository
-    user_data = await UserRepository.get_user_data(member.id)
-    user_msg = user_data.get('personal_level_msg') if user_data else None
+    user_msg = await UserRepository.get_personal_level_msg(member.id)
     
-    guild_conf = await db_service.get_guild_config(member.guild.id)
+    if guild_conf is None:
+        guild_conf = await db_service.get_guild_config(member.guild.id)
     
     msg_raw = None
     if user_msg:
@@ -69,23 +71,20 @@ async def get_level_up_message(member: discord.Member, nuevo_nivel: int, lang: s
                   .replace("{level}", str(nuevo_nivel))\
                   .replace("{server}", member.guild.name)
 
-
-async def notify_level_up(guild: discord.Guild, member: discord.Member, nuevo_nivel: int, fallback_channel=None):
-    """Centraliza la notificación de subida de nivel para eventos y tareas."""
+async def notify_level_up(guild: discord.Guild, member: discord.Member, nuevo_nivel: int, fallback_channel=None, lang: str = None, config: dict = None):
+    """Centraliza la notificación de subida de nivel para eventos y tareas (reutiliza lang/config si ya se conocen)."""
     try:
-        lang = await lang_service.get_guild_lang(guild.id)
-        config = await db_service.get_guild_config(guild.id)
-        msg = await get_level_up_message(member, nuevo_nivel, lang)
+        if config is None:
+            config = await db_service.get_guild_config(guild.id)
+        if lang is None:
+            lang = lang_service.get_lang_from_config(config)
+        msg = await get_level_up_message(member, nuevo_nivel, lang, config)
         
-        # Estrategia de canal: Configurado -> Fallback -> Primer canal disponible
+        # Estrategia de canal: Configurado -> Fallback -> Primer canal disponible (resuelto desde caché)
         log_id = config.get('logs_channel_id')
-        dest_channel = guild.get_channel(log_id) if log_id else fallback_channel
-
-        if not dest_channel or not dest_channel.permissions_for(guild.me).send_messages:
-            # Buscar el primer canal donde el bot pueda hablar si el destino falló
-            dest_channel = next((ch for ch in guild.text_channels if ch.permissions_for(guild.me).send_messages), None)
+        dest_channel = channel_resolver.resolve(guild, log_id if log_id else fallback_channel)
         
         if dest_channel:
             await dest_channel.send(msg)
     except Exception:
-        logger.exception("Error notificando nivel")
\ No newline at end of file
+        logger.exception("Error notificando nivel")
@@ -7,7 +7,7 @@ import wavelink
 from discord import app_commands
 from config import settings
 from services.core import lang_service, persistence_service
-from services.utils import embed_service
+from services.utils import embed_service, channel_resolver
 from ui.music.music_ui import MusicControls, create_np_embed, format_duration
 from services.features.music import queue_service, presence_service
 
@@ -35,15 +35,8 @@ async def send_now_playing(bot: discord.Client, player: wavelink.Player, track:
             # Fallback dinámico si por alguna razón 'home' es None pero el bot está reproduciendo en un servidor
             guild = bot.get_guild(guild_id)
             if guild:
-                # 1. Intentar el system_channel
-                if guild.system_channel and guild.system_channel.permissions_for(guild.me).send_messages:
-                    home = guild.system_channel
-                else:
-                    # 2. Buscar el primer canal de texto disponible donde tengamos permisos de envío
-                    for channel in guild.text_channels:
-                        if channel.permissions_for(guild.me).send_messages:
-                            home = channel
-                            break
+                # system_channel y, si no sirve, el primer canal de texto con permisos de envío
+                home = channel_resolver.resolve(guild, guild.system_channel)
             
             if home:
                 logger.warning(f"⚠️ [Music Service] 'home' era None en guild {guild_id}. Se usó el canal fallback: {home.name}")
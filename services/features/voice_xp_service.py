@@ -0,0 +1,125 @@
+import logging
+import time
+import discord
+from config import settings
+from services.core import db_service
+
+logger = logging.getLogger(__name__)
+
+# Sesiones de voz elegibles abiertas: (guild_id, user_id) -> instante monotónico de inicio
+_sessions: dict[tuple[int, int], float] = {}
+# Segundos elegibles acumulados todavía no convertidos en XP: (guild_id, user_id) -> segundos
+_accrued: dict[tuple[int, int], float] = {}
+
+
+def is_eligible(member: discord.Member, channel) -> bool:
+    """Mismas reglas que el antiguo escaneo: canal de voz no AFK, al menos 2 personas, sin mute/deaf ni bots."""
+    if channel is None or member.bot or not isinstance(channel, discord.VoiceChannel):
+        return False
+    afk = member.guild.afk_channel
+    if afk and channel.id == afk.id:
+        return False
+    if len(channel.members) < 2:
+        return False
+    voice = member.voice
+    if voice is None or voice.self_mute or voice.self_deaf or voice.deaf:
+        return False
+    return True
+
+
+def _open_session(key: tuple[int, int], now: float):
+    if key not in _sessions:
+        _sessions[key] = now
+
+
+def _close_session(key: tuple[int, int], now: float):
+    start = _sessions.pop(key, None)
+    if start is not None:
+        _accrued[key] = _accrued.get(key, 0.0) + (now - start)
+
+
+def _refresh_member(member: discord.Member, channel, now: float):
+    key = (member.guild.id, member.id)
+    if is_eligible(member, channel):
+        _open_session(key, now)
+    else:
+        _close_session(key, now)
+
+
+def refresh_channel(channel, now: float | None = None):
+    """Reevalúa a los miembros de un canal (al entrar o salir alguien cambia el mínimo de 2 personas)."""
+    if channel is None:
+        return
+    now = time.monotonic() if now is None else now
+    for member in channel.members:
+        _refresh_member(member, channel, now)
+
+
+def handle_voice_state_update(member: discord.Member, before: discord.VoiceState, after: discord.VoiceState):
+    """Actualiza las sesiones afectadas por un cambio de estado de voz (solo los canales implicados)."""
+    now = time.monotonic()
+    if before.channel is not None and before.channel != after.channel:
+        refresh_channel(before.channel, now)
+    if after.channel is not None:
+        refresh_channel(after.channel, now)
+    if after.channel is None or member not in after.channel.members:
+        _close_session((member.guild.id, member.id), now)
+
+
+def sync_guilds(guilds):
+    """Reconstruye las sesiones desde el estado de voz actual (arranque o reconexión del gateway)."""
+    now = time.monotonic()
+    eligible = set()
+    for guild in guilds:
+        for channel in guild.voice_channels:
+            for member in channel.members:
+                if is_eligible(member, channel):
+                    eligible.add((guild.id, member.id))
+
+    for key in [k for k in _sessions if k not in eligible]:
+        _close_session(key, now)
+    for key in eligible:
+        _open_session(key, now)
+
+
+def drop_guild(guild_id: int):
+    """Descarta las sesiones de un servidor del que el bot ha salido."""
+    for key in [k for k in _sessions if k[0] == guild_id]:
+        del _sessions[key]
+    for key in [k for k in _accrued if k[0] == guild_id]:
+        del _accrued[key]
+
+
+def collect_grants(now: float | None = None) -> list[tuple[int, int, int]]:
+    """Liquida el tiempo elegible acumulado en XP (VOICE_AMOUNT por VOICE_INTERVAL), conservando los restos."""
+    now = time.monotonic() if now is None else now
+    seconds_per_xp = settings.XP_CONFIG["VOICE_INTERVAL"] / settings.XP_CONFIG["VOICE_AMOUNT"]
+
+    for key, start in _sessions.items():
+        _accrued[key] = _accrued.get(key, 0.0) + (now - start)
+        _sessions[key] = now
+
+    grants = []
+    for key, seconds in list(_accrued.items()):
+        amount = int(seconds // seconds_per_xp)
+        if amount > 0:
+            grants.append((key[0], key[1], amount))
+            seconds -= amount * seconds_per_xp
+        if key in _sessions:
+            _accrued[key] = seconds
+        else:
+            # Sesión cerrada: el resto (menos de 1 XP) no se arrastra indefinidamente
+            del _accrued[key]
+    return grants
+
+
+async def credit_voice_xp() -> list[tuple[int, int, int]]:
+    """Acredita en un solo lote la XP de voz pendiente y devuelve las subidas de nivel."""
+    grants = collect_grants()
+    if not grants:
+        return []
+    return await db_service.add_xp_many(grants)
+
+
+def get_active_sessions() -> int:
+    return len(_sessions)
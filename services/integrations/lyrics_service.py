@@ -6,7 +6,7 @@ from services.utils.cache_helper import SimpleTTLCache
 logger = logging.getLogger(__name__)
 
 # Caché con límite de 100 letras de canciones y expiración de 24 horas (86400 segundos)
-_lyrics_cache = SimpleTTLCache(max_size=100, ttl=86400)
+_lyrics_cache = SimpleTTLCache(max_size=100, ttl=86400, name="lyrics")
 
 async def get_lyrics(title: str, artist: str) -> str:
     """Busca letras en LRCLIB (Open Source)."""
@@ -15,12 +15,11 @@ async def get_lyrics(title: str, artist: str) -> str:
         
     artist_name = artist or ""
     key = (title.lower().strip(), artist_name.lower().strip())
-    
-    cached = _lyrics_cache.get(key)
-    if cached is not None:
-        logger.debug(f"💾 [Lyrics] Usando caché para letra de: {title} - {artist_name}")
-        return cached
+    # Varias peticiones simultáneas de la misma canción comparten una única búsqueda
+    return await _lyrics_cache.get_or_load(key, lambda: _fetch_lyrics(title, artist_name))
 
+async def _fetch_lyrics(title: str, artist_name: str) -> str:
+    """Consulta LRCLIB (primero coincidencia exacta y después búsqueda amplia)."""
     try:
         # Limpieza avanzada del título para maximizar aciertos
         title_clean = re.sub(r"[\(\[].*?[\)\]]", "", title)
@@ -36,7 +35,6 @@ async def get_lyrics(title: str, artist: str) -> str:
         if data and isinstance(data, dict):
             lyrics = data.get("plainLyrics") or data.get("syncedLyrics")
             if lyrics:
-                _lyrics_cache.set(key, lyrics)
                 return lyrics
             
         # Intento de búsqueda más amplia si falla o no existe (404)
@@ -46,7 +44,6 @@ async def get_lyrics(title: str, artist: str) -> str:
         if data_search and isinstance(data_search, list) and len(data_search) > 0:
             lyrics = data_search[0].get("plainLyrics")
             if lyrics:
-                _lyrics_cache.set(key, lyrics)
                 return lyrics
     except Exception as e:
         logger.error(f"Error fetching lyrics: {e}")
@@ -6,13 +6,14 @@ from services.utils.cache_helper import SimpleTTLCache
 logger = logging.getLogger(__name__)
 
 # Caché con límite de 200 entradas y expiración de 12 horas (43200 segundos)
-_translation_cache = SimpleTTLCache(max_size=200, ttl=43200)
+_translation_cache = SimpleTTLCache(max_size=200, ttl=43200, name="translation")
 
 async def traducir(texto: str, idioma_destino: str = 'es') -> dict:
     """
     Función asíncrona pública.
     Realiza la traducción de forma asíncrona usando la sesión global de http_client,
     evitando crear conexiones HTTP redundantes y previniendo bloqueos de hilo.
+    Las peticiones concurrentes del mismo texto e idioma comparten una única llamada a la API.
     """
     if not texto:
         return {
@@ -22,15 +23,15 @@ async def traducir(texto: str, idioma_destino: str = 'es') -> dict:
         }
 
     key = (texto.strip(), idioma_destino)
-    cached = _translation_cache.get(key)
-    if cached is not None:
-        logger.debug(f"💾 [Translator] Usando caché para traducción: '{texto[:30]}...' -> {idioma_destino}")
-        return {
-            "original": texto,
-            "traducido": cached,
-            "idioma": idioma_destino
-        }
+    resultado = await _translation_cache.get_or_load(key, lambda: _fetch_translation(texto, idioma_destino))
+    return {
+        "original": texto,
+        "traducido": resultado,
+        "idioma": idioma_destino
+    }
 
+async def _fetch_translation(texto: str, idioma_destino: str) -> str:
+    """Consulta la API de Google Translate y devuelve el texto traducido."""
     texto_encoded = urllib.parse.quote(texto)
     url = f"https://translate.googleapis.com/translate_a/single?client=gtx&sl=auto&tl={idioma_destino}&dt=t&q={texto_encoded}"
 
@@ -45,14 +46,9 @@ async def traducir(texto: str, idioma_destino: str = 'es') -> dict:
             
             resultado = "".join(traducciones)
             if resultado:
-                _translation_cache.set(key, resultado)
-                return {
-                    "original": texto,
-                    "traducido": resultado,
-                    "idioma": idioma_destino
-                }
+                return resultado
                 
         raise ValueError("Respuesta de API de traducción vacía o inválida.")
     except Exception as e:
         logger.error(f"Error al conectar con el servicio de traducción: {e}")
-        raise ValueError(f"Error al conectar con el servicio de traducción: {e}")
\ No newline at end of file
+        raise ValueError(f"Error al conectar con el servicio de traducción: {e}")
@@ -1,9 +1,22 @@
 import logging
+import random
+from config import settings
 from services.core import database
 from services.core.cache_service import cache
+from services.utils.cache_helper import SingleFlight, get_cache_stats
 
 logger = logging.getLogger(__name__)
 
+_config_loads = SingleFlight(stats=get_cache_stats("guild_config"))  # Lecturas de configuración en curso por servidor
+_default_config: dict | None = None  # Valores por defecto de una fila de guild_config (según el esquema)
+
+def _preload_ttl() -> int | None:
+    """TTL con variación aleatoria para la precarga: escalona las caducidades en vez de recargarlo todo a la vez."""
+    ttl = settings.CACHE_CONFIG["NAMESPACES"].get("guild_config", {}).get("TTL", settings.CACHE_CONFIG["DEFAULT_TTL"])
+    if not ttl:
+        return ttl
+    return max(1, int(ttl * (1 - random.uniform(0, settings.CACHE_CONFIG["PRELOAD_TTL_JITTER"]))))
+
 class ConfigRepository:
     @staticmethod
     def _get_cache_key(guild_id: int) -> str:
@@ -17,30 +30,76 @@ class ConfigRepository:
         if cached is not None:
             return cached
 
-        # Si no está en caché, leemos de la base de datos
+        return await _config_loads.do(guild_id, lambda: cls._load_guild_config(guild_id))
+
+    @classmethod
+    async def _load_guild_config(cls, guild_id: int) -> dict:
+        """Lee la configuración de la base de datos y la guarda en caché (valores por defecto si no hay fila)."""
         row = await database.fetch_one("SELECT * FROM guild_config WHERE guild_id = ?", (guild_id,))
-        if row:
-            config = dict(row)
-        else:
-            # Si no existe, inicializamos con los valores por defecto y guardamos en DB
-            await database.execute("INSERT OR IGNORE INTO guild_config (guild_id) VALUES (?)", (guild_id,))
-            new_row = await database.fetch_one("SELECT * FROM guild_config WHERE guild_id = ?", (guild_id,))
-            config = dict(new_row) if new_row else {}
+        config = dict(row) if row else await cls.get_default_config(guild_id)
 
         # Guardar en caché
-        await cache.set(cache_key, config)
+        await cache.fill(cls._get_cache_key(guild_id), config)
+        return config
+
+    @classmethod
+    async def get_default_config(cls, guild_id: int) -> dict:
+        """Configuración en memoria de un servidor sin fila: DEFAULT de cada columna + DEFAULT_GUILD_CONFIG. No escribe en DB."""
+        global _default_config
+        if _default_config is None:
+            columns = await database.fetch_all("PRAGMA table_info(guild_config)")
+            # SQLite evalúa las expresiones DEFAULT del esquema, así los tipos coinciden con una fila real
+            exprs = [col['dflt_value'] if col['dflt_value'] is not None else "NULL" for col in columns]
+            row = await database.fetch_one(f"SELECT {', '.join(exprs)}")
+            defaults = {col['name']: row[i] for i, col in enumerate(columns)}
+            defaults.update({k: v for k, v in settings.DEFAULT_GUILD_CONFIG.items() if k in defaults})
+            _default_config = defaults
+        config = dict(_default_config)
+        config['guild_id'] = guild_id
         return config
 
+    @classmethod
+    async def preload_guild_configs(cls, guild_ids: list[int]) -> int:
+        """Calienta la caché con la configuración de varios servidores usando una sola consulta. Devuelve cuántas había en DB."""
+        wanted = set(guild_ids)
+        if not wanted:
+            return 0
+        if len(wanted) <= 500:
+            placeholders = ",".join("?" * len(wanted))
+            rows = await database.fetch_all(f"SELECT * FROM guild_config WHERE guild_id IN ({placeholders})", tuple(wanted))
+        else:
+            # Con muchos servidores es más barato leer la tabla entera que trocear la lista en varios IN
+            rows = await database.fetch_all("SELECT * FROM guild_config")
+        found = 0
+        for row in rows:
+            if row['guild_id'] in wanted:
+                await cache.fill(cls._get_cache_key(row['guild_id']), dict(row), _preload_ttl())
+                wanted.discard(row['guild_id'])
+                found += 1
+        for guild_id in wanted:
+            await cache.fill(cls._get_cache_key(guild_id), await cls.get_default_config(guild_id), _preload_ttl())
+        return found
+
     @classmethod
     async def update_guild_config(cls, guild_id: int, updates: dict):
         """Actualiza la configuración en DB y refresca el caché."""
         if not updates:
             return
 
-        set_clause = ", ".join(f"{col} = ?" for col in updates.keys())
-        params = list(updates.values()) + [guild_id]
+        # La fila se crea en la primera escritura (las lecturas usan valores por defecto en memoria)
+        defaults = await cls.get_default_config(guild_id)
+        values = {k: v for k, v in settings.DEFAULT_GUILD_CONFIG.items() if k in defaults}
+        values.update(updates)
+        columns = ", ".join(values.keys())
+        placeholders = ", ".join("?" for _ in values)
+        set_clause = ", ".join(f"{col} = excluded.{col}" for col in updates.keys())
+        params = [guild_id] + list(values.values())
         
-        await database.execute(f"UPDATE guild_config SET {set_clause} WHERE guild_id = ?", tuple(params))
+        await database.execute(
+            f"INSERT INTO guild_config (guild_id, {columns}) VALUES (?, {placeholders}) "
+            f"ON CONFLICT(guild_id) DO UPDATE SET {set_clause}",
+            tuple(params)
+        )
         
         # Invalida o actualiza la caché
         cache_key = cls._get_cache_key(guild_id)
@@ -3,6 +3,16 @@ from services.core import database
 
 logger = logging.getLogger(__name__)
 
+_CATALOG_COLUMNS = (
+    "item_id", "emoji", "cost", "availability", "start_date", "end_date", "purchase_limit",
+    "total_stock", "name_default", "desc_default", "category", "names_json", "descs_json", "content_hash"
+)
+_UPSERT_QUERY = (
+    f"INSERT INTO shop_items ({', '.join(_CATALOG_COLUMNS)}) VALUES ({', '.join('?' * len(_CATALOG_COLUMNS))}) "
+    "ON CONFLICT(item_id) DO UPDATE SET "
+    + ", ".join(f"{column} = excluded.{column}" for column in _CATALOG_COLUMNS[1:])
+)
+
 class ShopRepository:
     @classmethod
     async def get_all_items(cls) -> list[dict]:
@@ -33,19 +43,32 @@ class ShopRepository:
         names_json: str | None = None,
         descs_json: str | None = None
     ) -> None:
-        """Añade o actualiza la configuración de un objeto en la tienda."""
+        """
+        Añade o actualiza la configuración de un objeto en la tienda.
+        Borra su huella de contenido para que la próxima sincronización lo vuelva a alinear con shop_items.json.
+        """
         await database.execute(
-            "INSERT INTO shop_items (item_id, emoji, cost, availability, start_date, end_date, purchase_limit, total_stock, name_default, desc_default, category, names_json, descs_json) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
-            "ON CONFLICT(item_id) DO UPDATE SET "
-            "emoji = excluded.emoji, cost = excluded.cost, availability = excluded.availability, "
-            "start_date = excluded.start_date, end_date = excluded.end_date, "
-            "purchase_limit = excluded.purchase_limit, total_stock = excluded.total_stock, "
-            "name_default = excluded.name_default, desc_default = excluded.desc_default, "
-            "category = excluded.category, names_json = excluded.names_json, descs_json = excluded.descs_json",
-            (item_id, emoji, cost, availability, start_date, end_date, purchase_limit, total_stock, name_default, desc_default, category, names_json, descs_json)
+            _UPSERT_QUERY,
+            (item_id, emoji, cost, availability, start_date, end_date, purchase_limit, total_stock, name_default, desc_default, category, names_json, descs_json, None)
         )
 
+    @classmethod
+    async def get_content_hashes(cls) -> dict[str, str | None]:
+        """Huella de contenido guardada de cada objeto del catálogo (None si se escribió fuera de la sincronización)."""
+        rows = await database.fetch_all("SELECT item_id, content_hash FROM shop_items")
+        return {row["item_id"]: row["content_hash"] for row in rows}
+
+    @classmethod
+    async def apply_catalog_changes(cls, upserts: list[tuple], deletes: list[str]) -> None:
+        """
+        Escribe en una única transacción los objetos nuevos o modificados (tuplas en el orden de
+        _CATALOG_COLUMNS, incluida la huella) y elimina los retirados del catálogo.
+        """
+        await database.execute_many_batches([
+            (_UPSERT_QUERY, upserts),
+            ("DELETE FROM shop_items WHERE item_id = ?", [(item_id,) for item_id in deletes])
+        ])
+
     @classmethod
     async def delete_item(cls, item_id: str) -> bool:
         """Elimina un objeto de la tienda por su ID."""
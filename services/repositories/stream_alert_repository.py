@@ -17,31 +17,26 @@ class StreamAlertRepository:
     async def add_alert(cls, guild_id: int, platform: str, channel_name: str, discord_channel_id: int, role_id: int = 0, custom_message: str = None):
         """Registra una nueva alerta de stream en la base de datos."""
         await database.execute(
-            "INSERT INTO stream_alerts (guild_id, platform, channel_name, discord_channel_id, role_id, custom_message) VALUES (?, ?, ?, ?, ?, ?)",
+            "INSERT INTO stream_alerts (guild_id, platform, channel_name, discord_channel_id, role_id, custom_message, last_check) VALUES (?, ?, ?, ?, ?, ?, datetime('now'))",
             (guild_id, platform, channel_name, discord_channel_id, role_id, custom_message)
         )
 
     @classmethod
     async def remove_alert_by_names(cls, guild_id: int, platform: str, name1: str, name2: str) -> int:
         """Elimina alertas que coincidan con cualquiera de los dos nombres y devuelve el número de filas afectadas."""
-        db = await database.get_db()
-        cursor = await db.execute(
+        # Pasa por el lock de escritura (y sus reintentos) para devolver las filas borradas
+        return await database.execute_transaction([(
             "DELETE FROM stream_alerts WHERE guild_id = ? AND platform = ? AND (channel_name = ? OR channel_name = ?)",
             (guild_id, platform, name1, name2)
-        )
-        await db.commit()
-        return cursor.rowcount
+        )])
 
     @classmethod
     async def remove_alert(cls, guild_id: int, platform: str, channel_name: str) -> int:
         """Elimina una alerta por su nombre de canal exacto y devuelve el número de filas afectadas."""
-        db = await database.get_db()
-        cursor = await db.execute(
+        return await database.execute_transaction([(
             "DELETE FROM stream_alerts WHERE guild_id = ? AND platform = ? AND channel_name = ?",
             (guild_id, platform, channel_name)
-        )
-        await db.commit()
-        return cursor.rowcount
+        )])
 
     @classmethod
     async def get_stream_alerts(cls, guild_id: int) -> list[dict]:
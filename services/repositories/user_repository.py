@@ -1,28 +1,96 @@
+import asyncio
 import logging
 from services.core import database
 from services.core.cache_service import cache
+from services.repositories.xp_repository import XpRepository
+from services.utils.cache_helper import SingleFlight, get_cache_stats
 
 logger = logging.getLogger(__name__)
 
+_prefix_loads = SingleFlight(stats=get_cache_stats("user_prefix"))  # Lecturas de prefijo en curso por usuario
+_custom_prefixes: dict[int, str] = {}  # Índice en memoria: solo los usuarios con prefijo propio
+_prefix_index_loaded = False
+_prefix_index_listening = False  # Suscrito a las invalidaciones de caché de otros procesos
+_stale_prefixes: set[int] = set()  # Usuarios cuyo prefijo cambió en otro proceso; se releen de la DB al consultarlos
+_prefix_index_reload: asyncio.Task | None = None
+_default_user: dict | None = None  # Valores por defecto de una fila de users (según el esquema)
+
+def _on_cache_invalidation(key: str | None):
+    """Oyente de invalidaciones de otros procesos (bot o web): mantiene coherente el índice de prefijos."""
+    global _prefix_index_loaded, _prefix_index_reload
+    if key is None:
+        # Invalidación total o suscripción recuperada: se pudieron perder cambios, se recarga el índice entero
+        if _prefix_index_loaded and (_prefix_index_reload is None or _prefix_index_reload.done()):
+            _prefix_index_loaded = False
+            _prefix_index_reload = asyncio.get_running_loop().create_task(UserRepository.load_prefix_index())
+        return
+    if key.startswith("user_prefix:"):
+        _stale_prefixes.add(int(key.split(":", 1)[1]))
+
 class UserRepository:
     @staticmethod
     def _get_prefix_cache_key(user_id: int) -> str:
         return f"user_prefix:{user_id}"
 
+    @classmethod
+    async def load_prefix_index(cls) -> int:
+        """Carga en memoria todos los prefijos personalizados; desde entonces resolver un prefijo es una consulta a un dict."""
+        global _prefix_index_loaded, _prefix_index_listening
+        if not _prefix_index_listening:
+            # Sin avisos de los cambios hechos en otros procesos el índice quedaría obsoleto: se sigue usando la caché
+            if not cache.add_invalidation_listener(_on_cache_invalidation):
+                logger.info("ℹ️ [Prefijos] El backend de caché no propaga invalidaciones; índice en memoria desactivado.")
+                return 0
+            _prefix_index_listening = True
+        rows = await database.fetch_all("SELECT user_id, custom_prefix FROM users WHERE custom_prefix IS NOT NULL AND custom_prefix != ''")
+        _custom_prefixes.clear()
+        _custom_prefixes.update((row['user_id'], row['custom_prefix']) for row in rows)
+        _prefix_index_loaded = True
+        return len(_custom_prefixes)
+
+    @classmethod
+    async def forget_custom_prefix(cls, user_id: int):
+        """Retira al usuario del índice de prefijos (p. ej. al borrar sus datos) y avisa a los demás procesos."""
+        _custom_prefixes.pop(user_id, None)
+        await cache.delete(cls._get_prefix_cache_key(user_id))
+
     @classmethod
     async def get_user_prefix(cls, user_id: int) -> str | None:
-        """Obtiene el prefijo personalizado de un usuario (con caché)."""
+        """Obtiene el prefijo personalizado de un usuario (índice en memoria o, si no está cargado, con caché)."""
+        if _prefix_index_loaded:
+            if user_id in _stale_prefixes:
+                return await _prefix_loads.do(user_id, lambda: cls._reload_indexed_prefix(user_id))
+            return _custom_prefixes.get(user_id)
+
         cache_key = cls._get_prefix_cache_key(user_id)
         cached = await cache.get(cache_key)
         if cached is not None:
             # Si se guardó como 'none', retornamos None
             return None if cached == "none" else cached
 
+        return await _prefix_loads.do(user_id, lambda: cls._load_user_prefix(user_id))
+
+    @classmethod
+    async def _load_user_prefix(cls, user_id: int) -> str | None:
+        """Lee el prefijo de la base de datos y lo guarda en caché (incluido el valor vacío)."""
         row = await database.fetch_one("SELECT custom_prefix FROM users WHERE user_id = ?", (user_id,))
         prefix = row['custom_prefix'] if row else None
         
         # Guardamos en caché
-        await cache.set(cache_key, prefix if prefix is not None else "none")
+        await cache.fill(cls._get_prefix_cache_key(user_id), prefix if prefix is not None else "none")
+        return prefix
+
+    @classmethod
+    async def _reload_indexed_prefix(cls, user_id: int) -> str | None:
+        """Relee de la DB un prefijo que otro proceso modificó y actualiza el índice."""
+        # Se retira antes de leer: una invalidación que llegue durante la lectura lo vuelve a marcar
+        _stale_prefixes.discard(user_id)
+        row = await database.fetch_one("SELECT custom_prefix FROM users WHERE user_id = ?", (user_id,))
+        prefix = row['custom_prefix'] if row else None
+        if prefix:
+            _custom_prefixes[user_id] = prefix
+        else:
+            _custom_prefixes.pop(user_id, None)
         return prefix
 
     @classmethod
@@ -33,14 +101,26 @@ class UserRepository:
             "ON CONFLICT(user_id) DO UPDATE SET custom_prefix = excluded.custom_prefix",
             (user_id, prefix)
         )
+        if _prefix_index_loaded:
+            if prefix:
+                _custom_prefixes[user_id] = prefix
+            else:
+                _custom_prefixes.pop(user_id, None)
+            # Retira la entrada que pudiera quedar de antes de cargar el índice y avisa a los demás procesos
+            await cache.delete(cls._get_prefix_cache_key(user_id))
+            return
+
         cache_key = cls._get_prefix_cache_key(user_id)
         await cache.set(cache_key, prefix if prefix is not None else "none")
 
     @classmethod
     async def get_user_coins(cls, user_id: int) -> int:
-        """Retorna las monedas globales del usuario."""
-        row = await database.fetch_one("SELECT coins FROM users WHERE user_id = ?", (user_id,))
-        return row['coins'] if row else 0
+        """Retorna las monedas globales del usuario (incluye las recompensas de nivel aún no volcadas)."""
+        row, pending = await XpRepository.read_with_pending_coins(
+            user_id, lambda: database.fetch_one("SELECT coins FROM users WHERE user_id = ?", (user_id,))
+        )
+        coins = row['coins'] if row else 0
+        return coins + pending
 
     @classmethod
     async def add_user_coins(cls, user_id: int, amount: int):
@@ -54,6 +134,9 @@ class UserRepository:
     @classmethod
     async def set_user_coins(cls, user_id: int, amount: int):
         """Establece directamente las monedas globales del usuario."""
+        # Un volcado en curso sumaría sus deltas encima del saldo fijado
+        await XpRepository.wait_for_coin_flush()
+        XpRepository.discard_pending_coins(user_id)
         await database.execute(
             "INSERT INTO users (user_id, coins) VALUES (?, ?) "
             "ON CONFLICT(user_id) DO UPDATE SET coins = excluded.coins",
@@ -63,8 +146,38 @@ class UserRepository:
     @classmethod
     async def get_user_data(cls, user_id: int) -> dict | None:
         """Obtiene toda la información de perfil y preferencias de un usuario en base de datos."""
-        row = await database.fetch_one("SELECT * FROM users WHERE user_id = ?", (user_id,))
-        return dict(row) if row else None
+        row, pending = await XpRepository.read_with_pending_coins(
+            user_id, lambda: database.fetch_one("SELECT * FROM users WHERE user_id = ?", (user_id,))
+        )
+        if row:
+            data = dict(row)
+        elif pending:
+            # Sin fila todavía, pero con monedas de nivel pendientes de volcar
+            data = await cls.get_default_user_data(user_id)
+        else:
+            return None
+        data['coins'] = (data.get('coins') or 0) + pending
+        return data
+
+    @classmethod
+    async def get_default_user_data(cls, user_id: int) -> dict:
+        """Fila en memoria de un usuario sin registro: DEFAULT de cada columna de users. No escribe en DB."""
+        global _default_user
+        if _default_user is None:
+            columns = await database.fetch_all("PRAGMA table_info(users)")
+            # SQLite evalúa las expresiones DEFAULT del esquema, así los tipos coinciden con una fila real
+            exprs = [col['dflt_value'] if col['dflt_value'] is not None else "NULL" for col in columns]
+            row = await database.fetch_one(f"SELECT {', '.join(exprs)}")
+            _default_user = {col['name']: row[i] for i, col in enumerate(columns)}
+        data = dict(_default_user)
+        data['user_id'] = user_id
+        return data
+
+    @classmethod
+    async def get_personal_level_msg(cls, user_id: int) -> str | None:
+        """Mensaje personal de subida de nivel del usuario (solo esa columna, sin leer el perfil completo)."""
+        row = await database.fetch_one("SELECT personal_level_msg FROM users WHERE user_id = ?", (user_id,))
+        return row['personal_level_msg'] if row else None
 
     @classmethod
     async def update_description(cls, user_id: int, description: str):
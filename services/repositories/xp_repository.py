@@ -1,68 +1,320 @@
+import asyncio
+import bisect
+import itertools
 import logging
 import random
+import time
 from config import settings
 from services.core import database
+from services.utils.cache_helper import SingleFlight, get_cache_stats
 
 logger = logging.getLogger(__name__)
 
-_xp_cache = {}
+class XpCacheEntry:
+    """Entrada compacta del caché de XP: atributos en slots, sin diccionario por usuario."""
+    __slots__ = ("xp", "level", "rebirths", "dirty", "last_access")
+
+    def __init__(self, xp: int = 0, level: int = 1, rebirths: int = 0, dirty: bool = False, last_access: float = 0.0):
+        self.xp = xp
+        self.level = level
+        self.rebirths = rebirths
+        self.dirty = dirty
+        self.last_access = last_access
+
+    def as_dict(self) -> dict:
+        """Copia de solo lectura con las claves que consumen servicios y UI."""
+        return {'xp': self.xp, 'level': self.level, 'rebirths': self.rebirths}
+
+_xp_cache: dict[int, XpCacheEntry] = {}
+_guild_cache_users: dict[int, set[int]] = {}  # Índice de la caché por servidor: guild_id -> usuarios con entrada
+_xp_stats = get_cache_stats("xp")
+_xp_stats.track_size(lambda: len(_xp_cache))
+_xp_loads = SingleFlight(stats=_xp_stats)  # Lecturas de DB en curso por clave de caché
+_pending_coins: dict[int, int] = {}  # Monedas por subida de nivel aún no volcadas (user_id -> delta)
+_coins_in_flight: dict[int, int] = {}  # Deltas de monedas en una transacción de volcado aún sin confirmar
+_coins_flushes = 0  # Volcados de monedas en curso
+_coins_epoch = 0  # Se incrementa al empezar y al terminar cada volcado de monedas
+_coins_settled = asyncio.Event()  # Activo cuando no hay ningún volcado de monedas en curso
+_coins_settled.set()
+_xp_flushes_in_flight = 0  # Volcados cuya transacción aún no se ha confirmado (la DB puede ir por detrás de la caché)
+
+_USER_ID_MASK = (1 << 64) - 1
+
+def cache_key(guild_id: int, user_id: int) -> int:
+    """Empaqueta (guild_id, user_id) en un solo entero; evita una tupla y dos enteros por entrada."""
+    return (guild_id << 64) | user_id
+
+def split_cache_key(key: int) -> tuple[int, int]:
+    """Operación inversa de cache_key: devuelve (guild_id, user_id)."""
+    return key >> 64, key & _USER_ID_MASK
+
+def _cache_put(key: int, data: XpCacheEntry):
+    """Instala una entrada en la caché y en el índice por servidor."""
+    _xp_cache[key] = data
+    guild_id, user_id = split_cache_key(key)
+    users = _guild_cache_users.get(guild_id)
+    if users is None:
+        users = _guild_cache_users[guild_id] = set()
+    users.add(user_id)
+
+def _cache_remove(key: int):
+    del _xp_cache[key]
+    guild_id, user_id = split_cache_key(key)
+    users = _guild_cache_users.get(guild_id)
+    if users is not None:
+        users.discard(user_id)
+        if not users:
+            del _guild_cache_users[guild_id]
+
+_OFFSET_32 = 1 << 31
+_OFFSET_64 = 1 << 63
+_MASK_32 = (1 << 32) - 1
+_MAX_SCORE = (1 << 128) - 1
+
+def rank_key(user_id: int, rebirths: int, level: int, xp: int) -> int:
+    """
+    Clave entera cuyo orden ascendente equivale a ORDER BY rebirths DESC, level DESC, xp DESC, user_id.
+    Un solo int por miembro en lugar de una tupla de cuatro (rebirths y level caben en 32 bits con signo, xp en 64).
+    """
+    score = ((rebirths + _OFFSET_32) << 96) | ((level + _OFFSET_32) << 64) | (xp + _OFFSET_64)
+    return ((_MAX_SCORE - score) << 64) | user_id
+
+def _unpack_rank_key(key: int) -> tuple[int, int, int, int]:
+    """Operación inversa de rank_key: devuelve (user_id, rebirths, level, xp)."""
+    score = _MAX_SCORE - (key >> 64)
+    return (
+        key & _USER_ID_MASK,
+        (score >> 96) - _OFFSET_32,
+        ((score >> 64) & _MASK_32) - _OFFSET_32,
+        (score & _USER_ID_MASK) - _OFFSET_64
+    )
+
+class GuildRanking:
+    """
+    Índice ordenado de un servidor por (rebirths, level, xp) descendente, mantenido de forma incremental.
+    Es una lista ordenada por bloques de hasta 2 * _BLOCK claves con un árbol de Fenwick sobre el tamaño de cada bloque:
+    update() y position() cuestan O(log n) más desplazar un único bloque, sin mover la lista entera.
+    """
+    __slots__ = ("_blocks", "_maxes", "_tree", "_scores", "last_access")
+    _BLOCK = 1000
+
+    def __init__(self):
+        self._blocks: list[list[int]] = []
+        self._maxes: list[int] = []  # Última (mayor) clave de cada bloque
+        self._tree: list[int] = [0]  # Árbol de Fenwick (1-indexado) con el tamaño de cada bloque
+        self._scores: dict[int, int] = {}  # user_id -> clave actual
+        self.last_access = time.time()
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._scores
+
+    def _rebuild_tree(self):
+        """Reconstruye el árbol en O(bloques); solo al crear o eliminar bloques."""
+        tree = [0] + [len(block) for block in self._blocks]
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _tree_add(self, index: int, delta: int):
+        tree = self._tree
+        i = index + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def _count_before(self, index: int) -> int:
+        """Claves en los bloques anteriores a `index`."""
+        tree = self._tree
+        total = 0
+        while index > 0:
+            total += tree[index]
+            index -= index & -index
+        return total
+
+    def extend_sorted(self, rows: list[tuple[int, int, int, int]]):
+        """
+        Añade al final filas (user_id, rebirths, level, xp) que ya vienen en orden de ranking y detrás de las existentes
+        (ORDER BY rebirths DESC, level DESC, xp DESC, user_id). No ordena nada: cuesta O(len(rows)).
+        """
+        blocks, maxes, scores = self._blocks, self._maxes, self._scores
+        for user_id, reb, lvl, xp in rows:
+            key = rank_key(user_id, reb, lvl, xp)
+            scores[user_id] = key
+            if not blocks or len(blocks[-1]) >= self._BLOCK:
+                blocks.append([])
+                maxes.append(key)
+            blocks[-1].append(key)
+            maxes[-1] = key
+        self._rebuild_tree()
+
+    def _insert(self, key: int):
+        if not self._blocks:
+            self._blocks.append([key])
+            self._maxes.append(key)
+            self._rebuild_tree()
+            return
+        index = min(bisect.bisect_left(self._maxes, key), len(self._blocks) - 1)
+        block = self._blocks[index]
+        bisect.insort(block, key)
+        self._maxes[index] = block[-1]
+        if len(block) > 2 * self._BLOCK:
+            # Bloque lleno: se parte en dos (el árbol se reconstruye una vez cada _BLOCK inserciones en él)
+            half = block[self._BLOCK:]
+            del block[self._BLOCK:]
+            self._blocks.insert(index + 1, half)
+            self._maxes[index] = block[-1]
+            self._maxes.insert(index + 1, half[-1])
+            self._rebuild_tree()
+        else:
+            self._tree_add(index, 1)
+
+    def _remove(self, key: int):
+        index = bisect.bisect_left(self._maxes, key)
+        block = self._blocks[index]
+        del block[bisect.bisect_left(block, key)]
+        if block:
+            self._maxes[index] = block[-1]
+            self._tree_add(index, -1)
+        else:
+            del self._blocks[index]
+            del self._maxes[index]
+            self._rebuild_tree()
+
+    def update(self, user_id: int, rebirths: int, level: int, xp: int):
+        """Reubica a un usuario tras un cambio de XP: O(log n) más el desplazamiento dentro de su bloque."""
+        new_key = rank_key(user_id, rebirths, level, xp)
+        old_key = self._scores.get(user_id)
+        if old_key == new_key:
+            return
+        if old_key is not None:
+            self._remove(old_key)
+        self._insert(new_key)
+        self._scores[user_id] = new_key
+
+    def top(self, limit: int) -> list[dict]:
+        """Devuelve las primeras `limit` posiciones con el mismo formato que el SELECT del leaderboard."""
+        rows = []
+        for key in itertools.islice(itertools.chain.from_iterable(self._blocks), limit):
+            user_id, reb, lvl, xp = _unpack_rank_key(key)
+            rows.append({'user_id': user_id, 'level': lvl, 'xp': xp, 'rebirths': reb})
+        return rows
+
+    def position(self, user_id: int) -> int | None:
+        """Posición (1-indexada) del usuario en el ranking, o None si no tiene registro. O(log n)."""
+        key = self._scores.get(user_id)
+        if key is None:
+            return None
+        index = bisect.bisect_left(self._maxes, key)
+        return self._count_before(index) + bisect.bisect_left(self._blocks[index], key) + 1
+
+_rankings: dict[int, GuildRanking] = {}
+_ranking_loads: dict[int, asyncio.Task] = {}  # Construcciones en curso, compartidas por todos los que esperan
+
+def _xp_formula(level: int) -> int:
+    """Curva de dificultad definida en LEVELS_CONFIG (potencia en coma flotante)."""
+    return int(settings.LEVELS_CONFIG["XP_MULTIPLIER"] * (level ** settings.LEVELS_CONFIG["XP_EXPONENT"]))
+
+# Tablas precalculadas indexadas por nivel: XP para pasar al siguiente y XP acumulada desde el nivel 0
+_xp_required_table: list[int] = []
+_xp_cumulative_table: list[int] = []
+
+def _extend_xp_tables(max_level: int):
+    """Amplía las tablas hasta `max_level` (se duplican bajo demanda si algún usuario lo supera)."""
+    level = len(_xp_required_table)
+    total = _xp_cumulative_table[-1] + _xp_required_table[-1] if level else 0
+    while level <= max_level:
+        required = _xp_formula(level)
+        _xp_required_table.append(required)
+        _xp_cumulative_table.append(total)
+        total += required
+        level += 1
+
+_extend_xp_tables(settings.LEVELS_CONFIG.get("XP_TABLE_LEVELS", 1000))
 
 def calculate_xp_required(level: int) -> int:
     """Calcula la XP necesaria para alcanzar el siguiente nivel."""
-    return int(settings.LEVELS_CONFIG["XP_MULTIPLIER"] * (level ** settings.LEVELS_CONFIG["XP_EXPONENT"]))
+    if 0 <= level < len(_xp_required_table):
+        return _xp_required_table[level]
+    return _xp_formula(level)
+
+def resolve_level(level: int, xp: int) -> tuple[int, int]:
+    """Resuelve cualquier cantidad de XP en (nivel final, XP sobrante) con una búsqueda binaria O(log L)."""
+    if level < 0 or xp < calculate_xp_required(level):
+        return level, xp
+
+    if level >= len(_xp_required_table):
+        _extend_xp_tables(level * 2)
+    total = _xp_cumulative_table[level] + xp
+    while total >= _xp_cumulative_table[-1] + _xp_required_table[-1]:
+        _extend_xp_tables(len(_xp_required_table) * 2)
+
+    new_level = bisect.bisect_right(_xp_cumulative_table, total) - 1
+    return new_level, total - _xp_cumulative_table[new_level]
 
 class XpRepository:
     @classmethod
     async def add_xp(cls, guild_id: int, user_id: int, amount: int) -> tuple[int, bool]:
         """Añade XP a un usuario en memoria (Write-behind)."""
-        key = (guild_id, user_id)
-        
-        import time
-        if key not in _xp_cache:
-            row = await database.fetch_one("SELECT xp, level, rebirths FROM guild_stats WHERE guild_id = ? AND user_id = ?", (guild_id, user_id))
-            if row:
-                _xp_cache[key] = {'xp': row['xp'], 'level': row['level'], 'rebirths': row['rebirths'], 'dirty': False, 'last_access': time.time()}
-            else:
-                _xp_cache[key] = {'xp': 0, 'level': 1, 'rebirths': 0, 'dirty': False, 'last_access': time.time()}
-        else:
-            _xp_cache[key]['last_access'] = time.time()
-        
-        data = _xp_cache[key]
-        data['xp'] += amount
-        data['dirty'] = True 
-        
-        required = calculate_xp_required(data['level'])
-        leveled_up = False
-        
-        # En la importación de db_service para monedas, lo llamaremos de forma dinámica para evitar circulares
-        from services.repositories.user_repository import UserRepository
-        
-        while data['xp'] >= required:
-            data['xp'] -= required
-            data['level'] += 1
-            leveled_up = True
-            
-            # Otorgar monedas por cada nivel subido
+        data = await cls._get_entry(guild_id, user_id)
+        return cls._apply_xp(guild_id, user_id, data, amount)
+
+    @classmethod
+    async def add_xp_many(cls, grants: list[tuple[int, int, int]]) -> list[tuple[int, int, int]]:
+        """Añade XP a varios usuarios (guild_id, user_id, cantidad) precargando los fallos de caché en bloque.
+
+        Devuelve las subidas de nivel como (guild_id, user_id, nuevo_nivel).
+        """
+        missing: dict[int, list[int]] = {}
+        for guild_id, user_id, _ in grants:
+            if cache_key(guild_id, user_id) not in _xp_cache:
+                missing.setdefault(guild_id, []).append(user_id)
+        for guild_id, user_ids in missing.items():
+            await cls._preload_entries(guild_id, user_ids)
+
+        level_ups = []
+        for guild_id, user_id, amount in grants:
+            data = await cls._get_entry(guild_id, user_id)
+            new_level, leveled_up = cls._apply_xp(guild_id, user_id, data, amount)
+            if leveled_up:
+                level_ups.append((guild_id, user_id, new_level))
+        return level_ups
+
+    @classmethod
+    def _apply_xp(cls, guild_id: int, user_id: int, data: XpCacheEntry, amount: int) -> tuple[int, bool]:
+        """Suma XP a una entrada ya cargada, resuelve el nivel y acumula las monedas por subida."""
+        data.dirty = True
+
+        old_level = data.level
+        data.level, data.xp = resolve_level(data.level, data.xp + amount)
+        levels_gained = data.level - old_level
+        leveled_up = levels_gained > 0
+
+        if leveled_up:
+            # Otorgar monedas por cada nivel subido; se persisten junto a la XP en el próximo volcado
             coins_min, coins_max = settings.LEVELS_CONFIG.get("COINS_PER_LEVEL", (5, 10))
-            coins_earned = random.randint(coins_min, coins_max)
-            await UserRepository.add_user_coins(user_id, coins_earned)
-            
-            required = calculate_xp_required(data['level'])
-        
-        return data['level'], leveled_up
+            coins_earned = sum(random.randint(coins_min, coins_max) for _ in range(levels_gained))
+            _pending_coins[user_id] = _pending_coins.get(user_id, 0) + coins_earned
+
+        _update_ranking(guild_id, user_id, data)
+        return data.level, leveled_up
 
     @classmethod
     async def set_user_xp_level(cls, guild_id: int, user_id: int, xp: int, level: int, rebirths: int = None):
         """Establece directamente la XP, nivel y opcionalmente rebirths de un usuario, sincronizando caché."""
-        key = (guild_id, user_id)
+        key = cache_key(guild_id, user_id)
         
         # Guardar cualquier XP pendiente antes de sobrescribir
-        if key in _xp_cache and _xp_cache[key]['dirty']:
+        if key in _xp_cache and _xp_cache[key].dirty:
             await cls.flush_xp_cache()
             
         if rebirths is None:
             if key in _xp_cache:
-                rebirths = _xp_cache[key]['rebirths']
+                rebirths = _xp_cache[key].rebirths
             else:
                 row = await database.fetch_one("SELECT rebirths FROM guild_stats WHERE guild_id = ? AND user_id = ?", (guild_id, user_id))
                 rebirths = row['rebirths'] if row else 0
@@ -73,14 +325,9 @@ class XpRepository:
             (guild_id, user_id, xp, level, rebirths)
         )
         
-        import time
-        _xp_cache[key] = {
-            'xp': xp,
-            'level': level,
-            'rebirths': rebirths,
-            'dirty': False,
-            'last_access': time.time()
-        }
+        data = XpCacheEntry(xp, level, rebirths, False, time.time())
+        _cache_put(key, data)
+        _update_ranking(guild_id, user_id, data)
 
     @classmethod
     async def do_rebirth(cls, guild_id: int, user_id: int) -> tuple[bool, any]:
@@ -108,81 +355,299 @@ class XpRepository:
         # Actualizar DB directamente
         await database.execute("UPDATE guild_stats SET level = 1, xp = 0, rebirths = ? WHERE guild_id = ? AND user_id = ?", (new_reb, guild_id, user_id))
         
-        # Actualizar caché
-        key = (guild_id, user_id)
-        if key in _xp_cache:
-            import time
-            _xp_cache[key].update({'level': 1, 'xp': 0, 'rebirths': new_reb, 'dirty': False, 'last_access': time.time()})
+        # Actualizar caché y ranking
+        data = XpCacheEntry(0, 1, new_reb, False, time.time())
+        _cache_put(cache_key(guild_id, user_id), data)
+        _update_ranking(guild_id, user_id, data)
             
         return True, new_reb
 
     @classmethod
-    async def flush_xp_cache(cls):
-        """Vuelca la XP acumulada en memoria a la base de datos física."""
-        if not _xp_cache:
-            return
-            
-        logger.debug(f"💾 Guardando XP en disco para {len(_xp_cache)} usuarios...")
-        
-        # Iterar sobre una copia segura
+    async def flush_xp_cache(cls) -> dict:
+        """Vuelca la XP y las monedas de nivel acumuladas en memoria a la base de datos en una sola transacción."""
+        global _xp_flushes_in_flight, _coins_flushes, _coins_epoch
+        if not _xp_cache and not _pending_coins:
+            return {"rows": 0, "coins": 0, "duration_ms": 0.0}
+
+        start = time.perf_counter()
+
+        # Snapshot de filas sucias: se marcan limpias antes de escribir, de modo que cualquier
+        # cambio concurrente durante el volcado vuelve a marcarlas y se guarda en el siguiente ciclo.
+        snapshot = []
         for key, data in list(_xp_cache.items()):
-            if not data['dirty']:
+            if not data.dirty:
                 continue
-                
-            guild_id, user_id = key
-            saved_xp = data['xp']
-            saved_lvl = data['level']
-            saved_reb = data['rebirths']
-            
-            try:
-                await database.execute(
+            guild_id, user_id = split_cache_key(key)
+            snapshot.append((guild_id, user_id, data.xp, data.level, data.rebirths))
+            data.dirty = False
+
+        coins_snapshot = list(_pending_coins.items())
+        _pending_coins.clear()
+
+        if not snapshot and not coins_snapshot:
+            cls.clear_xp_cache_safe()
+            return {"rows": 0, "coins": 0, "duration_ms": 0.0}
+
+        # Los deltas siguen contando en get_pending_coins hasta que la transacción se confirma
+        for user_id, delta in coins_snapshot:
+            _coins_in_flight[user_id] = _coins_in_flight.get(user_id, 0) + delta
+        if coins_snapshot:
+            _coins_flushes += 1
+            _coins_epoch += 1
+            _coins_settled.clear()
+        _xp_flushes_in_flight += 1
+        try:
+            await database.execute_many_batches([
+                (
                     "INSERT INTO guild_stats (guild_id, user_id, xp, level, rebirths) VALUES (?, ?, ?, ?, ?) "
                     "ON CONFLICT(guild_id, user_id) DO UPDATE SET xp = excluded.xp, level = excluded.level, rebirths = excluded.rebirths",
-                    (guild_id, user_id, saved_xp, saved_lvl, saved_reb)
+                    snapshot
+                ),
+                (
+                    "INSERT INTO users (user_id, coins) VALUES (?, ?) "
+                    "ON CONFLICT(user_id) DO UPDATE SET coins = coins + excluded.coins",
+                    coins_snapshot
                 )
-                
-                # Marcar como limpia si no cambió en el transcurso de la escritura
-                if key in _xp_cache:
-                    if _xp_cache[key]['xp'] == saved_xp:
-                        _xp_cache[key]['dirty'] = False
-            except Exception:
-                logger.exception(f"❌ Error guardando XP de {user_id} en guild {guild_id}")
-        
+            ])
+        except Exception:
+            logger.exception(f"❌ Error guardando XP en disco ({len(snapshot)} usuarios, {len(coins_snapshot)} saldos)")
+            # Restaurar el bit sucio y los deltas de monedas para reintentar en el próximo volcado
+            for guild_id, user_id, *_ in snapshot:
+                data = _xp_cache.get(cache_key(guild_id, user_id))
+                if data is not None:
+                    data.dirty = True
+            for user_id, delta in coins_snapshot:
+                _pending_coins[user_id] = _pending_coins.get(user_id, 0) + delta
+            return {"rows": 0, "coins": 0, "duration_ms": (time.perf_counter() - start) * 1000}
+        finally:
+            _xp_flushes_in_flight -= 1
+            for user_id, delta in coins_snapshot:
+                remaining = _coins_in_flight[user_id] - delta
+                if remaining:
+                    _coins_in_flight[user_id] = remaining
+                else:
+                    del _coins_in_flight[user_id]
+            if coins_snapshot:
+                _coins_flushes -= 1
+                _coins_epoch += 1
+                if not _coins_flushes:
+                    _coins_settled.set()
+
+        duration_ms = (time.perf_counter() - start) * 1000
+        logger.debug(f"💾 XP volcada en disco: {len(snapshot)} usuarios y {len(coins_snapshot)} saldos en {duration_ms:.1f} ms.")
         cls.clear_xp_cache_safe()
+        return {"rows": len(snapshot), "coins": len(coins_snapshot), "duration_ms": duration_ms}
+
+    @staticmethod
+    def get_pending_coins(user_id: int) -> int:
+        """Monedas de subida de nivel del usuario que aún no se han volcado (o cuyo volcado no se ha confirmado)."""
+        return _pending_coins.get(user_id, 0) + _coins_in_flight.get(user_id, 0)
+
+    @staticmethod
+    async def wait_for_coin_flush():
+        """Espera a que se confirme cualquier volcado de monedas en curso (antes de fijar o borrar un saldo)."""
+        await _coins_settled.wait()
+
+    @staticmethod
+    async def read_with_pending_coins(user_id: int, read):
+        """
+        Ejecuta `read()` (una lectura de `users`) y devuelve (resultado, monedas pendientes) de forma coherente.
+        Mientras un volcado confirma, la DB puede incluir o no sus deltas; la lectura espera a que termine
+        y se repite si otro volcado empieza o acaba durante ella, para no contar un delta dos veces ni omitirlo.
+        """
+        while True:
+            await _coins_settled.wait()
+            epoch = _coins_epoch
+            result = await read()
+            if epoch == _coins_epoch:
+                return result, XpRepository.get_pending_coins(user_id)
+
+    @staticmethod
+    def discard_pending_coins(user_id: int):
+        """Descarta las monedas pendientes (p. ej. al fijar un saldo absoluto o borrar al usuario)."""
+        _pending_coins.pop(user_id, None)
 
     @staticmethod
     def clear_xp_cache_safe(ttl: int = 600):
         """Limpia entradas de XP en memoria sin cambios pendientes y que han estado inactivas por más de 10 minutos (TTL)."""
         global _xp_cache
-        import time
+        # Mientras se construye un ranking, la caché es la fuente de verdad sobre la lectura en curso
+        if _ranking_loads:
+            return
         now = time.time()
-        keys_to_remove = [k for k, v in _xp_cache.items() if not v['dirty'] and (now - v.get('last_access', now) > ttl)]
+        keys_to_remove = [k for k, v in _xp_cache.items() if not v.dirty and (now - v.last_access > ttl)]
         for k in keys_to_remove:
-            del _xp_cache[k]
+            _cache_remove(k)
+        _xp_stats.expirations += len(keys_to_remove)
+
+        ranking_ttl = settings.LEVELS_CONFIG.get("RANKING_TTL", 3600)
+        for guild_id in [g for g, r in _rankings.items() if now - r.last_access > ranking_ttl]:
+            del _rankings[guild_id]
 
     @classmethod
     async def get_user_guild_data(cls, guild_id: int, user_id: int) -> dict:
         """Obtiene la XP, nivel y rebirths de un usuario (con caché write-behind)."""
-        key = (guild_id, user_id)
-        import time
-        if key not in _xp_cache:
-            row = await database.fetch_one("SELECT xp, level, rebirths FROM guild_stats WHERE guild_id = ? AND user_id = ?", (guild_id, user_id))
+        data = await cls._get_entry(guild_id, user_id)
+        return data.as_dict()
+
+    @classmethod
+    async def _get_entry(cls, guild_id: int, user_id: int) -> XpCacheEntry:
+        """Devuelve la entrada en caché del usuario, cargándola de la base de datos si no existe."""
+        key = cache_key(guild_id, user_id)
+        data = _xp_cache.get(key)
+        _xp_stats.record_lookup(data is not None)
+        if data is None:
+            # Fallos concurrentes de la misma clave comparten una sola lectura y la misma entrada
+            data = await _xp_loads.do(key, lambda: cls._load_entry(key, guild_id, user_id))
+        data.last_access = time.time()
+        return data
+
+    @classmethod
+    async def _load_entry(cls, key: int, guild_id: int, user_id: int) -> XpCacheEntry:
+        """Lee la fila del usuario y la instala en la caché (salvo que otra escritura se haya adelantado)."""
+        row = await database.fetch_one("SELECT xp, level, rebirths FROM guild_stats WHERE guild_id = ? AND user_id = ?", (guild_id, user_id))
+        data = _xp_cache.get(key)
+        if data is None:
             if row:
-                _xp_cache[key] = {'xp': row['xp'], 'level': row['level'], 'rebirths': row['rebirths'], 'dirty': False, 'last_access': time.time()}
+                data = XpCacheEntry(row['xp'], row['level'], row['rebirths'])
             else:
-                _xp_cache[key] = {'xp': 0, 'level': 1, 'rebirths': 0, 'dirty': False, 'last_access': time.time()}
-        else:
-            _xp_cache[key]['last_access'] = time.time()
-        return _xp_cache[key]
+                data = XpCacheEntry()
+            _cache_put(key, data)
+        return data
+
+    @classmethod
+    async def _preload_entries(cls, guild_id: int, user_ids: list[int]):
+        """Carga en caché las filas de varios usuarios de un servidor con consultas IN (...) por bloques."""
+        chunk_size = 500  # Por debajo del límite de variables de SQLite
+        for start in range(0, len(user_ids), chunk_size):
+            chunk = user_ids[start:start + chunk_size]
+            placeholders = ",".join("?" * len(chunk))
+            started = time.perf_counter()
+            rows = await database.fetch_all(
+                f"SELECT user_id, xp, level, rebirths FROM guild_stats WHERE guild_id = ? AND user_id IN ({placeholders})",
+                (guild_id, *chunk)
+            )
+            _xp_stats.record_load(time.perf_counter() - started)
+            found = {row['user_id']: row for row in rows}
+            for user_id in chunk:
+                key = cache_key(guild_id, user_id)
+                if key in _xp_cache:
+                    continue
+                row = found.get(user_id)
+                _cache_put(key, XpCacheEntry(row['xp'], row['level'], row['rebirths']) if row else XpCacheEntry())
 
     @classmethod
     async def get_leaderboard(cls, guild_id: int, limit: int) -> list[dict]:
-        """Obtiene la lista de los mejores usuarios ordenados por rebirths, level y xp (vuelca la caché primero)."""
-        await cls.flush_xp_cache()
-        rows = await database.fetch_all(
-            "SELECT user_id, level, xp, rebirths FROM guild_stats WHERE guild_id = ? "
-            "ORDER BY rebirths DESC, level DESC, xp DESC LIMIT ?",
-            (guild_id, limit)
+        """Obtiene la lista de los mejores usuarios ordenados por rebirths, level y xp (sin volcar la caché)."""
+        ranking = await cls._get_ranking(guild_id)
+        return ranking.top(limit)
+
+    @classmethod
+    async def get_user_rank(cls, guild_id: int, user_id: int, build: bool = True) -> tuple[int | None, int]:
+        """
+        Devuelve (posición, total de miembros con registro) de un usuario en el ranking del servidor.
+        Con `build=False` un servidor sin ranking en memoria se resuelve con COUNT sobre idx_ranking, sin construirlo
+        (p. ej. el perfil web, que consulta todos los servidores del usuario).
+        """
+        ranking = _rankings.get(guild_id)
+        if ranking is None and not build:
+            return await cls._count_user_rank(guild_id, user_id)
+        ranking = await cls._get_ranking(guild_id)
+        return ranking.position(user_id), len(ranking)
+
+    @classmethod
+    async def _count_user_rank(cls, guild_id: int, user_id: int) -> tuple[int | None, int]:
+        """Posición calculada en SQLite y corregida con los usuarios del servidor cuya XP aún no está en disco."""
+        # Solo difieren de la DB las entradas sucias (o todas las de la caché si hay un volcado sin confirmar)
+        flushing = _xp_flushes_in_flight > 0
+        divergent = {}
+        for u_id in _guild_cache_users.get(guild_id, ()):
+            data = _xp_cache[cache_key(guild_id, u_id)]
+            if data.dirty or flushing:
+                divergent[u_id] = (data.rebirths, data.level, data.xp)
+
+        on_disk = {}
+        ids = list(divergent.keys() | {user_id})
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows = await database.fetch_all(
+                f"SELECT user_id, rebirths, level, xp FROM guild_stats WHERE guild_id = ? AND user_id IN ({','.join('?' * len(chunk))})",
+                (guild_id, *chunk)
+            )
+            on_disk.update((row['user_id'], (row['rebirths'], row['level'], row['xp'])) for row in rows)
+
+        total_row = await database.fetch_one("SELECT COUNT(*) AS total FROM guild_stats WHERE guild_id = ?", (guild_id,))
+        # Entradas sin fila en disco que sí cuentan en el ranking (mismo criterio que _build_ranking)
+        total = total_row['total'] + sum(1 for u_id, score in divergent.items() if u_id not in on_disk and score != (0, 1, 0))
+
+        score = divergent.get(user_id) or on_disk.get(user_id)
+        if score is None or (user_id not in on_disk and score == (0, 1, 0)):
+            return None, total
+        reb, lvl, xp = score
+        ahead_row = await database.fetch_one(
+            "SELECT COUNT(*) AS ahead FROM guild_stats WHERE guild_id = ? AND user_id != ? AND ("
+            "rebirths > ? OR (rebirths = ? AND (level > ? OR (level = ? AND (xp > ? OR (xp = ? AND user_id < ?))))))",
+            (guild_id, user_id, reb, reb, lvl, lvl, xp, xp, user_id)
         )
-        return [dict(row) for row in rows]
+        ahead = ahead_row['ahead']
+        target = rank_key(user_id, reb, lvl, xp)
+        for u_id, cached in divergent.items():
+            if u_id == user_id:
+                continue
+            was_ahead = u_id in on_disk and rank_key(u_id, *on_disk[u_id]) < target
+            is_ahead = (u_id in on_disk or cached != (0, 1, 0)) and rank_key(u_id, *cached) < target
+            ahead += is_ahead - was_ahead
+        return ahead + 1, total
+
+    @classmethod
+    async def _get_ranking(cls, guild_id: int) -> GuildRanking:
+        """Devuelve el ranking en memoria del servidor, construyéndolo una sola vez desde la DB y la caché."""
+        ranking = _rankings.get(guild_id)
+        if ranking is not None:
+            ranking.last_access = time.time()
+            return ranking
+
+        task = _ranking_loads.get(guild_id)
+        if task is None:
+            # Tarea propia: cancelar a quien la inició (timeout de un manejador, apagado) no deja colgados a los demás
+            task = asyncio.create_task(cls._build_ranking(guild_id))
+            task.add_done_callback(_consume_ranking_error)
+            _ranking_loads[guild_id] = task
+        return await asyncio.shield(task)
+
+    @classmethod
+    async def _build_ranking(cls, guild_id: int) -> GuildRanking:
+        try:
+            # SQLite entrega las filas ya ordenadas (idx_ranking; los empates por user_id los ordena su hilo), en lotes:
+            # el event loop solo añade cada lote al final del índice y queda libre entre uno y otro
+            ranking = GuildRanking()
+            async for rows in database.iter_batches(
+                "SELECT user_id, rebirths, level, xp FROM guild_stats WHERE guild_id = ? "
+                "ORDER BY rebirths DESC, level DESC, xp DESC, user_id",
+                (guild_id,),
+                settings.LEVELS_CONFIG["RANKING_BUILD_BATCH"]
+            ):
+                ranking.extend_sorted([(row['user_id'], row['rebirths'], row['level'], row['xp']) for row in rows])
+
+            # La caché siempre es igual o más reciente que la DB (incluidos los cambios hechos durante la lectura);
+            # se omiten entradas por defecto sin fila en disco
+            for user_id in _guild_cache_users.get(guild_id, ()):
+                data = _xp_cache[cache_key(guild_id, user_id)]
+                if user_id in ranking or data.dirty or (data.rebirths, data.level, data.xp) != (0, 1, 0):
+                    ranking.update(user_id, data.rebirths, data.level, data.xp)
+            _rankings[guild_id] = ranking
+            return ranking
+        finally:
+            del _ranking_loads[guild_id]
+
+def _consume_ranking_error(task: asyncio.Task):
+    """Recupera el error de una construcción fallida para evitar el aviso si nadie seguía esperándola."""
+    if not task.cancelled():
+        task.exception()
 
+def _update_ranking(guild_id: int, user_id: int, data: XpCacheEntry):
+    """Propaga un cambio de la caché al ranking del servidor si ya está construido."""
+    # Mientras se construye no hace falta: la construcción aplica al final los valores de la caché
+    ranking = _rankings.get(guild_id)
+    if ranking is not None:
+        ranking.update(user_id, data.rebirths, data.level, data.xp)
@@ -1,48 +1,180 @@
+import asyncio
 import time
-from typing import Any, Dict, Optional, Tuple
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+class CacheStats:
+    """Contadores de eficacia de una caché (aciertos, fallos, cargas, latencia, evicciones y tamaño)."""
+    __slots__ = ("name", "hits", "misses", "loads", "load_errors", "load_time", "evictions", "expirations", "_size_fns")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.load_errors = 0
+        self.load_time = 0.0  # Segundos acumulados en cargas desde el origen
+        self.evictions = 0  # Expulsiones por límite de tamaño
+        self.expirations = 0  # Entradas retiradas por TTL
+        self._size_fns: list[Callable[[], int]] = []
+
+    def record_lookup(self, hit: bool) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def record_load(self, seconds: float, ok: bool = True) -> None:
+        self.loads += 1
+        self.load_time += seconds
+        if not ok:
+            self.load_errors += 1
+
+    def track_size(self, size_fn: Callable[[], int]) -> None:
+        """Registra una función que devuelve el número de entradas actuales (se suman si hay varias)."""
+        self._size_fns.append(size_fn)
+
+    def as_dict(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "loads": self.loads,
+            "load_errors": self.load_errors,
+            "avg_load_ms": round(self.load_time * 1000 / self.loads, 3) if self.loads else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "size": sum(fn() for fn in self._size_fns) if self._size_fns else None
+        }
+
+
+_cache_stats: Dict[str, CacheStats] = {}
+
+def get_cache_stats(name: str) -> CacheStats:
+    """Devuelve (creándolos si hace falta) los contadores de la caché o espacio de nombres `name`."""
+    stats = _cache_stats.get(name)
+    if stats is None:
+        stats = _cache_stats[name] = CacheStats(name)
+    return stats
+
+def get_cache_stats_snapshot() -> Dict[str, dict]:
+    """Instantánea de todos los contadores registrados, ordenada por nombre."""
+    return {name: _cache_stats[name].as_dict() for name in sorted(_cache_stats)}
+
 
 class SimpleTTLCache:
     """
-    Caché en memoria con límite de tamaño (evicción FIFO) y expiración por tiempo (TTL).
+    Caché en memoria con límite de tamaño (evicción LRU en O(1)) y expiración por elemento (TTL).
     Previene fugas de memoria en ejecuciones prolongadas del bot.
     """
-    def __init__(self, max_size: int = 100, ttl: float = 86400) -> None:
+    def __init__(self, max_size: int = 100, ttl: float = 86400, name: Optional[str] = None) -> None:
         """
         Args:
             max_size: Cantidad máxima de elementos en caché.
-            ttl: Tiempo de vida en segundos para cada elemento.
+            ttl: Tiempo de vida por defecto en segundos para cada elemento.
+            name: Nombre con el que se publican sus contadores (None = sin instrumentar).
         """
         self.max_size: int = max_size
         self.ttl: float = ttl
-        self._cache: Dict[Any, Tuple[float, Any]] = {}
+        self._cache: OrderedDict[Any, Tuple[float, Any]] = OrderedDict()  # clave -> (expiración monotónica, valor)
+        self.stats: Optional[CacheStats] = None
+        if name is not None:
+            self.stats = get_cache_stats(name)
+            self.stats.track_size(self.__len__)
+        self._loads = SingleFlight(stats=self.stats)
+
+    def __len__(self) -> int:
+        return len(self._cache)
 
     def get(self, key: Any) -> Optional[Any]:
-        """Obtiene un elemento de la caché si no ha expirado."""
-        if key in self._cache:
-            timestamp, value = self._cache[key]
-            if time.time() - timestamp < self.ttl:
-                return value
-            # Eliminar si ha expirado
-            self._cache.pop(key, None)
-        return None
-
-    def set(self, key: Any, value: Any) -> None:
-        """Almacena un elemento en la caché aplicando políticas de desalojo."""
-        now_real = time.time()
-        
-        # Si excedemos el tamaño máximo, hacemos limpieza de expirados primero
-        if len(self._cache) >= self.max_size:
-            expired_keys = [k for k, (t, _) in self._cache.items() if now_real - t >= self.ttl]
-            for k in expired_keys:
-                self._cache.pop(k, None)
-
-            # Si sigue excediendo, removemos el elemento más antiguo (FIFO)
-            if len(self._cache) >= self.max_size:
-                first_key = next(iter(self._cache))
-                self._cache.pop(first_key, None)
-
-        self._cache[key] = (now_real, value)
+        """Obtiene un elemento de la caché si no ha expirado (y lo marca como usado recientemente)."""
+        value = None
+        item = self._cache.get(key)
+        if item is not None:
+            expires_at, cached = item
+            if time.monotonic() < expires_at:
+                value = cached
+                self._cache.move_to_end(key)
+            else:
+                # Eliminar si ha expirado
+                del self._cache[key]
+                if self.stats:
+                    self.stats.expirations += 1
+        if self.stats:
+            self.stats.record_lookup(value is not None)
+        return value
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None) -> None:
+        """Almacena un elemento; si se supera el tamaño máximo se expulsa el menos usado recientemente."""
+        self._cache[key] = (time.monotonic() + (ttl if ttl is not None else self.ttl), value)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+            if self.stats:
+                self.stats.evictions += 1
+
+    async def get_or_load(self, key: Any, loader: Callable[[], Awaitable[Any]], ttl: Optional[float] = None) -> Any:
+        """
+        Devuelve el valor en caché o lo obtiene con `loader`, compartiendo una sola carga entre peticiones
+        concurrentes de la misma clave. Los resultados None no se almacenan.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        async def _load():
+            result = await loader()
+            if result is not None:
+                self.set(key, result, ttl)
+            return result
+        return await self._loads.do(key, _load)
 
     def clear(self) -> None:
         """Limpia todos los elementos de la caché."""
         self._cache.clear()
+
+
+class SingleFlight:
+    """
+    Registro de cargas en curso por clave (single-flight).
+    Las peticiones concurrentes de una misma clave comparten una única ejecución del loader.
+    """
+    def __init__(self, stats: Optional[CacheStats] = None) -> None:
+        self._inflight: Dict[Any, asyncio.Task] = {}
+        self._stats = stats  # Si se indica, cada ejecución del loader cuenta como carga (con su latencia)
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: Any, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Ejecuta `loader` para la clave o espera el resultado de la carga que ya esté en curso."""
+        task = self._inflight.get(key)
+        if task is None:
+            # El loader corre en su propia tarea: cancelar a quien lo inició no cancela a los demás solicitantes
+            task = asyncio.create_task(self._run(key, loader))
+            task.add_done_callback(_consume_error)
+            self._inflight[key] = task
+        # shield: si un solicitante es cancelado no debe cancelar la carga compartida
+        return await asyncio.shield(task)
+
+    async def _run(self, key: Any, loader: Callable[[], Awaitable[Any]]) -> Any:
+        started = time.perf_counter()
+        try:
+            result = await loader()
+        except Exception:
+            if self._stats:
+                self._stats.record_load(time.perf_counter() - started, ok=False)
+            raise
+        else:
+            if self._stats:
+                self._stats.record_load(time.perf_counter() - started)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+
+def _consume_error(task: asyncio.Task) -> None:
+    """Marca la excepción de una carga como recuperada si ningún solicitante seguía esperando."""
+    if not task.cancelled():
+        task.exception()
@@ -0,0 +1,81 @@
+import logging
+from typing import Dict, Optional, Union
+import discord
+from services.utils.cache_helper import get_cache_stats
+
+logger = logging.getLogger(__name__)
+
+# ¿Puede el bot enviar mensajes en el canal?: guild_id -> {channel_id -> bool}
+_sendable: Dict[int, Dict[int, bool]] = {}
+# Primer canal de texto donde el bot puede escribir: guild_id -> channel_id (None = ninguno)
+_first_sendable: Dict[int, Optional[int]] = {}
+
+_stats = get_cache_stats("channel_resolver")
+_stats.track_size(lambda: sum(len(checks) for checks in _sendable.values()) + len(_first_sendable))
+
+
+def _check(guild: discord.Guild, channel) -> Optional[bool]:
+    me = guild.me
+    if me is None:
+        return None  # Todavía sin miembro propio (arranque): no se puede decidir ni cachear
+    return channel.permissions_for(me).send_messages
+
+
+def can_send(guild: discord.Guild, channel) -> bool:
+    """Comprueba (con caché) si el bot puede enviar mensajes en `channel`."""
+    if channel is None:
+        return False
+    checks = _sendable.get(guild.id)
+    if checks is None:
+        checks = _sendable[guild.id] = {}
+    ok = checks.get(channel.id)
+    _stats.record_lookup(ok is not None)
+    if ok is None:
+        ok = _check(guild, channel)
+        if ok is None:
+            return False
+        checks[channel.id] = ok
+    return ok
+
+
+def first_sendable_channel(guild: discord.Guild):
+    """Primer canal de texto (por posición) donde el bot puede escribir, o None si no hay ninguno."""
+    if guild.id in _first_sendable:
+        channel_id = _first_sendable[guild.id]
+        channel = guild.get_channel(channel_id) if channel_id else None
+        if channel_id is None or channel is not None:
+            _stats.record_lookup(True)
+            return channel
+    _stats.record_lookup(False)
+
+    if guild.me is None:
+        return None
+    channel = next((ch for ch in guild.text_channels if _check(guild, ch)), None)
+    _first_sendable[guild.id] = channel.id if channel else None
+    return channel
+
+
+def get_sendable_channel(guild: discord.Guild, channel_id: Optional[int]):
+    """Canal configurado `channel_id` si existe y el bot puede escribir en él; si no, None."""
+    if not channel_id:
+        return None
+    channel = guild.get_channel(channel_id)
+    return channel if can_send(guild, channel) else None
+
+
+def resolve(guild: discord.Guild, *candidates: Union[int, discord.abc.Messageable, None]):
+    """
+    Destino de un anuncio: el primer candidato (ID o canal) en el que el bot pueda escribir
+    y, si ninguno sirve, el primer canal de texto disponible del servidor.
+    """
+    for candidate in candidates:
+        channel = guild.get_channel(candidate) if isinstance(candidate, int) else candidate
+        if channel is not None and can_send(guild, channel):
+            return channel
+    return first_sendable_channel(guild)
+
+
+def invalidate_guild(guild_id: int) -> None:
+    """Olvida los destinos resueltos de un servidor (canales, roles o permisos cambiados)."""
+    _sendable.pop(guild_id, None)
+    _first_sendable.pop(guild_id, None)
@@ -0,0 +1,97 @@
+import os
+import sys
+import json
+import time
+import subprocess
+
+_t0 = time.perf_counter()
+
+# Set project root to sys.path
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root_dir)
+
+RUNS = 3
+
+# Escenario -> (CONCURRENCY, variables de entorno)
+SCENARIOS = {
+    "secuencial, todo activo": (1, {"ENABLE_MUSIC": "True", "ENABLE_WEB": "True"}),
+    "concurrente, todo activo": (8, {"ENABLE_MUSIC": "True", "ENABLE_WEB": "True"}),
+    "secuencial, sin música ni web": (1, {"ENABLE_MUSIC": "False", "ENABLE_WEB": "False"}),
+}
+
+
+async def run_worker(concurrency: int) -> dict:
+    """Un arranque sin conexión a Discord: base de datos, portal web (si está activo) y extensiones."""
+    import logging
+    import tempfile
+    logging.disable(logging.CRITICAL)
+
+    import discord
+    from discord.ext import commands
+    from config import settings
+    from services.core import database
+
+    # Base de datos temporal: el benchmark no toca data/
+    database.DB_PATH = os.path.join(tempfile.mkdtemp(), "bench.sqlite3")
+    from services.core import db_service, extension_loader
+
+    settings.EXTENSIONS_CONFIG["CONCURRENCY"] = concurrency
+    await db_service.init_db()
+
+    web = "off"
+    if extension_loader.is_feature_enabled("WEB"):
+        try:
+            from web.app import create_app
+            create_app()
+            web = "ok"
+        except ImportError as e:
+            web = f"no instalado ({e.name})"
+
+    bot = commands.Bot(command_prefix="!", intents=discord.Intents.default(), help_command=None)
+    names = extension_loader.discover_extensions("cogs")
+    start = time.perf_counter()
+    loaded = await extension_loader.load_extensions(bot, names)
+    end = time.perf_counter()
+
+    for name in list(bot.extensions):
+        await bot.unload_extension(name)
+    await db_service.close_db()
+    return {
+        "ready_ms": (end - _t0) * 1000,
+        "extensions_ms": (end - start) * 1000,
+        "loaded": loaded,
+        "total": len(names),
+        "web": web,
+        "heavy_modules": sorted(m for m in ("wavelink", "fastapi", "jinja2", "uvicorn", "psutil", "config.lang.en") if m in sys.modules)
+    }
+
+
+def main():
+    print("\n[Extension Loading Benchmark] Arranque sin gateway, proceso nuevo en cada medición")
+    print("=" * 60)
+    for label, (concurrency, env) in SCENARIOS.items():
+        results = []
+        for _ in range(RUNS):
+            proc = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--worker", str(concurrency)],
+                cwd=root_dir, env={**os.environ, **env}, capture_output=True, text=True
+            )
+            if proc.returncode != 0:
+                print(f"[ERROR] {label}: {proc.stderr.strip().splitlines()[-1:]}")
+                break
+            results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+        if not results:
+            continue
+        best = min(results, key=lambda r: r["ready_ms"])
+        print(f"{label}:")
+        print(f"  listo en {best['ready_ms']:.0f} ms (extensiones {best['extensions_ms']:.0f} ms), mejor de {len(results)}")
+        print(f"  extensiones cargadas {best['loaded']}/{best['total']} · web: {best['web']}")
+        print(f"  módulos pesados importados: {', '.join(best['heavy_modules']) or 'ninguno'}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--worker":
+        import asyncio
+        print(json.dumps(asyncio.run(run_worker(int(sys.argv[2])))))
+    else:
+        main()
@@ -0,0 +1,104 @@
+import os
+import sys
+import asyncio
+import tempfile
+from types import SimpleNamespace
+
+# Set project root to sys.path
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root_dir)
+
+from config import settings
+from services.core import database
+
+# Base de datos temporal: el benchmark no toca data/
+database.DB_PATH = os.path.join(tempfile.mkdtemp(), "bench.sqlite3")
+
+from services.core import db_service, lang_service, message_context
+from services.core.cache_service import cache
+from services.features import level_service
+from services.repositories.user_repository import UserRepository
+
+GUILD_ID = 745519235303735376
+BASE_USER_ID = 716845090500247613
+AUTHORS = 50
+MESSAGES = 1000
+
+calls = {"cache": 0, "db": 0}
+
+
+def count_calls(func, counter: str):
+    async def wrapper(*args, **kwargs):
+        calls[counter] += 1
+        return await func(*args, **kwargs)
+    return wrapper
+
+
+async def get_prefix(bot, message):
+    """Réplica de main.get_prefix sin depender del bot real."""
+    custom = await db_service.get_user_prefix(message.author.id)
+    return custom or settings.CONFIG["bot_config"]["prefix"]
+
+
+def make_message(i: int):
+    guild = SimpleNamespace(id=GUILD_ID, name="Benchmark")
+    author = SimpleNamespace(id=BASE_USER_ID + i % AUTHORS, bot=False, guild=guild, mention=f"<@{BASE_USER_ID + i % AUTHORS}>")
+    return SimpleNamespace(guild=guild, author=author, content="mensaje de prueba número " + str(i), mentions=[])
+
+
+async def legacy_message(bot, message, level_up: bool):
+    """Secuencia de lecturas anterior: dispatcher + LevelEvents + notify_level_up."""
+    config = await db_service.get_guild_config(message.guild.id)
+    lang = await lang_service.get_guild_lang(message.guild.id)
+    await bot.get_prefix(message)  # Resolución de prefijo de discord.py
+    await bot.get_prefix(message)  # LevelEvents.process_message_xp
+    if level_up:
+        lang = await lang_service.get_guild_lang(message.guild.id)
+        config = await db_service.get_guild_config(message.guild.id)
+        await UserRepository.get_user_data(message.author.id)
+        await db_service.get_guild_config(message.guild.id)
+
+
+async def context_message(bot, message, level_up: bool):
+    """Secuencia actual: MessageContext construido una vez y reutilizado al notificar."""
+    ctx = await message_context.build(bot, message)
+    await bot.get_prefix(message)  # Resolución de prefijo de discord.py
+    if level_up:
+        await level_service.get_level_up_message(ctx.author, 5, ctx.lang, ctx.config)
+
+
+async def measure(label: str, handler, bot, level_up: bool):
+    calls["cache"] = calls["db"] = 0
+    for i in range(MESSAGES):
+        await handler(bot, make_message(i), level_up)
+    print(f"{label:<38} {calls['cache'] / MESSAGES:>8.2f} {calls['db'] / MESSAGES:>8.2f}")
+
+
+async def main():
+    await db_service.init_db()
+    await database.execute("INSERT INTO guild_config (guild_id) VALUES (?)", (GUILD_ID,))
+    await database.execute_many(
+        "INSERT INTO users (user_id, custom_prefix) VALUES (?, ?)",
+        [(BASE_USER_ID + i, "?" if i == 0 else None) for i in range(AUTHORS)]
+    )
+
+    cache.get = count_calls(cache.get, "cache")
+    database.fetch_one = count_calls(database.fetch_one, "db")
+    database.fetch_all = count_calls(database.fetch_all, "db")
+
+    bot = SimpleNamespace(user=SimpleNamespace(id=1))
+    bot.get_prefix = lambda message: get_prefix(bot, message)
+
+    print(f"{'Llamadas por mensaje':<38} {'caché':>8} {'DB':>8}")
+    print("-" * 56)
+    await measure("Antes (mensaje normal)", legacy_message, bot, False)
+    await measure("Antes (con subida de nivel)", legacy_message, bot, True)
+
+    await UserRepository.load_prefix_index()
+    await measure("MessageContext (mensaje normal)", context_message, bot, False)
+    await measure("MessageContext (con subida de nivel)", context_message, bot, True)
+    await database.close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,110 @@
+import os
+import sys
+import time
+import random
+import sqlite3
+import tempfile
+
+# Set project root to sys.path
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root_dir)
+
+from config import settings
+from services.repositories.xp_repository import GuildRanking
+
+GUILD_ID = 745519235303735376
+BASE_USER_ID = 716845090500247613
+LOOKUPS = 200
+
+
+def build_database(path: str, size: int):
+    """Crea una tabla guild_stats sintética con `size` miembros en un único servidor."""
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute("""
+    CREATE TABLE guild_stats (
+        guild_id INTEGER,
+        user_id INTEGER,
+        rebirths INTEGER DEFAULT 0,
+        xp INTEGER DEFAULT 0,
+        level INTEGER DEFAULT 1,
+        PRIMARY KEY (guild_id, user_id)
+    )
+    """)
+    rng = random.Random(42)
+    rows = (
+        (GUILD_ID, BASE_USER_ID + i, rng.choice((0, 0, 0, 0, 1, 2)), rng.randint(0, 5000), rng.randint(1, 120))
+        for i in range(size)
+    )
+    conn.executemany("INSERT INTO guild_stats (guild_id, user_id, rebirths, xp, level) VALUES (?, ?, ?, ?, ?)", rows)
+    conn.execute("CREATE INDEX idx_ranking ON guild_stats (guild_id, rebirths DESC, level DESC, xp DESC)")
+    conn.commit()
+    return conn
+
+
+def sql_position(conn: sqlite3.Connection, user_id: int) -> int:
+    """Posición calculada con COUNT sobre idx_ranking (recorre todas las filas por delante)."""
+    reb, lvl, xp = conn.execute(
+        "SELECT rebirths, level, xp FROM guild_stats WHERE guild_id = ? AND user_id = ?", (GUILD_ID, user_id)
+    ).fetchone()
+    ahead = conn.execute(
+        "SELECT COUNT(*) FROM guild_stats WHERE guild_id = ? AND ("
+        "rebirths > ? OR (rebirths = ? AND (level > ? OR (level = ? AND (xp > ? OR (xp = ? AND user_id < ?))))))",
+        (GUILD_ID, reb, reb, lvl, lvl, xp, xp, user_id)
+    ).fetchone()[0]
+    return ahead + 1
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Generando guild_stats sintética con {size:,} filas...")
+        conn = build_database(os.path.join(tmp, "bench.sqlite3"), size)
+        sample = [BASE_USER_ID + random.randrange(size) for _ in range(LOOKUPS)]
+
+        start = time.perf_counter()
+        sql_results = [sql_position(conn, user_id) for user_id in sample]
+        sql_ms = (time.perf_counter() - start) * 1000 / LOOKUPS
+
+        # Igual que XpRepository._build_ranking: lectura ordenada por lotes; solo extend_sorted corre en el event loop
+        batch_size = settings.LEVELS_CONFIG["RANKING_BUILD_BATCH"]
+        cursor = conn.execute(
+            "SELECT user_id, rebirths, level, xp FROM guild_stats WHERE guild_id = ? "
+            "ORDER BY rebirths DESC, level DESC, xp DESC, user_id",
+            (GUILD_ID,)
+        )
+        ranking = GuildRanking()
+        start = time.perf_counter()
+        loop_ms = worst_batch_ms = 0.0
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            batch_start = time.perf_counter()
+            ranking.extend_sorted(rows)
+            batch_ms = (time.perf_counter() - batch_start) * 1000
+            loop_ms += batch_ms
+            worst_batch_ms = max(worst_batch_ms, batch_ms)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        mem_results = [ranking.position(user_id) for user_id in sample]
+        mem_us = (time.perf_counter() - start) * 1_000_000 / LOOKUPS
+
+        start = time.perf_counter()
+        for user_id in sample:
+            ranking.update(user_id, 0, random.randint(1, 120), random.randint(0, 5000))
+        update_us = (time.perf_counter() - start) * 1_000_000 / LOOKUPS
+        conn.close()
+
+    assert sql_results == mem_results, "El ranking en memoria no coincide con el COUNT de SQLite"
+    print(f"COUNT sobre idx_ranking:      {sql_ms:10.2f} ms por consulta")
+    print(f"Carga + GuildRanking:         {build_ms:10.2f} ms (una vez por servidor; en el bot la lectura va en el hilo de aiosqlite)")
+    print(f"  en el event loop:           {loop_ms:10.2f} ms en lotes de {batch_size} (el más lento {worst_batch_ms:.2f} ms)")
+    print(f"GuildRanking.position():      {mem_us:10.2f} µs por consulta")
+    print(f"GuildRanking.update():        {update_us:10.2f} µs por cambio de XP")
+
+
+if __name__ == "__main__":
+    main()
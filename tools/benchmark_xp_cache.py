@@ -0,0 +1,62 @@
+import os
+import sys
+import time
+import gc
+import tracemalloc
+
+# Set project root to sys.path
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root_dir)
+
+from services.repositories.xp_repository import XpCacheEntry, cache_key
+
+# Snowflakes reales de Discord (64 bits) para que los enteros tengan el tamaño de producción
+BASE_GUILD_ID = 745519235303735376
+BASE_USER_ID = 716845090500247613
+
+
+def build_legacy_cache(size: int) -> dict:
+    """Formato anterior: un diccionario de cinco claves por miembro."""
+    now = time.time()
+    return {
+        (BASE_GUILD_ID + (i % 50), BASE_USER_ID + i): {'xp': i % 500, 'level': 1 + i % 80, 'rebirths': 0, 'dirty': False, 'last_access': now}
+        for i in range(size)
+    }
+
+
+def build_slot_cache(size: int) -> dict:
+    """Formato actual: clave entera empaquetada y una instancia de XpCacheEntry con __slots__."""
+    now = time.time()
+    return {
+        cache_key(BASE_GUILD_ID + (i % 50), BASE_USER_ID + i): XpCacheEntry(i % 500, 1 + i % 80, 0, False, now)
+        for i in range(size)
+    }
+
+
+def measure(builder, size: int) -> float:
+    """Devuelve los bytes asignados por miembro (clave + entrada + hueco del diccionario)."""
+    gc.collect()
+    tracemalloc.start()
+    cache = builder(size)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del cache
+    gc.collect()
+    return current / size
+
+
+def main():
+    sizes = [100_000, 1_000_000]
+    if len(sys.argv) > 1:
+        sizes = [int(arg) for arg in sys.argv[1:]]
+
+    print(f"{'Miembros':>10} | {'dict (B/miembro)':>17} | {'slots (B/miembro)':>18} | {'Ahorro':>7}")
+    print("-" * 62)
+    for size in sizes:
+        legacy = measure(build_legacy_cache, size)
+        slots = measure(build_slot_cache, size)
+        print(f"{size:>10,} | {legacy:>17.1f} | {slots:>18.1f} | {1 - slots / legacy:>6.1%}")
+
+
+if __name__ == "__main__":
+    main()
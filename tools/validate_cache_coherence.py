@@ -0,0 +1,102 @@
+import os
+import sys
+import asyncio
+
+# Set project root to sys.path
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root_dir)
+
+from services.core.cache_service import RedisCacheBackend, TwoTierCacheBackend
+
+
+def make_clients(count: int):
+    """Clientes Redis que comparten servidor: REDIS_URL real si existe, si no un servidor fakeredis local."""
+    redis_url = os.getenv("REDIS_URL")
+    if redis_url:
+        import redis.asyncio as aioredis
+        return [aioredis.from_url(redis_url, decode_responses=True) for _ in range(count)], redis_url
+    try:
+        import fakeredis
+    except ImportError:
+        return None, None
+    server = fakeredis.FakeServer()
+    return [fakeredis.FakeAsyncRedis(server=server, decode_responses=True) for _ in range(count)], "fakeredis"
+
+
+async def wait_until(condition, timeout: float = 2.0) -> bool:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while loop.time() < deadline:
+        if await condition():
+            return True
+        await asyncio.sleep(0.01)
+    return False
+
+
+async def validate_cache_coherence() -> bool:
+    print("\n[Cache Validator] Comprobando coherencia de la caché L1 + Redis entre procesos...")
+    print("=" * 60)
+
+    clients, target = make_clients(2)
+    if clients is None:
+        print("[SKIP] Define REDIS_URL o instala 'fakeredis' para ejecutar esta comprobación.")
+        return True
+    print(f"[Cache Validator] Servidor: {target}")
+
+    bot = TwoTierCacheBackend(RedisCacheBackend(client=clients[0]))
+    web = TwoTierCacheBackend(RedisCacheBackend(client=clients[1]))
+    key = "guild_config:validate_cache_coherence"
+    errors = []
+
+    try:
+        await bot.get(key)
+        await web.get(key)
+        if not await wait_until(_subscribed(bot, web)):
+            errors.append("Las instancias no llegaron a suscribirse al canal de invalidación.")
+        else:
+            await bot.set(key, {"prefix": "!"})
+            await asyncio.sleep(0.1)  # Dejar que llegue la invalidación antes de leer desde el otro proceso
+            if await web.get(key) != {"prefix": "!"}:
+                errors.append("El segundo proceso no lee el valor escrito por el primero.")
+            if await web._local.get(key) is None:
+                errors.append("La lectura no quedó almacenada en el L1 del segundo proceso.")
+
+            await bot.set(key, {"prefix": "?"})
+            if not await wait_until(_matches(web, key, {"prefix": "?"})):
+                errors.append("El L1 del segundo proceso sigue sirviendo un valor obsoleto tras set().")
+
+            await bot.fill(key, {"prefix": "?"})
+            await asyncio.sleep(0.1)  # Una recarga desde la DB no debe llegar como invalidación
+            if await web._local.get(key) is None:
+                errors.append("fill() invalidó el L1 del segundo proceso (solo deben publicar las escrituras reales).")
+
+            await web.delete(key)
+            if not await wait_until(_matches(bot, key, None)):
+                errors.append("El L1 del primer proceso no se invalidó tras delete().")
+    finally:
+        await bot.delete(key)
+        await bot.close()
+        await web.close()
+
+    for error in errors:
+        print(f"[ERROR] {error}")
+    if not errors:
+        print("[SUCCESS] Las escrituras invalidan el L1 de los demás procesos.")
+    return not errors
+
+
+def _subscribed(*backends: TwoTierCacheBackend):
+    async def condition():
+        return all(backend._subscribed for backend in backends)
+    return condition
+
+
+def _matches(backend: TwoTierCacheBackend, key: str, expected):
+    async def condition():
+        return await backend.get(key) == expected
+    return condition
+
+
+if __name__ == "__main__":
+    ok = asyncio.run(validate_cache_coherence())
+    sys.exit(0 if ok else 1)
@@ -1,24 +1,28 @@
 import os
 import sys
-import ast
-import re
+import asyncio
 
 # Set project root to sys.path
 root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(root_dir)
 
+import aiosqlite
+from services.core import database, migrations
+
+# Columnas de las bases de datos más antiguas que siguen en uso (anteriores a las columnas añadidas con AddColumn).
+# Las migraciones deben llevar una base así hasta el mismo esquema que una base nueva.
 BASELINE_COLUMNS = {
     "users": {
-        "user_id", "birthday", "celebrate", "custom_prefix", 
+        "user_id", "birthday", "celebrate", "custom_prefix",
         "description", "personal_level_msg", "personal_birthday_msg", "bank_coins"
     },
     "guild_stats": {
         "guild_id", "user_id", "xp", "level"
     },
     "guild_config": {
-        "guild_id", "chaos_enabled", "chaos_probability", "welcome_channel_id", 
-        "confessions_channel_id", "logs_channel_id", "birthday_channel_id", 
-        "autorole_id", "mention_response", "server_level_msg", "server_birthday_msg", 
+        "guild_id", "chaos_enabled", "chaos_probability", "welcome_channel_id",
+        "confessions_channel_id", "logs_channel_id", "birthday_channel_id",
+        "autorole_id", "mention_response", "server_level_msg", "server_birthday_msg",
         "server_kick_msg", "server_ban_msg"
     },
     "bot_persistence": {
@@ -40,190 +44,90 @@ BASELINE_COLUMNS = {
     }
 }
 
-class DbServiceVisitor(ast.NodeVisitor):
-    def __init__(self):
-        self.required_tables = set()
-        self.create_table_queries = []
-        self.ensure_column_calls = []
-
-    def visit_Assign(self, node):
-        # Detect REQUIRED_TABLES
-        for target in node.targets:
-            if isinstance(target, ast.Name) and target.id == "REQUIRED_TABLES":
-                if isinstance(node.value, ast.Set):
-                    for elt in node.value.elts:
-                        if isinstance(elt, ast.Constant):
-                            self.required_tables.add(elt.value)
-                        elif isinstance(elt, ast.Str): # Support Python < 3.8
-                            self.required_tables.add(elt.s)
-        self.generic_visit(node)
-
-    def visit_Call(self, node):
-        # Detect execute("CREATE TABLE IF NOT EXISTS ...")
-        is_execute = False
-        if isinstance(node.func, ast.Name) and node.func.id == "execute":
-            is_execute = True
-        elif isinstance(node.func, ast.Attribute) and node.func.attr == "execute":
-            is_execute = True
-
-        if is_execute and node.args:
-            first_arg = node.args[0]
-            query_str = None
-            if isinstance(first_arg, ast.Constant) and isinstance(first_arg.value, str):
-                query_str = first_arg.value
-            elif isinstance(first_arg, ast.Str):
-                query_str = first_arg.s
-            
-            if query_str and "CREATE TABLE" in query_str:
-                self.create_table_queries.append((node.lineno, query_str))
-
-        # Detect _ensure_column("table", "column", "def")
-        is_ensure = False
-        if isinstance(node.func, ast.Name) and node.func.id == "_ensure_column":
-            is_ensure = True
-        elif isinstance(node.func, ast.Attribute) and node.func.attr == "_ensure_column":
-            is_ensure = True
-
-        if is_ensure and len(node.args) >= 2:
-            arg_table = node.args[0]
-            arg_col = node.args[1]
-            table_val = None
-            col_val = None
-
-            if isinstance(arg_table, ast.Constant):
-                table_val = arg_table.value
-            elif isinstance(arg_table, ast.Str):
-                table_val = arg_table.s
-
-            if isinstance(arg_col, ast.Constant):
-                col_val = arg_col.value
-            elif isinstance(arg_col, ast.Str):
-                col_val = arg_col.s
-
-            if table_val and col_val:
-                self.ensure_column_calls.append((node.lineno, table_val, col_val))
-
-        self.generic_visit(node)
-
-def parse_columns_from_query(query):
-    # Extract text inside the first outer parenthesis
-    start = query.find("(")
-    end = query.rfind(")")
-    if start == -1 or end == -1:
-        return set()
-    
-    inside = query[start+1:end]
-    
-    # Simple parser that handles comma separation ignoring nested parenthesis
-    columns = set()
-    paren_depth = 0
-    current_token = []
-    
-    for char in inside:
-        if char == "(":
-            paren_depth += 1
-            current_token.append(char)
-        elif char == ")":
-            paren_depth -= 1
-            current_token.append(char)
-        elif char == "," and paren_depth == 0:
-            line = "".join(current_token).strip()
-            if line:
-                # First word is generally the column name (excluding keywords like PRIMARY KEY, FOREIGN KEY, etc.)
-                words = line.split()
-                if words and words[0].upper() not in {"PRIMARY", "FOREIGN", "CONSTRAINT", "UNIQUE", "CHECK"}:
-                    columns.add(words[0].lower().strip("`\"'"))
-            current_token = []
-        else:
-            current_token.append(char)
-            
-    # Add last token
-    line = "".join(current_token).strip()
-    if line:
-        words = line.split()
-        if words and words[0].upper() not in {"PRIMARY", "FOREIGN", "CONSTRAINT", "UNIQUE", "CHECK"}:
-            columns.add(words[0].lower().strip("`\"'"))
-            
-    return columns
-
-def validate_db_schema():
-    db_service_path = os.path.join(root_dir, "services", "core", "db_service.py")
-    if not os.path.exists(db_service_path):
-        print(f"Error: No se encontro db_service.py en {db_service_path}")
-        sys.exit(1)
-
+async def read_schema(db: aiosqlite.Connection) -> dict[str, set[str]]:
+    """Tablas y columnas de una base de datos (sin las tablas internas de SQLite)."""
+    async with db.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'") as cursor:
+        tables = [row[0] for row in await cursor.fetchall()]
+    schema = {}
+    for table in tables:
+        async with db.execute(f"PRAGMA table_info({table})") as cursor:
+            schema[table] = {row[1] for row in await cursor.fetchall()}
+    return schema
+
+async def validate_db_schema_async() -> bool:
     print("\n[DB Schema Validator] Iniciando comprobacion de consistencia del esquema...")
     print("=" * 60)
-
-    try:
-        print("[DB Schema Validator] Leyendo db_service.py...")
-        with open(db_service_path, "r", encoding="utf-8") as f:
-            source = f.read()
-        tree = ast.parse(source, filename=db_service_path)
-    except Exception as e:
-        print(f"[ERROR] Error al parsear db_service.py: {e}")
-        sys.exit(1)
-
-    print("[DB Schema Validator] Analizando tablas y columnas...")
-    visitor = DbServiceVisitor()
-    visitor.visit(tree)
-
     errors_found = False
 
-    # 1. Validate REQUIRED_TABLES
-    print(f"[DB Schema Validator] REQUIRED_TABLES encontradas: {visitor.required_tables}")
-    
-    created_tables = {}
-    table_regex = re.compile(r"CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)", re.IGNORECASE)
-    
-    for line, query in visitor.create_table_queries:
-        match = table_regex.search(query)
-        if match:
-            table_name = match.group(1).lower()
-            created_tables[table_name] = (line, query)
-            
-            # Check if it is listed in REQUIRED_TABLES
-            if table_name not in visitor.required_tables:
-                errors_found = True
-                print(f"[ERROR] Tabla '{table_name}' definida en CREATE TABLE (Linea {line}) pero falta en REQUIRED_TABLES.")
-        else:
-            print(f"[WARNING] No se pudo extraer el nombre de la tabla de la consulta en la Linea {line}")
-
-    # 2. Check migrations (_ensure_column) for non-baseline columns
-    print("[DB Schema Validator] Verificando llamadas a _ensure_column...")
-    ensure_map = {}
-    for line, table, col in visitor.ensure_column_calls:
-        table_l = table.lower()
-        col_l = col.lower()
-        if table_l not in ensure_map:
-            ensure_map[table_l] = set()
-        ensure_map[table_l].add(col_l)
-
-    for table_name, (line, query) in created_tables.items():
-        columns = parse_columns_from_query(query)
-        baseline = BASELINE_COLUMNS.get(table_name, set())
-        
-        non_baseline_cols = columns - baseline
-        if non_baseline_cols:
-            print(f"Tabla '{table_name}' (Linea {line}): Detectadas columnas no-base {non_baseline_cols}")
-            for col in non_baseline_cols:
-                # Verify that it has an _ensure_column call
-                has_migration = False
-                if table_name in ensure_map and col in ensure_map[table_name]:
-                    has_migration = True
-                    
-                if not has_migration:
-                    errors_found = True
-                    print(f"[ERROR] Columna nueva '{col}' en la tabla '{table_name}' no tiene una llamada a _ensure_column() registrada en init_db().")
-                    print(f"        Agrega: await _ensure_column(\"{table_name}\", \"{col}\", \"DEFINICION_SQL\") para evitar errores en DBs existentes.")
+    # 1. Numeración de migraciones
+    versions = [m.version for m in migrations.MIGRATIONS]
+    print(f"[DB Schema Validator] Migraciones registradas: {versions} (esquema v{migrations.SCHEMA_VERSION})")
+    if versions != list(range(1, len(versions) + 1)):
+        errors_found = True
+        print("[ERROR] Las versiones de MIGRATIONS deben ser consecutivas y empezar en 1.")
+
+    # 2. Base de datos nueva: todas las migraciones desde cero
+    print("[DB Schema Validator] Aplicando migraciones sobre una base de datos vacia...")
+    async with aiosqlite.connect(":memory:") as fresh:
+        applied = await migrations.migrate(fresh)
+        fresh_schema = await read_schema(fresh)
+        if await migrations.get_schema_version(fresh) != migrations.SCHEMA_VERSION:
+            errors_found = True
+            print("[ERROR] PRAGMA user_version no quedo en la ultima version tras migrar.")
+        if await migrations.migrate(fresh):
+            errors_found = True
+            print("[ERROR] Una base de datos ya migrada volvio a aplicar migraciones.")
+    print(f"[DB Schema Validator] Aplicadas {len(applied)} migraciones; tablas creadas: {sorted(fresh_schema)}")
+
+    required = {t for t in database.REQUIRED_TABLES if not t.startswith("sqlite_")}
+    for table in sorted(set(fresh_schema) - required):
+        errors_found = True
+        print(f"[ERROR] Tabla '{table}' creada por las migraciones pero falta en database.REQUIRED_TABLES.")
+    for table in sorted(required - set(fresh_schema)):
+        errors_found = True
+        print(f"[ERROR] Tabla '{table}' listada en REQUIRED_TABLES pero ninguna migracion la crea.")
+
+    # 3. Base de datos antigua (anterior al versionado): debe alcanzar el mismo esquema
+    print("[DB Schema Validator] Aplicando migraciones sobre una base de datos antigua simulada...")
+    async with aiosqlite.connect(":memory:") as legacy:
+        for table, columns in BASELINE_COLUMNS.items():
+            await legacy.execute(f"CREATE TABLE {table} ({', '.join(sorted(columns))})")
+            # Con filas: SQLite rechaza en tablas no vacías algunos ADD COLUMN que acepta en tablas vacías
+            await legacy.execute(f"INSERT INTO {table} DEFAULT VALUES")
+        await legacy.commit()
+        try:
+            await migrations.migrate(legacy)
+        except Exception as e:
+            errors_found = True
+            print(f"[ERROR] Las migraciones fallan sobre una base de datos antigua con datos: {e}")
+        legacy_schema = await read_schema(legacy)
+
+        # Las columnas con relleno no deben quedar vacías en las filas existentes
+        for migration in migrations.MIGRATIONS:
+            for step in migration.steps:
+                if isinstance(step, migrations.AddColumn) and step.backfill and step.column in legacy_schema.get(step.table, set()):
+                    async with legacy.execute(f"SELECT COUNT(*) FROM {step.table} WHERE {step.column} IS NULL") as cursor:
+                        if (await cursor.fetchone())[0]:
+                            errors_found = True
+                            print(f"[ERROR] La columna '{step.table}.{step.column}' quedo sin rellenar en las filas existentes.")
+
+    for table, columns in fresh_schema.items():
+        missing = columns - legacy_schema.get(table, set())
+        for column in sorted(missing):
+            errors_found = True
+            print(f"[ERROR] Columna '{column}' de la tabla '{table}' no llega a las bases de datos existentes.")
+            print(f"        Agrega una nueva migracion con AddColumn(\"{table}\", \"{column}\", \"DEFINICION_SQL\") en services/core/migrations.py.")
 
     if not errors_found:
         print("Perfecto! El esquema de la base de datos y sus migraciones son consistentes.")
-        sys.exit(0)
     else:
         print("=" * 60)
         print("Se encontraron inconsistencias en el esquema de base de datos o migraciones.")
-        sys.exit(1)
+    return not errors_found
+
+def validate_db_schema():
+    ok = asyncio.run(validate_db_schema_async())
+    sys.exit(0 if ok else 1)
 
 if __name__ == "__main__":
     validate_db_schema()
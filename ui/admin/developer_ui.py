@@ -6,14 +6,34 @@ import platform
 import time
 import asyncio
 from config import settings
-from services.core import lang_service, db_service
+from services.core import lang_service, db_service, message_dispatch, admission_control, startup_profiler
 from services.repositories.status_repository import StatusRepository
 from services.utils import embed_service
+from services.utils.cache_helper import get_cache_stats_snapshot
 
 def _make_bar(percent, length=settings.UI_CONFIG["BAR_LENGTH"]):
     filled = int(length * percent / 100)
     return "█" * filled + "░" * (length - filled)
 
+def _handler_lines(lang) -> list[str]:
+    """Latencia de los manejadores de on_message (media, máxima, lentos, timeouts y errores) y mensajes descartados."""
+    snapshot = message_dispatch.get_handler_stats_snapshot()
+    if not snapshot:
+        return []
+    admission = admission_control.get_admission_snapshot()
+    lines = [f"> **{lang_service.get_text('botinfo_handlers', lang)}:**"]
+    lines.append(lang_service.get_text(
+        "botinfo_admission_line", lang, shed=admission['shed'], admitted=admission['admitted'],
+        overloaded=admission['overloaded_guilds']
+    ))
+    for name, stats in snapshot.items():
+        avg = f"{stats['avg_ms']:.1f} ms" if stats['avg_ms'] is not None else "—"
+        lines.append(lang_service.get_text(
+            "botinfo_handler_line", lang, name=name, avg=avg, max=f"{stats['max_ms']:.0f} ms",
+            slow=stats['slow'], timeouts=stats['timeouts'], errors=stats['errors']
+        ))
+    return lines
+
 async def get_general_embed(bot, guild, lang, info=None):
     if info is None:
         from services.features import developer_service
@@ -45,7 +65,8 @@ async def get_system_embed(guild, lang, info=None):
         
     title = lang_service.get_text("botinfo_system_title", lang)
     if not info["available"]:
-        return embed_service.info(title=title, description=lang_service.get_text("dev_psutil_error", lang))
+        description = "\n".join([lang_service.get_text("dev_psutil_error", lang)] + _handler_lines(lang))
+        return embed_service.info(title=title, description=description)
 
     ram_bar = _make_bar(info['ram_sys'].percent)
     ram_txt = f"{ram_bar}\n>  • **Total:** `{info['ram_sys'].total / 1024**3:.1f} GB`\n>  • **Bot:** `{info['mem_proc']:.1f} MB`"
@@ -60,6 +81,7 @@ async def get_system_embed(guild, lang, info=None):
         desc_lines.append(f"> **{lang_service.get_text('botinfo_disk', lang)} ({info['disk'].percent}%):** {disk_bar}\n>  • **Libre:** `{info['disk'].free / 1024**3:.1f} GB`")
         
     desc_lines.append(f"> **{lang_service.get_text('botinfo_os', lang)}:** {platform.system()} {platform.release()}")
+    desc_lines.extend(_handler_lines(lang))
     
     return embed_service.info(title=title, description="\n".join(desc_lines))
 
@@ -119,6 +141,49 @@ async def get_config_embed(lang: str) -> discord.Embed:
     )
     return embed_service.info(title=lang_service.get_text("botinfo_config_title", lang), description=description)
 
+async def get_cache_embed(lang: str) -> discord.Embed:
+    """Genera el embed con los contadores de eficacia de cada caché por espacio de nombres."""
+    title = lang_service.get_text("botinfo_cache_title", lang)
+    snapshot = get_cache_stats_snapshot()
+    if not snapshot:
+        return embed_service.info(title=title, description=lang_service.get_text("botinfo_cache_empty", lang))
+
+    lines = []
+    for name, stats in snapshot.items():
+        ratio = f"{stats['hit_ratio'] * 100:.1f}%" if stats['hit_ratio'] is not None else "—"
+        avg_load = f"{stats['avg_load_ms']:.1f} ms" if stats['avg_load_ms'] is not None else "—"
+        size = stats['size'] if stats['size'] is not None else "—"
+        lines.append(lang_service.get_text(
+            "botinfo_cache_line", lang, name=name, ratio=ratio, hits=stats['hits'], misses=stats['misses'],
+            loads=stats['loads'], avg_load=avg_load, evictions=stats['evictions'] + stats['expirations'], size=size
+        ))
+    return embed_service.info(title=title, description="\n".join(lines))
+
+async def get_boot_embed(lang: str) -> discord.Embed:
+    """Genera el embed con la línea de tiempo del arranque (fases y extensiones más lentas)."""
+    title = lang_service.get_text("botinfo_boot_title", lang)
+    timeline = startup_profiler.get_boot_timeline()
+    if not timeline["phases"]:
+        return embed_service.info(title=title, description=lang_service.get_text("botinfo_boot_empty", lang))
+
+    ready = timeline["marks"].get("ready")
+    lines = [lang_service.get_text("botinfo_boot_ready", lang, seconds=f"{ready / 1000:.2f}" if ready is not None else "—")]
+    lines.append(f"\n> **{lang_service.get_text('botinfo_boot_phases', lang)}:**")
+    for p in timeline["phases"]:
+        depth = p["name"].count(".")
+        prefix = ">  • " if depth == 0 else ">    ↳ "
+        lines.append(f"{prefix}`{p['name'].rsplit('.', 1)[-1]}` · `+{p['start_ms'] / 1000:.2f}s` · **{p['duration_ms']:.0f} ms**")
+
+    extensions = list(timeline["extensions"].items())
+    if extensions:
+        lines.append(f"\n> **{lang_service.get_text('botinfo_boot_extensions', lang, count=len(extensions))}:**")
+        for name, ext in extensions[:settings.BOTINFO_CONFIG["BOOT_TOP_EXTENSIONS"]]:
+            lines.append(lang_service.get_text(
+                "botinfo_boot_ext_line", lang, name=name.removeprefix("cogs."), total=f"{ext['total_ms'] or 0:.0f}",
+                imports=f"{ext['import_ms'] or 0:.0f}", setup=f"{ext['setup_ms']:.0f}"
+            ))
+    return embed_service.info(title=title, description="\n".join(lines))
+
 async def get_status_list_embed(lang: str) -> discord.Embed:
     """Genera un embed con la lista de estados configurados."""
     rows = await StatusRepository.get_statuses()
@@ -217,10 +282,14 @@ class BotInfoView(discord.ui.View):
         self.btn_system.label = lang_service.get_text("botinfo_btn_system", lang)
         self.btn_memory.label = lang_service.get_text("botinfo_btn_memory", lang)
         self.btn_config.label = lang_service.get_text("botinfo_btn_config", lang)
+        self.btn_cache.label = lang_service.get_text("botinfo_btn_cache", lang)
         self.btn_general.emoji = settings.BOTINFO_CONFIG["EMOJIS"]["GENERAL"]
         self.btn_system.emoji = settings.BOTINFO_CONFIG["EMOJIS"]["SYSTEM"]
         self.btn_memory.emoji = settings.BOTINFO_CONFIG["EMOJIS"]["MEMORY"]
         self.btn_config.emoji = settings.BOTINFO_CONFIG["EMOJIS"]["CONFIG"]
+        self.btn_cache.emoji = settings.BOTINFO_CONFIG["EMOJIS"]["CACHE"]
+        self.btn_boot.label = lang_service.get_text("botinfo_btn_boot", lang)
+        self.btn_boot.emoji = settings.BOTINFO_CONFIG["EMOJIS"]["BOOT"]
         self.btn_monitor.label = "Iniciar Monitor"
         self.remove_item(self.btn_monitor)
 
@@ -257,7 +326,7 @@ class BotInfoView(discord.ui.View):
             if self.btn_monitor not in self.children: self.add_item(self.btn_monitor)
         else:
             if self.btn_monitor in self.children: self.remove_item(self.btn_monitor)
-        tabs = [self.btn_general, self.btn_system, self.btn_memory, self.btn_config]
+        tabs = [self.btn_general, self.btn_system, self.btn_memory, self.btn_config, self.btn_cache, self.btn_boot]
         for i, child in enumerate(tabs): child.style = discord.ButtonStyle.primary if i == style_idx else discord.ButtonStyle.secondary
         await interaction.response.edit_message(embed=embed, view=self)
 
@@ -269,6 +338,10 @@ class BotInfoView(discord.ui.View):
     async def btn_memory(self, interaction: discord.Interaction, button: discord.ui.Button): await self._update(interaction, await get_memory_embed(self.lang), 2)
     @discord.ui.button(style=discord.ButtonStyle.secondary)
     async def btn_config(self, interaction: discord.Interaction, button: discord.ui.Button): await self._update(interaction, await get_config_embed(self.lang), 3)
+    @discord.ui.button(style=discord.ButtonStyle.secondary)
+    async def btn_cache(self, interaction: discord.Interaction, button: discord.ui.Button): await self._update(interaction, await get_cache_embed(self.lang), 4)
+    @discord.ui.button(style=discord.ButtonStyle.secondary, row=1)
+    async def btn_boot(self, interaction: discord.Interaction, button: discord.ui.Button): await self._update(interaction, await get_boot_embed(self.lang), 5)
     @discord.ui.button(style=discord.ButtonStyle.success, row=1, emoji="📈")
     async def btn_monitor(self, interaction: discord.Interaction, button: discord.ui.Button):
         if tracemalloc.is_tracing():
@@ -280,6 +353,41 @@ class BotInfoView(discord.ui.View):
             self.bot.loop.create_task(self._monitor_loop())
         await interaction.response.edit_message(view=self)
 
+def get_backup_list_embed(lang: str, backups: list[dict]) -> discord.Embed:
+    """Genera el embed con las copias de seguridad locales (la más reciente primero)."""
+    title = lang_service.get_text("dev_backup_title", lang)
+    if not backups:
+        return embed_service.info(title, lang_service.get_text("dev_backup_list_empty", lang), lite=True)
+    lines = [
+        lang_service.get_text(
+            "dev_backup_line", lang, name=m["name"], date=m["created_at"][:16].replace("T", " "),
+            size=f"{m['size'] / 1024:.0f}", raw=f"{m['raw_size'] / 1024:.0f}", compression=m["compression"], version=m["schema_version"]
+        )
+        for m in backups
+    ]
+    return embed_service.info(title, "\n".join(lines), lite=True)
+
+def get_backup_created_embed(lang: str, manifest: dict) -> discord.Embed:
+    """Genera el embed de éxito al crear una copia de seguridad."""
+    desc = lang_service.get_text(
+        "dev_backup_created", lang, name=manifest["name"], size=f"{manifest['size'] / 1024:.0f}",
+        raw=f"{manifest['raw_size'] / 1024:.0f}", compression=manifest["compression"], ms=f"{manifest['duration_ms']:.0f}"
+    )
+    return embed_service.success(lang_service.get_text("dev_backup_title", lang), desc, lite=True)
+
+def get_backup_check_embed(lang: str, result: dict, restore: bool = False) -> discord.Embed:
+    """Genera el embed con el resultado de verificar (o preparar la restauración de) una copia."""
+    title = lang_service.get_text("dev_backup_title", lang)
+    if not result["ok"]:
+        return embed_service.error(title, lang_service.get_text("dev_backup_verify_fail", lang, name=result["name"], error=result["error"]), lite=True)
+    desc = lang_service.get_text(
+        "dev_backup_verify_ok", lang, name=result["name"], version=result["schema_version"],
+        pages=result["page_count"], size=f"{result['page_count'] * result['page_size'] / 1024:.0f}"
+    )
+    if restore:
+        desc += "\n" + lang_service.get_text("dev_backup_restore_staged", lang)
+    return embed_service.success(title, desc, lite=True)
+
 def get_dev_edit_success_embed(lang: str, field: str, value: str) -> discord.Embed:
     """Genera el embed de éxito para edición de estadísticas/perfil."""
     title = lang_service.get_text("dev_edit_title_success", lang)
@@ -5,11 +5,11 @@ from services.core import lang_service
 from services.utils import embed_service
 
 def _get_visible_cogs(bot):
-    """Retorna una lista de Cogs que tienen al menos un comando visible."""
-    return [
-        cog for cog in bot.cogs.values() 
-        if any(not c.hidden for c in cog.get_commands())
-    ]
+    """Retorna una lista de Cogs que tienen al menos un comando visible (por nombre: la carga concurrente no fija su orden)."""
+    return sorted(
+        (cog for cog in bot.cogs.values() if any(not c.hidden for c in cog.get_commands())),
+        key=lambda cog: cog.qualified_name
+    )
 
 def get_help_options(bot, lang: str) -> list[discord.SelectOption]:
     """Genera la lista de opciones para el menú desplegable de ayuda."""
@@ -6,8 +6,8 @@ from services.core import lang_service
 
 logger = logging.getLogger(__name__)
 
-def get_rank_embed(target: discord.Member, stats: dict, xp_next: int, lang: str) -> discord.Embed:
-    """Genera un embed con el nivel, progreso y rebirths del usuario."""
+def get_rank_embed(target: discord.Member, stats: dict, xp_next: int, lang: str, position: int | None = None, total: int = 0) -> discord.Embed:
+    """Genera un embed con el nivel, progreso, rebirths y posición en el ranking del usuario."""
     level = stats['level']
     xp = stats['xp']
     rebirths = stats['rebirths']
@@ -26,9 +26,11 @@ def get_rank_embed(target: discord.Member, stats: dict, xp_next: int, lang: str)
     description = (
         f"{lvl_label}: **{level}**\n"
         f"{reb_label}: **{rebirths}**\n"
-        f"{xp_label}: **{xp:,} / {xp_next:,}**\n\n"
-        f"`{bar}` **{int(progress * 100)}%**"
+        f"{xp_label}: **{xp:,} / {xp_next:,}**\n"
     )
+    if position is not None:
+        description += lang_service.get_text("rank_position", lang, position=f"{position:,}", total=f"{total:,}") + "\n"
+    description += f"\n`{bar}` **{int(progress * 100)}%**"
     
     return embed_service.info(title, description, thumbnail=target.display_avatar.url)
 
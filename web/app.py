@@ -7,8 +7,9 @@ from starlette.middleware.sessions import SessionMiddleware
 from web.config import web_settings
 from services.features import web_bridge_service
 from services.repositories.user_repository import UserRepository
-from services.repositories.xp_repository import calculate_xp_required
-from services.core import database, db_service
+from services.repositories.xp_repository import XpRepository, calculate_xp_required
+from services.core import admission_control, database, db_service, message_dispatch, startup_profiler
+from services.utils.cache_helper import get_cache_stats_snapshot
 import pathlib
 import time
 import aiohttp
@@ -160,6 +161,45 @@ def create_app() -> FastAPI:
         ctx = get_common_context(request, active_page="docs")
         return templates.TemplateResponse(request, "docs.html", ctx)
 
+    async def is_metrics_authorized(request: Request) -> bool:
+        """Acceso a métricas: token Bearer de WEB_METRICS_TOKEN o sesión del dueño del bot."""
+        token = web_settings.WEB_METRICS_TOKEN
+        auth = request.headers.get("authorization", "")
+        if token and secrets.compare_digest(auth, f"Bearer {token}"):
+            return True
+
+        user = request.session.get("user")
+        bot = request.app.state.bot
+        if not user or not bot:
+            return False
+        owner = bot.get_user(int(user["id"]))
+        return owner is not None and await bot.is_owner(owner)
+
+    @app.get("/api/stats/cache")
+    async def api_cache_stats(request: Request):
+        """Contadores de aciertos, fallos, cargas, latencia, expulsiones y tamaño por caché (JSON)."""
+        if not await is_metrics_authorized(request):
+            return JSONResponse(status_code=status.HTTP_403_FORBIDDEN, content={"detail": "Forbidden"})
+        return JSONResponse(content={"timestamp": int(time.time()), "caches": get_cache_stats_snapshot()})
+
+    @app.get("/api/stats/dispatcher")
+    async def api_dispatcher_stats(request: Request):
+        """Latencia por manejador de on_message y mensajes descartados por el control de admisión (JSON)."""
+        if not await is_metrics_authorized(request):
+            return JSONResponse(status_code=status.HTTP_403_FORBIDDEN, content={"detail": "Forbidden"})
+        return JSONResponse(content={
+            "timestamp": int(time.time()),
+            "handlers": message_dispatch.get_handler_stats_snapshot(),
+            "admission": admission_control.get_admission_snapshot()
+        })
+
+    @app.get("/api/stats/boot")
+    async def api_boot_stats(request: Request):
+        """Línea de tiempo del último arranque: fases y tiempo de carga de cada extensión (JSON)."""
+        if not await is_metrics_authorized(request):
+            return JSONResponse(status_code=status.HTTP_403_FORBIDDEN, content={"detail": "Forbidden"})
+        return JSONResponse(content=startup_profiler.get_boot_timeline())
+
     # --- RUTAS DE DISCORD OAUTH2 ---
     @app.get("/auth/login")
     async def auth_login(request: Request):
@@ -389,6 +429,9 @@ def create_app() -> FastAPI:
         user_id = user["id"]
         
         # Borrar registros de base de datos
+        await XpRepository.wait_for_coin_flush()
+        XpRepository.discard_pending_coins(user_id)
+        await UserRepository.forget_custom_prefix(user_id)
         await database.execute("DELETE FROM users WHERE user_id = ?", (user_id,))
         
         # Limpiar sesión
@@ -457,6 +500,8 @@ def create_app() -> FastAPI:
                 xp_req = calculate_xp_required(lvl)
                 xp_curr = row["xp"]
                 progress_percent = min(100, int((xp_curr / xp_req) * 100)) if xp_req > 0 else 0
+                # Sin construir rankings de servidores fríos: uno por servidor del usuario sería demasiado para una visita
+                rank_position, rank_total = await XpRepository.get_user_rank(g_id, user_id, build=False)
                 
                 guilds_data.append({
                     "guild_id": g_id,
@@ -466,7 +511,9 @@ def create_app() -> FastAPI:
                     "xp": xp_curr,
                     "xp_required": xp_req,
                     "rebirths": row["rebirths"],
-                    "progress_percent": progress_percent
+                    "progress_percent": progress_percent,
+                    "rank_position": rank_position,
+                    "rank_total": rank_total
                 })
                 
             # Auto-grant "pioneer" badge y resolver insignias
@@ -663,7 +710,6 @@ def create_app() -> FastAPI:
             guild = bot.get_guild(guild_id)
             if guild:
                 current_guild_id = str(guild.id)
-                from services.repositories.xp_repository import XpRepository
                 rows = await XpRepository.get_leaderboard(guild_id, 50)
                 
                 for row in rows:
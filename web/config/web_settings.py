@@ -28,3 +28,6 @@ DISCORD_CLIENT_SECRET = os.getenv("DISCORD_CLIENT_SECRET", "")
 # Ajustes de sesión y cookies
 SESSION_SECRET_KEY = os.getenv("SESSION_SECRET_KEY", "FridayBotWebSessionCryptedKey2026_Secure")
 WEB_SECURE_COOKIES = os.getenv("WEB_SECURE_COOKIES", "False").lower() == "true"
+
+# Token Bearer para los endpoints de métricas (/api/stats/*); vacío = solo el dueño del bot con sesión iniciada
+WEB_METRICS_TOKEN = os.getenv("WEB_METRICS_TOKEN", "")